@@ -1,8 +1,22 @@
 import abc
 import argparse
+import atexit
+import calendar
 import collections
+import concurrent.futures
+import contextlib
+import contextvars
 import dataclasses
 import datetime
+import functools
+import hashlib
+import io
+import itertools
+import json
+import os
+import struct
+import tempfile
+import time
 
 import dateutil.relativedelta
 import dateutil.rrule
@@ -10,13 +24,19 @@ import enum
 import pathlib
 import re
 import sys
+import threading
 import traceback
 import typing
 import xml.etree.ElementTree as et
 
 
 def _dataclass(cls):
-    cls = dataclasses.dataclass(repr=False)(cls)
+    inherited_hash = None if "__hash__" in cls.__dict__ else cls.__hash__
+    cls = dataclasses.dataclass(repr=False, slots=True)(cls)
+    # dataclass disables hashing in each eq=True class, but subclasses of value types (e.g., Spring, a Repeating) should
+    # stay hashable
+    if inherited_hash is not None and inherited_hash is not object.__hash__:
+        cls.__hash__ = inherited_hash
 
     def __repr__(self):
         fields = [f for f in dataclasses.fields(self)
@@ -31,8 +51,17 @@ def _dataclass(cls):
     return cls
 
 
-@dataclasses.dataclass
-class Interval:
+class _Spanned:
+    """
+    A base class that reserves space for the character offsets that :func:`from_xml` attaches to the objects it creates:
+    :code:`span` covers all the text the object was built from, while :code:`trigger_span` covers only the text of
+    the object's own annotation.
+    """
+    __slots__ = ("span", "trigger_span")
+
+
+@dataclasses.dataclass(slots=True)
+class Interval(_Spanned):
     """
     An interval on the timeline, defined by a starting point (inclusive) and an ending point (exclusive).
     For example, the expression "1990", interpreted as the entire year on the timeline, would be represented as::
@@ -170,55 +199,13 @@ class Unit(enum.Enum):
         return self.name
 
     def truncate(self, dt: datetime.datetime) -> datetime.datetime:
-        if self is Unit.MILLISECOND:
-            dt = dt.replace(microsecond=dt.microsecond // 1000 * 1000)
-        elif self is Unit.SECOND:
-            dt = dt.replace(microsecond=0)
-        elif self is Unit.MINUTE:
-            dt = dt.replace(second=0, microsecond=0)
-        elif self is Unit.HOUR:
-            dt = dt.replace(minute=0, second=0, microsecond=0)
-        elif self is Unit.DAY:
-            dt = dt.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif self is Unit.WEEK:
-            timetuple = dt.timetuple()
-            diff = timetuple.tm_yday - timetuple.tm_wday
-            week_start = datetime.date.fromordinal(diff if diff >= 1 else diff + 7)
-            dt = datetime.datetime(dt.year, week_start.month, week_start.day, 0, 0)
-            if diff < 1:
-                dt = dt + dateutil.relativedelta.relativedelta(days=-7)
-        elif self is Unit.MONTH:
-            dt = datetime.datetime(dt.year, dt.month, 1, 0, 0)
-        elif self is Unit.QUARTER_YEAR:
-            dt = datetime.datetime(dt.year, (dt.month - 1) // 3 * 3 + 1, 1, 0, 0)
-        elif self is Unit.YEAR:
-            dt = datetime.datetime(dt.year, 1, 1, 0, 0)
-        elif self is Unit.DECADE:
-            dt = datetime.datetime(dt.year // 10 * 10, 1, 1, 0, 0)
-        elif self is Unit.QUARTER_CENTURY:
-            dt = datetime.datetime(dt.year // 25 * 25, 1, 1, 0, 0)
-        elif self is Unit.CENTURY:
-            year = dt.year // 100 * 100
-            year = 1 if year == 0 else year  # year 0 does not exist
-            dt = datetime.datetime(year, 1, 1, 0, 0)
-        return dt
+        return _TRUNCATE[self](dt)
 
     def relativedelta(self, n) -> dateutil.relativedelta.relativedelta:
-        if self._relativedelta_name is not None:
-            return dateutil.relativedelta.relativedelta(**{self._relativedelta_name: n})
-        elif self is Unit.CENTURY:
-            return dateutil.relativedelta.relativedelta(**{Unit.YEAR._relativedelta_name: 100 * n})
-        elif self is Unit.QUARTER_CENTURY:
-            return dateutil.relativedelta.relativedelta(**{Unit.YEAR._relativedelta_name: 25 * n})
-        elif self is Unit.DECADE:
-            return dateutil.relativedelta.relativedelta(**{Unit.YEAR._relativedelta_name: 10 * n})
-        elif self is Unit.QUARTER_YEAR:
-            return dateutil.relativedelta.relativedelta(**{Unit.MONTH._relativedelta_name: 3 * n})
-        else:
-            raise NotImplementedError
+        return _relativedelta(self, n)
 
     def expand(self, interval: Interval, n: int = 1) -> Interval:
-        if interval.start + self.relativedelta(n) > interval.end:
+        if interval.start + _delta(self, n) > interval.end:
             mid = interval.start + (interval.end - interval.start) / 2
             if n % 2 == 0 or self in {Unit.MILLISECOND,
                                       Unit.MICROSECOND,
@@ -227,26 +214,110 @@ class Unit(enum.Enum):
                                       Unit.HOUR,
                                       Unit.DAY,
                                       Unit.WEEK}:
-                half = self.relativedelta(n / 2)
+                half = _delta(self, n / 2)
             elif self is Unit.MONTH:
-                half = Unit.DAY.relativedelta(30 / 2)
+                half = _delta(Unit.DAY, 30 / 2)
             elif self is Unit.YEAR:
-                half = Unit.DAY.relativedelta(365 / 2)
+                half = _delta(Unit.DAY, 365 / 2)
             else:
                 raise NotImplementedError(f"don't know how to take {n}/2 {self}")
             start = mid - half
-            interval = Interval(start, start + self.relativedelta(n))
+            interval = Interval(start, start + _delta(self, n))
         return interval
 
 
+def _truncate_week(dt: datetime.datetime) -> datetime.datetime:
+    # Monday of the week, but (for compatibility) with the day of the year mapped through a non-leap year, so in leap
+    # years, Mondays from March on become Tuesdays, and a Monday on December 31 becomes January 1
+    ordinal = dt.toordinal()
+    monday = ordinal - (ordinal - 1) % 7  # 0001-01-01 was a Monday
+    year_start = datetime.date(dt.year, 1, 1).toordinal()
+    if monday >= year_start + 59 and calendar.isleap(dt.year):
+        monday = year_start if monday == year_start + 365 else monday + 1
+    return datetime.datetime.fromordinal(monday)
+
+
+def _truncate_century(dt: datetime.datetime) -> datetime.datetime:
+    year = dt.year // 100 * 100
+    return datetime.datetime(1 if year == 0 else year, 1, 1)  # year 0 does not exist
+
+
+# positional datetime constructors are much faster than datetime.replace with keywords
+_TRUNCATE: dict[Unit, typing.Callable[[datetime.datetime], datetime.datetime]] = {
+    Unit.MICROSECOND: lambda dt: dt,
+    Unit.MILLISECOND: lambda dt: datetime.datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second,
+                                                   dt.microsecond // 1000 * 1000),
+    Unit.SECOND: lambda dt: datetime.datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second),
+    Unit.MINUTE: lambda dt: datetime.datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute),
+    Unit.HOUR: lambda dt: datetime.datetime(dt.year, dt.month, dt.day, dt.hour),
+    Unit.DAY: lambda dt: datetime.datetime(dt.year, dt.month, dt.day),
+    Unit.WEEK: _truncate_week,
+    Unit.MONTH: lambda dt: datetime.datetime(dt.year, dt.month, 1),
+    Unit.QUARTER_YEAR: lambda dt: datetime.datetime(dt.year, (dt.month - 1) // 3 * 3 + 1, 1),
+    Unit.YEAR: lambda dt: datetime.datetime(dt.year, 1, 1),
+    Unit.DECADE: lambda dt: datetime.datetime(dt.year // 10 * 10, 1, 1),
+    Unit.QUARTER_CENTURY: lambda dt: datetime.datetime(dt.year // 25 * 25, 1, 1),
+    Unit.CENTURY: _truncate_century,
+}
+
+# the relativedelta argument and multiplier that implement each unit
+_RELATIVEDELTA_ARGS: dict[Unit, tuple[str, int]] = {
+    Unit.MICROSECOND: ("microseconds", 1),
+    Unit.SECOND: ("seconds", 1),
+    Unit.MINUTE: ("minutes", 1),
+    Unit.HOUR: ("hours", 1),
+    Unit.DAY: ("days", 1),
+    Unit.WEEK: ("weeks", 1),
+    Unit.MONTH: ("months", 1),
+    Unit.QUARTER_YEAR: ("months", 3),
+    Unit.YEAR: ("years", 1),
+    Unit.DECADE: ("years", 10),
+    Unit.QUARTER_CENTURY: ("years", 25),
+    Unit.CENTURY: ("years", 100),
+}
+
+
+@functools.lru_cache(maxsize=4096, typed=True)
+def _relativedelta(unit: Unit, n) -> dateutil.relativedelta.relativedelta:
+    # relativedeltas are never modified in place, so the same instance can be shared by all callers
+    if unit not in _RELATIVEDELTA_ARGS:
+        raise NotImplementedError
+    name, multiplier = _RELATIVEDELTA_ARGS[unit]
+    return dateutil.relativedelta.relativedelta(**{name: multiplier * n})
+
+
+# microseconds per unit for units whose relativedelta has a fixed length
+_FIXED_MICROSECONDS: dict[Unit, int] = {
+    Unit.MICROSECOND: 1,
+    Unit.SECOND: 10 ** 6,
+    Unit.MINUTE: 60 * 10 ** 6,
+    Unit.HOUR: 60 * 60 * 10 ** 6,
+    Unit.DAY: 24 * 60 * 60 * 10 ** 6,
+    Unit.WEEK: 7 * 24 * 60 * 60 * 10 ** 6,
+}
+
+
+@functools.lru_cache(maxsize=4096, typed=True)
+def _delta(unit: Unit, n) -> datetime.timedelta | dateutil.relativedelta.relativedelta:
+    """
+    The same offset as :code:`unit.relativedelta(n)`, but for units with a fixed length, as a timedelta, i.e., a whole
+    number of microseconds, which is much faster to add to a datetime. Other units return the relativedelta.
+    """
+    microseconds = _FIXED_MICROSECONDS.get(unit)
+    if microseconds is not None and float(microseconds * n).is_integer():
+        return datetime.timedelta(microseconds=int(microseconds * n))
+    return unit.relativedelta(n)
+
+
 # allow e.g., scate.DAY instead of scate.Unit.DAY
 globals().update(Unit.__members__)
 
 
-class Shift:
+class Shift(_Spanned):
     """
     An object that can be added or subtracted from a time point yielding an Interval
     """
+    __slots__ = ()
 
     unit: Unit
 
@@ -270,13 +341,16 @@ class Period(Shift):
     """
     unit: Unit
     n: int | None
-    span: (int, int) = dataclasses.field(default=None, repr=False)
+    span: (int, int) = dataclasses.field(default=None, repr=False, compare=False)
+
+    def __hash__(self):
+        return hash((self.__class__, self.unit, self.n))
 
     def __radd__(self, other: datetime.datetime) -> Interval:
         if self.unit is None or self.n is None:
             return Interval(other, None)
         else:
-            end = other + self.unit.relativedelta(self.n)
+            end = other + _delta(self.unit, self.n)
             # in the first century, there's only 99 years
             if other == datetime.datetime.min and self.unit is Unit.CENTURY:
                 end -= Unit.YEAR.relativedelta(1)
@@ -286,7 +360,7 @@ class Period(Shift):
         if self.unit is None or self.n is None:
             return Interval(None, other)
         else:
-            return Interval(other - self.unit.relativedelta(self.n), other)
+            return Interval(other - _delta(self.unit, self.n), other)
 
 
 @_dataclass
@@ -298,11 +372,15 @@ class PeriodSum(Shift):
         PeriodSum([Period(YEAR, 2), Period(DAY, 1)])
     """
     periods: list[Period]
-    span: (int, int) = dataclasses.field(default=None, repr=False)
+    span: (int, int) = dataclasses.field(default=None, repr=False, compare=False)
+    unit: Unit = dataclasses.field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self.unit = max(self.periods, key=lambda p: p.unit).unit
 
+    def __hash__(self):
+        return hash((self.__class__, tuple(self.periods)))
+
     def __radd__(self, other: datetime.datetime) -> Interval:
         end = other
         for period in self.periods:
@@ -316,6 +394,201 @@ class PeriodSum(Shift):
         return Interval(start, other)
 
 
+def _freeze_rrule_kwargs(rrule_kwargs: dict) -> frozenset:
+    """
+    A hashable version of the keyword arguments to dateutil.rrule.rrule, for use as a cache key.
+    """
+    return frozenset((key, frozenset(value) if isinstance(value, (list, tuple, set, frozenset)) else value)
+                     for key, value in rrule_kwargs.items())
+
+
+def _solve_time_field(name: str, step: datetime.timedelta, upper: int):
+    """
+    Creates a solver for a single time-of-day field (second, minute, hour), where every occurrence is found by
+    replacing the field in the query point, zeroing all smaller fields, and stepping by one enclosing unit.
+    """
+    finer = ["hour", "minute", "second", "microsecond"]
+    zeros = dict.fromkeys(finer[finer.index(name) + 1:], 0)
+
+    def solve(value: int, point: datetime.datetime, forward: bool) -> datetime.datetime | None:
+        if not 0 <= value < upper:
+            return None
+        result = point.replace(**{name: value}, **zeros)
+        if forward and result < point:
+            result += step
+        elif not forward and result > point:
+            result -= step
+        return result
+
+    return solve
+
+
+def _solve_weekday(value: int, point: datetime.datetime, forward: bool) -> datetime.datetime | None:
+    if not 0 <= value < 7:
+        return None
+    day = datetime.datetime(point.year, point.month, point.day)
+    if forward:
+        result = day + datetime.timedelta(days=(value - day.weekday()) % 7)
+        if result < point:
+            result += datetime.timedelta(days=7)
+    else:
+        result = day - datetime.timedelta(days=(day.weekday() - value) % 7)
+    return result
+
+
+def _solve_month_day(value: int, point: datetime.datetime, forward: bool) -> datetime.datetime | None:
+    if not 1 <= abs(value) <= 31:
+        return None
+    months = point.year * 12 + point.month - 1
+    # no day number is missing from more than 2 consecutive months, so 12 months means there is no solution
+    for _ in range(12):
+        year, month = divmod(months, 12)
+        month += 1
+        n_days = calendar.monthrange(year, month)[1]
+        day = value if value > 0 else n_days + value + 1
+        if 1 <= day <= n_days:
+            result = datetime.datetime(year, month, day)
+            if result >= point if forward else result <= point:
+                return result
+        months += 1 if forward else -1
+    return None
+
+
+def _solve_year_day(value: int, point: datetime.datetime, forward: bool) -> datetime.datetime | None:
+    if not 1 <= abs(value) <= 366:
+        return None
+    year = point.year
+    # day 366 only exists in leap years, which are never more than 8 years apart
+    for _ in range(9):
+        n_days = 365 + calendar.isleap(year)
+        day = value if value > 0 else n_days + value + 1
+        if 1 <= day <= n_days:
+            result = datetime.datetime(year, 1, 1) + datetime.timedelta(days=day - 1)
+            if result >= point if forward else result <= point:
+                return result
+        year += 1 if forward else -1
+    return None
+
+
+def _weekno(date: datetime.date) -> int:
+    """
+    The week number of a date, following dateutil.rrule (weeks start on Monday, and week 1 is the first week with at
+    least 4 days in the year). This is the ISO 8601 week number except that, like dateutil, the days at the start of a
+    year belonging to the last week of the previous year are numbered using dateutil's estimate of that week number.
+    """
+    iso_year, week, _ = date.isocalendar()
+    if iso_year < date.year:
+        n_days = 365 + calendar.isleap(date.year)
+        n_leading = 7 - datetime.date(date.year, 1, 1).weekday()
+        prev_weekday = datetime.date(date.year - 1, 1, 1).weekday()
+        if (7 - prev_weekday) % 7 >= 4:
+            week = 52 + (365 + calendar.isleap(date.year - 1) + prev_weekday) % 7 // 4
+        else:
+            week = 52 + (n_days - n_leading) % 7 // 4
+    return week
+
+
+@functools.lru_cache(maxsize=4096)
+def _weekno_days(year: int, value: int) -> tuple[datetime.datetime, ...]:
+    """
+    All days in the given year that belong to the given week number, in order.
+    """
+    dates = {datetime.date(year, 1, day) for day in range(1, 4)}  # leading days from the previous year's last week
+    for iso_year in [year - 1, year, year + 1]:
+        for iso_weekday in range(1, 8):
+            try:
+                dates.add(datetime.date.fromisocalendar(iso_year, value, iso_weekday))
+            except ValueError:
+                pass
+    return tuple(datetime.datetime(d.year, d.month, d.day)
+                 for d in sorted(dates) if d.year == year and _weekno(d) == value)
+
+
+def _solve_week_number(value: int, point: datetime.datetime, forward: bool) -> datetime.datetime | None:
+    if not 1 <= value <= 53:
+        return None
+    year = point.year
+    # week 53 exists at least once every 6 years
+    for _ in range(8):
+        days = _weekno_days(year, value)
+        if forward:
+            result = next((day for day in days if day >= point), None)
+        else:
+            result = next((day for day in reversed(days) if day <= point), None)
+        if result is not None:
+            return result
+        year += 1 if forward else -1
+    return None
+
+
+def _solve_month(value: int, point: datetime.datetime, forward: bool) -> datetime.datetime | None:
+    if not 1 <= value <= 12:
+        return None
+    result = datetime.datetime(point.year, value, 1)
+    if forward and result < point:
+        result = result.replace(year=result.year + 1)
+    elif not forward and result > point:
+        result = result.replace(year=result.year - 1)
+    return result
+
+
+# Solvers for the rrules that Repeating creates for a single field, keyed by (unit, rrule frequency, rrule field).
+# Each solver takes the field value, a query point, and a direction, and returns the nearest rrule occurrence at or
+# after (forward) or at or before (backward) the query point, or None if it cannot solve for the given value.
+# The unit guarantees that the rrule's dtstart was truncated so that any fields the rrule copies from dtstart are 0.
+_REPEATING_SOLVERS = {
+    (Unit.SECOND, dateutil.rrule.MINUTELY, "bysecond"):
+        _solve_time_field("second", datetime.timedelta(minutes=1), 60),
+    (Unit.MINUTE, dateutil.rrule.HOURLY, "byminute"):
+        _solve_time_field("minute", datetime.timedelta(hours=1), 60),
+    (Unit.HOUR, dateutil.rrule.DAILY, "byhour"):
+        _solve_time_field("hour", datetime.timedelta(days=1), 24),
+    (Unit.DAY, dateutil.rrule.WEEKLY, "byweekday"): _solve_weekday,
+    (Unit.DAY, dateutil.rrule.DAILY, "byweekday"): _solve_weekday,
+    (Unit.DAY, dateutil.rrule.MONTHLY, "bymonthday"): _solve_month_day,
+    (Unit.DAY, dateutil.rrule.YEARLY, "byyearday"): _solve_year_day,
+    (Unit.WEEK, dateutil.rrule.YEARLY, "byweekno"): _solve_week_number,
+    (Unit.MONTH, dateutil.rrule.YEARLY, "bymonth"): _solve_month,
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _repeating_solver(unit: Unit, frozen_kwargs: frozenset) -> typing.Callable | None:
+    """
+    The solver from _REPEATING_SOLVERS for a Repeating's rrule, with the field value already bound.
+    """
+    rrule_kwargs = dict(frozen_kwargs)
+    if len(rrule_kwargs) != 2 or "freq" not in rrule_kwargs:
+        return None
+    [(field, value)] = [(key, value) for key, value in rrule_kwargs.items() if key != "freq"]
+    solver = _REPEATING_SOLVERS.get((unit, rrule_kwargs["freq"], field))
+    if solver is None or not isinstance(value, int):
+        return None
+    return functools.partial(solver, value)
+
+
+def _solve_repeating(unit: Unit, rrule_kwargs: dict, point: datetime.datetime,
+                     forward: bool) -> datetime.datetime | None:
+    """
+    Finds the rrule occurrence nearest to the point without constructing the rrule, if there is a solver for it.
+
+    :return: The first occurrence at or after the point if forward is True, otherwise the last occurrence at or before
+    the point. None if there is no solver for the rrule, or if the solver could not find an occurrence.
+    """
+    solver = _repeating_solver(unit, _freeze_rrule_kwargs(rrule_kwargs))
+    return None if solver is None else solver(point, forward)
+
+
+@functools.lru_cache(maxsize=65536)
+def _evaluate_shift(shift: Shift,
+                    point: datetime.datetime,
+                    forward: bool) -> tuple[datetime.datetime | None, datetime.datetime | None]:
+    # memoizes the (expensive) search for repeating intervals; since Intervals are mutable, only the start and end are
+    # memoized, and callers create a new Interval from them
+    interval = shift._radd(point) if forward else shift._rsub(point)
+    return interval.start, interval.end
+
+
 @_dataclass
 class Repeating(Shift):
     """
@@ -338,7 +611,8 @@ class Repeating(Shift):
     value: int = dataclasses.field(default=None, kw_only=True)
     n_units: int = dataclasses.field(default=1, kw_only=True)
     rrule_kwargs: dict = dataclasses.field(default_factory=dict, kw_only=True, repr=False)
-    span: (int, int) = dataclasses.field(default=None, repr=False)
+    span: (int, int) = dataclasses.field(default=None, repr=False, compare=False)
+    period: Period = dataclasses.field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self.period = Period(self.unit, self.n_units)
@@ -389,30 +663,46 @@ class Repeating(Shift):
                     raise NotImplementedError
             self.rrule_kwargs[rrule_by] = self.value
 
+    def __hash__(self):
+        # value is omitted since it's either in the rrule kwargs or unused, and may be an unhashable list
+        return hash((self.__class__, self.unit, self.range, self.n_units, _freeze_rrule_kwargs(self.rrule_kwargs)))
+
     def __rsub__(self, other: datetime.datetime) -> Interval:
+        return Interval(*_evaluate_shift(self, other, forward=False))
+
+    def __radd__(self, other: datetime.datetime) -> Interval:
+        return Interval(*_evaluate_shift(self, other, forward=True))
+
+    def _rsub(self, other: datetime.datetime) -> Interval:
         if self.unit is None:
             return Interval(None, None)
         other = self.unit.truncate(other)
         if self.rrule_kwargs:
-            # HACK: rrule requires a starting point even when going backwards so use a big one
-            dtstart = other - Unit.YEAR.relativedelta(100)
-            min_end = other - self.period.unit.relativedelta(self.period.n)
-            start = dateutil.rrule.rrule(dtstart=dtstart, **self.rrule_kwargs).before(min_end, inc=True)
+            min_end = other - _delta(self.period.unit, self.period.n)
+            start = _solve_repeating(self.unit, self.rrule_kwargs, min_end, forward=False)
             if start is None:
-                raise ValueError(f"between {dtstart} and {min_end} there is no {self.rrule_kwargs}")
+                # HACK: rrule requires a starting point even when going backwards so use a big one
+                dtstart = other - Unit.YEAR.relativedelta(100)
+                start = next(_iter_rrule(dtstart, self.rrule_kwargs, min_end, forward=False), None)
+                if start is None:
+                    raise ValueError(f"between {dtstart} and {min_end} there is no {self.rrule_kwargs}")
             interval = start + self.period
         else:
             interval = other - self.period
         return interval
 
-    def __radd__(self, other: datetime.datetime) -> Interval:
+    def _radd(self, other: datetime.datetime) -> Interval:
         if self.unit is None:
             return Interval(None, None)
         start = self.unit.truncate(other)
         if self.rrule_kwargs:
-            start = dateutil.rrule.rrule(dtstart=start, **self.rrule_kwargs).after(other, inc=True)
+            solved = _solve_repeating(self.unit, self.rrule_kwargs, other, forward=True)
+            if solved is not None:
+                start = solved
+            else:
+                start = next(_iter_rrule(start, self.rrule_kwargs, other, forward=True), None)
         elif start < other:
-            start += self.period.unit.relativedelta(1)
+            start += _delta(self.period.unit, 1)
         return start + self.period
 
 
@@ -560,7 +850,10 @@ class EveryNth(Shift):
     """
     shift: Shift
     n: int
-    span: (int, int) = dataclasses.field(default=None, repr=False)
+    span: (int, int) = dataclasses.field(default=None, repr=False, compare=False)
+
+    def __hash__(self):
+        return hash((self.__class__, self.shift, self.n))
 
     def __rsub__(self, other: datetime.datetime) -> Interval:
         interval = other - self.shift
@@ -584,12 +877,17 @@ class ShiftUnion(Shift):
         ShiftUnion([Repeating(DAY, WEEK, value=0), Repeating(DAY, WEEK, value=4)])
     """
     shifts: typing.Iterable[Shift]
-    span: (int, int) = dataclasses.field(default=None, repr=False)
+    span: (int, int) = dataclasses.field(default=None, repr=False, compare=False)
+    unit: Unit = dataclasses.field(init=False, repr=False, compare=False)
+    range: Unit = dataclasses.field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self.unit = min(o.unit for o in self.shifts)
         self.range = max(o.unit for o in self.shifts)
 
+    def __hash__(self):
+        return hash((self.__class__, tuple(self.shifts)))
+
     def __rsub__(self, other: datetime.datetime) -> Interval:
         return max((other - shift for shift in self.shifts),
                    key=lambda i: (i.end, i.end - i.start))
@@ -599,6 +897,258 @@ class ShiftUnion(Shift):
                    key=lambda i: (i.start, i.start - i.end))
 
 
+# the rrule arguments that _RRuleFields can search without iterating over the rrule
+_RRULE_FIELD_RANGES = {
+    "bymonth": range(1, 13),
+    "bymonthday": [*range(-31, 0), *range(1, 32)],
+    "byyearday": [*range(-366, 0), *range(1, 367)],
+    "byweekno": range(1, 54),
+    "byweekday": range(7),
+    "byhour": range(24),
+    "byminute": range(60),
+    "bysecond": range(60),
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class _RRuleFields:
+    """
+    The values that each calendar field may take in the occurrences of a dateutil.rrule.
+    Occurrences near a time point can be found by jumping over non-matching months, days, hours, etc., rather than by
+    iterating over all occurrences of the rrule from its dtstart.
+    For the date fields, None means that any value is allowed.
+    """
+    months: frozenset[int] | None
+    month_days: frozenset[int] | None
+    year_days: frozenset[int] | None
+    weeknos: frozenset[int] | None
+    weekdays: frozenset[int] | None
+    hours: tuple[int, ...]
+    minutes: tuple[int, ...]
+    seconds: tuple[int, ...]
+
+    @classmethod
+    def from_rrule(cls, dtstart: datetime.datetime, rrule_kwargs: dict) -> typing.Optional["_RRuleFields"]:
+        """
+        Determines the field values of `dateutil.rrule.rrule(dtstart=dtstart, **rrule_kwargs)`, including the values
+        that the rrule copies from dtstart.
+        Results are shared through an LRU cache keyed on the rrule arguments and the fields copied from dtstart, so
+        every dtstart that agrees on those fields (e.g., every dtstart for a rule that specifies all its fields) reuses
+        the same object.
+
+        :return: The field values, or None if the rrule uses arguments that cannot be represented as field values.
+        """
+        return _compile_rrule_fields(_freeze_rrule_kwargs(rrule_kwargs), _copied_dtstart_fields(dtstart, rrule_kwargs))
+
+    def before(self, point: datetime.datetime, dtstart: datetime.datetime) -> datetime.datetime | None:
+        """
+        Finds the last occurrence at or before the point, like `rrule.before(point, inc=True)`.
+        """
+        dtstart = dtstart.replace(microsecond=0)
+        date = point.date()
+        months = point.year * 12 + point.month - 1
+        while months >= dtstart.year * 12 + dtstart.month - 1:
+            year, month = divmod(months, 12)
+            month += 1
+            if self.months is None or month in self.months:
+                for day in reversed(_rrule_fields_days(self, year, month)):
+                    day_date = datetime.date(year, month, day)
+                    if day_date > date:
+                        continue
+                    time = self._time_before(point.time() if day_date == date else None)
+                    if time is not None:
+                        result = datetime.datetime(year, month, day, *time)
+                        return result if result >= dtstart else None
+            months -= 1
+        return None
+
+    def after(self, point: datetime.datetime, dtstart: datetime.datetime) -> datetime.datetime | None:
+        """
+        Finds the first occurrence at or after the point, like `rrule.after(point, inc=True)`.
+        """
+        point = max(point, dtstart.replace(microsecond=0))
+        date = point.date()
+        months = point.year * 12 + point.month - 1
+        while months < (datetime.MAXYEAR + 1) * 12:
+            year, month = divmod(months, 12)
+            month += 1
+            if self.months is None or month in self.months:
+                for day in _rrule_fields_days(self, year, month):
+                    day_date = datetime.date(year, month, day)
+                    if day_date < date:
+                        continue
+                    time = self._time_after(point.time() if day_date == date else None)
+                    if time is not None:
+                        return datetime.datetime(year, month, day, *time)
+            months += 1
+        return None
+
+    def _time_before(self, bound: datetime.time | None) -> tuple[int, int, int] | None:
+        if bound is None:
+            return self.hours[-1], self.minutes[-1], self.seconds[-1]
+        for hour in reversed(self.hours):
+            if hour < bound.hour:
+                return hour, self.minutes[-1], self.seconds[-1]
+            if hour == bound.hour:
+                for minute in reversed(self.minutes):
+                    if minute < bound.minute:
+                        return hour, minute, self.seconds[-1]
+                    if minute == bound.minute:
+                        for second in reversed(self.seconds):
+                            if second <= bound.second:
+                                return hour, minute, second
+        return None
+
+    def _time_after(self, bound: datetime.time | None) -> tuple[int, int, int] | None:
+        if bound is None:
+            return self.hours[0], self.minutes[0], self.seconds[0]
+        for hour in self.hours:
+            if hour > bound.hour:
+                return hour, self.minutes[0], self.seconds[0]
+            if hour == bound.hour:
+                for minute in self.minutes:
+                    if minute > bound.minute:
+                        return hour, minute, self.seconds[0]
+                    if minute == bound.minute:
+                        for second in self.seconds:
+                            if second > bound.second or (second == bound.second and not bound.microsecond):
+                                return hour, minute, second
+        return None
+
+
+def _copied_dtstart_fields(dtstart: datetime.datetime,
+                           rrule_kwargs: dict) -> tuple[int | None, ...] | None:
+    """
+    The (month, day, weekday, hour, minute, second) that dateutil.rrule.rrule.__init__ copies from dtstart because
+    they are missing from the rrule arguments, with None for each field that is not copied.
+    """
+    freq = rrule_kwargs.get("freq")
+    if freq is None:
+        return None
+    given = {key for key, value in rrule_kwargs.items() if value is not None}
+    copies_day = not given & {"byweekno", "byyearday", "bymonthday", "byweekday"}
+    return (dtstart.month if copies_day and freq == dateutil.rrule.YEARLY and "bymonth" not in given else None,
+            dtstart.day if copies_day and freq in {dateutil.rrule.YEARLY, dateutil.rrule.MONTHLY} else None,
+            dtstart.weekday() if copies_day and freq == dateutil.rrule.WEEKLY else None,
+            dtstart.hour if "byhour" not in given and freq < dateutil.rrule.HOURLY else None,
+            dtstart.minute if "byminute" not in given and freq < dateutil.rrule.MINUTELY else None,
+            dtstart.second if "bysecond" not in given and freq < dateutil.rrule.SECONDLY else None)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_rrule_fields(frozen_kwargs: frozenset,
+                          dtstart_fields: tuple[int | None, ...] | None) -> _RRuleFields | None:
+    """
+    Creates the _RRuleFields for frozen rrule arguments and the fields that the rrule copies from its dtstart.
+    """
+    rrule_kwargs = dict(frozen_kwargs)
+    freq = rrule_kwargs.get("freq")
+    if dtstart_fields is None or not rrule_kwargs.keys() - {"freq"} <= _RRULE_FIELD_RANGES.keys():
+        return None
+    values = {}
+    for key, value in rrule_kwargs.items():
+        if key == "freq" or value is None:
+            continue
+        if isinstance(value, (int, dateutil.rrule.weekday)):
+            value = [value]
+        ints = set()
+        for x in value:
+            if isinstance(x, dateutil.rrule.weekday):
+                # weekdays like FR(+2) select by position within the month or year
+                if x.n and freq <= dateutil.rrule.MONTHLY:
+                    return None
+                x = x.weekday
+            if not isinstance(x, int) or x not in _RRULE_FIELD_RANGES[key]:
+                return None
+            ints.add(x)
+        if not ints:
+            return None
+        values[key] = frozenset(ints)
+
+    # weekly rrules number the days of a week crossing into the next year by the previous year's week numbers
+    if "byweekno" in values and freq == dateutil.rrule.WEEKLY:
+        return None
+
+    # fill in the fields that rrule copies from dtstart
+    month, day, weekday, hour, minute, second = dtstart_fields
+    for key, value in [("bymonth", month), ("bymonthday", day), ("byweekday", weekday)]:
+        if value is not None:
+            values[key] = frozenset([value])
+
+    def time_values(key: str, dtstart_value: int | None) -> tuple[int, ...]:
+        if key in values:
+            return tuple(sorted(values[key]))
+        elif dtstart_value is not None:
+            return dtstart_value,
+        else:
+            return tuple(_RRULE_FIELD_RANGES[key])
+
+    return _RRuleFields(months=values.get("bymonth"),
+                        month_days=values.get("bymonthday"),
+                        year_days=values.get("byyearday"),
+                        weeknos=values.get("byweekno"),
+                        weekdays=values.get("byweekday"),
+                        hours=time_values("byhour", hour),
+                        minutes=time_values("byminute", minute),
+                        seconds=time_values("bysecond", second))
+
+
+@functools.lru_cache(maxsize=4096)
+def _rrule_fields_days(fields: _RRuleFields, year: int, month: int) -> tuple[int, ...]:
+    """
+    The days of the month that match the day-level fields (month day, year day, week number, and weekday).
+    """
+    n_days = calendar.monthrange(year, month)[1]
+    n_year_days = 365 + calendar.isleap(year)
+    first = datetime.date(year, month, 1)
+    first_weekday = first.weekday()
+    first_year_day = first.timetuple().tm_yday
+    days = []
+    for day in range(1, n_days + 1):
+        if fields.month_days is not None \
+                and day not in fields.month_days and day - n_days - 1 not in fields.month_days:
+            continue
+        if fields.weekdays is not None and (first_weekday + day - 1) % 7 not in fields.weekdays:
+            continue
+        year_day = first_year_day + day - 1
+        if fields.year_days is not None \
+                and year_day not in fields.year_days and year_day - n_year_days - 1 not in fields.year_days:
+            continue
+        if fields.weeknos is not None and _weekno(datetime.date(year, month, day)) not in fields.weeknos:
+            continue
+        days.append(day)
+    return tuple(days)
+
+
+def _iter_rrule(dtstart: datetime.datetime,
+                rrule_kwargs: dict,
+                point: datetime.datetime,
+                forward: bool) -> typing.Iterator[datetime.datetime]:
+    """
+    Iterates over the occurrences of `dateutil.rrule.rrule(dtstart=dtstart, **rrule_kwargs)`, starting from the
+    occurrence nearest the point and moving away from it.
+
+    :param forward: If True, yield occurrences at or after the point in increasing order. Otherwise, yield occurrences
+    at or before the point in decreasing order.
+    """
+    fields = _RRuleFields.from_rrule(dtstart, rrule_kwargs)
+    if fields is not None:
+        find = fields.after if forward else fields.before
+        # occurrences never have microseconds, so a microsecond past an occurrence excludes only that occurrence
+        step = datetime.timedelta(microseconds=1 if forward else -1)
+        occurrence = find(point, dtstart)
+        while occurrence is not None:
+            yield occurrence
+            occurrence = find(occurrence + step, dtstart)
+    else:
+        rule = dateutil.rrule.rrule(dtstart=dtstart, **rrule_kwargs)
+        find = rule.after if forward else rule.before
+        occurrence = find(point, inc=True)
+        while occurrence is not None:
+            yield occurrence
+            occurrence = find(occurrence)
+
+
 @_dataclass
 class RepeatingIntersection(Shift):
     """
@@ -608,7 +1158,13 @@ class RepeatingIntersection(Shift):
         RepeatingIntersection([Repeating(DAY, WEEK, value=5), Repeating(MONTH, YEAR, value=3)])
     """
     shifts: typing.Iterable[Repeating]
-    span: (int, int) = dataclasses.field(default=None, repr=False)
+    span: (int, int) = dataclasses.field(default=None, repr=False, compare=False)
+    rrule_kwargs: dict = dataclasses.field(init=False, repr=False, compare=False)
+    min_period: Period = dataclasses.field(init=False, repr=False, compare=False)
+    rrule_period: Period | None = dataclasses.field(init=False, repr=False, compare=False)
+    non_rrule_period: Period | None = dataclasses.field(init=False, repr=False, compare=False)
+    unit: Unit = dataclasses.field(init=False, repr=False, compare=False)
+    range: Unit = dataclasses.field(init=False, repr=False, compare=False)
 
     def _iter_shifts(self) -> typing.Iterator[Repeating]:
         for shift in self.shifts:
@@ -642,19 +1198,24 @@ class RepeatingIntersection(Shift):
         self.unit = self.min_period.unit
         self.range = max(periods, default=None, key=by_unit).unit
 
+    def __hash__(self):
+        return hash((self.__class__, tuple(self.shifts)))
+
     def __rsub__(self, other: datetime.datetime) -> Interval:
+        return Interval(*_evaluate_shift(self, other, forward=False))
+
+    def __radd__(self, other: datetime.datetime) -> Interval:
+        return Interval(*_evaluate_shift(self, other, forward=True))
+
+    def _rsub(self, other: datetime.datetime) -> Interval:
         if self.unit is None:
             return Interval(None, None)
         start = self.min_period.unit.truncate(other)
         if self.rrule_period is not None:
-            # HACK: rrule requires a starting point even when going backwards.
-            # So we use a big one, but this is inefficient
+            # HACK: rrule requires a starting point even when going backwards, so we use a big one
             dtstart = start - Unit.YEAR.relativedelta(100)
-            while True:
-                # find the start and interval using the rrule
-                start = dateutil.rrule.rrule(dtstart=dtstart, **self.rrule_kwargs).before(start, inc=True)
-                if start is None:
-                    raise ValueError(f"no {self.rrule_kwargs} between {dtstart} and {start}")
+            # find the start and interval using the rrule occurrences, from the nearest backwards
+            for start in _iter_rrule(dtstart, self.rrule_kwargs, start, forward=False):
                 interval = start + self.rrule_period
 
                 # subtract off any non-rrule period
@@ -664,32 +1225,90 @@ class RepeatingIntersection(Shift):
                     # if outside the valid range of the rrule, move back in
                     if interval.start < self.rrule_period.unit.truncate(start):
                         interval = Interval(
-                            interval.start + self.rrule_period.unit.relativedelta(self.rrule_period.n),
-                            interval.end + self.rrule_period.unit.relativedelta(self.rrule_period.n))
+                            interval.start + _delta(self.rrule_period.unit, self.rrule_period.n),
+                            interval.end + _delta(self.rrule_period.unit, self.rrule_period.n))
 
                 # start is guaranteed to be before other by rrule, but end is not
                 if interval.end <= other:
                     break
-                start -= Unit.MICROSECOND.relativedelta(1)
+            else:
+                raise ValueError(f"no {self.rrule_kwargs} between {dtstart} and {other}")
         elif self.non_rrule_period is not None:
             interval = start - self.non_rrule_period
         else:
             raise ValueError(f"{self.rrule_period} and {self.non_rrule_period} are both None")
         return interval
 
-    def __radd__(self, other: datetime.datetime) -> Interval:
+    def _radd(self, other: datetime.datetime) -> Interval:
         if self.unit is None:
             return Interval(None, None)
         start = self.min_period.unit.truncate(other)
         if start < other:
-            start += self.min_period.unit.relativedelta(self.min_period.n)
+            start += _delta(self.min_period.unit, self.min_period.n)
         if self.rrule_period is not None:
-            start = dateutil.rrule.rrule(dtstart=start, **self.rrule_kwargs).after(start, inc=True)
-            if start is None:
+            occurrence = next(_iter_rrule(start, self.rrule_kwargs, start, forward=True), None)
+            if occurrence is None:
                 raise ValueError(f"no {self.rrule_kwargs} between {start} and {other}")
+            start = occurrence
         return start + self.min_period
 
 
+_LAZY = contextvars.ContextVar("_LAZY", default=False)
+
+
+@contextlib.contextmanager
+def lazy_evaluation(lazy: bool = True) -> typing.Iterator[None]:
+    """
+    Postpones computing the start and end of operators (Last, Next, Before, After, Nth, This, Between, Intersection and
+    YearSuffix) created within this context until they are first accessed. For example::
+
+        with lazy_evaluation():
+            last_friday = Last(Interval.of(2024, 3, 16), Repeating(DAY, WEEK, value=4))
+        # no dates have been calculated yet
+        print(last_friday.start)
+
+    Once computed, the start and end are stored, so later accesses are as fast as in the default eager mode.
+    Note that errors, e.g., a Between whose start is after its end, are also postponed until first access.
+
+    :param lazy: Whether operators created within this context should be lazy.
+    """
+    token = _LAZY.set(lazy)
+    try:
+        yield
+    finally:
+        _LAZY.reset(token)
+
+
+class _LazyInterval(Interval):
+    """
+    A base class for Intervals whose start and end are computed from other objects by :func:`_resolve`.
+    """
+    __slots__ = ()
+
+    def __post_init__(self):
+        if not _LAZY.get():
+            self._resolve()
+
+    def __getattr__(self, name: str):
+        # only called when normal lookup fails, i.e., when the start or end of a lazy operator has not been computed
+        if name in {"start", "end"}:
+            try:
+                self._resolve()
+            except BaseException:
+                # don't leave behind a partially computed start or end
+                for field_name in ["start", "end"]:
+                    try:
+                        object.__delattr__(self, field_name)
+                    except AttributeError:
+                        pass
+                raise
+            return object.__getattribute__(self, name)
+        raise AttributeError(f"{self.__class__.__name__!r} object has no attribute {name!r}")
+
+    def _resolve(self):
+        raise NotImplementedError
+
+
 @_dataclass
 class Year(Interval):
     """
@@ -707,16 +1326,24 @@ class Year(Interval):
     n_missing_digits: int = 0
     start: datetime.datetime | None = dataclasses.field(init=False, repr=False)
     end: datetime.datetime | None = dataclasses.field(init=False, repr=False)
-    span: (int, int) = dataclasses.field(default=None, repr=False)
+    span: (int, int) = dataclasses.field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
-        duration_in_years = 10 ** self.n_missing_digits
-        self.start = datetime.datetime(year=self.digits * duration_in_years, month=1, day=1)
-        self.end = self.start + dateutil.relativedelta.relativedelta(years=duration_in_years)
+        self.start, self.end = _year_bounds(self.digits, self.n_missing_digits)
+
+    def __hash__(self):
+        return hash((self.__class__, self.digits, self.n_missing_digits))
+
+
+@functools.lru_cache(maxsize=4096)
+def _year_bounds(digits: int, n_missing_digits: int) -> tuple[datetime.datetime, datetime.datetime]:
+    duration_in_years = 10 ** n_missing_digits
+    start = datetime.datetime(year=digits * duration_in_years, month=1, day=1)
+    return start, start + dateutil.relativedelta.relativedelta(years=duration_in_years)
 
 
 @_dataclass
-class YearSuffix(Interval):
+class YearSuffix(_LazyInterval):
     """
     A year-long interval created from the year of another interval and a suffix of digits to replace in that year.
     For example, the year "96" in the context of a document written in 1993 would be represented as::
@@ -735,7 +1362,7 @@ class YearSuffix(Interval):
     end: datetime.datetime | None = dataclasses.field(init=False, repr=False)
     span: (int, int) = dataclasses.field(default=None, repr=False)
 
-    def __post_init__(self):
+    def _resolve(self):
         n_digits = len(str(self.digits))
         divider = 10 ** (n_digits + self.n_missing_digits)
         multiplier = 10 ** n_digits
@@ -744,7 +1371,7 @@ class YearSuffix(Interval):
 
 
 @_dataclass
-class _IntervalOp(Interval):
+class _IntervalOp(_LazyInterval):
     """
     A base class for operators that take in an Interval and a Shift and produce an Interval.
     """
@@ -753,6 +1380,23 @@ class _IntervalOp(Interval):
     start: datetime.datetime | None = dataclasses.field(init=False, repr=False)
     end: datetime.datetime | None = dataclasses.field(init=False, repr=False)
 
+    def _resolve(self):
+        if not self.interval.is_defined():
+            self.start = None
+            self.end = None
+        else:
+            self.start, self.end = self._kernel()(self.interval)
+
+    def _kernel(self) -> typing.Callable[[Interval], Interval | tuple]:
+        """
+        Creates a function from a defined input interval to the start and end of this operator's result, with
+        everything that does not depend on the input interval, e.g., which kind of Shift to apply, already decided.
+        """
+        raise NotImplementedError
+
+
+_REPEATING_SHIFTS = (Repeating, ShiftUnion, RepeatingIntersection)
+
 
 @_dataclass
 class Last(_IntervalOp):
@@ -776,16 +1420,14 @@ class Last(_IntervalOp):
     interval_included: bool = False
     span: (int, int) = dataclasses.field(default=None, repr=False)
 
-    def __post_init__(self):
-        if not self.interval.is_defined():
-            self.start = None
-            self.end = None
-        elif self.shift is None:
-            self.start = None
-            self.end = self.interval.start
+    def _kernel(self) -> typing.Callable[[Interval], Interval | tuple]:
+        shift = self.shift
+        if shift is None:
+            return lambda interval: (None, interval.start)
+        elif self.interval_included:
+            return lambda interval: interval.end - shift
         else:
-            start = self.interval.end if self.interval_included else self.interval.start
-            self.start, self.end = start - self.shift
+            return lambda interval: interval.start - shift
 
 
 @_dataclass
@@ -807,22 +1449,18 @@ class Next(_IntervalOp):
     interval_included: bool = False
     span: (int, int) = dataclasses.field(default=None, repr=False)
 
-    def __post_init__(self):
-        if not self.interval.is_defined():
-            self.start = None
-            self.end = None
-        elif self.shift is None:
-            self.start = self.interval.end
-            self.end = None
+    def _kernel(self) -> typing.Callable[[Interval], Interval | tuple]:
+        shift = self.shift
+        if shift is None:
+            return lambda interval: (interval.end, None)
+        elif not self.interval_included:
+            return lambda interval: interval.end + shift
+        elif isinstance(shift, _REPEATING_SHIFTS):
+            # to allow repeating intervals to start with our start, subtract a tiny amount
+            tiny = _delta(Unit.MICROSECOND, 1)
+            return lambda interval: interval.start - tiny + shift
         else:
-            if self.interval_included:
-                end = self.interval.start
-                # to allow repeating intervals to start with our start, subtract a tiny amount
-                if isinstance(self.shift, (Repeating, ShiftUnion, RepeatingIntersection)):
-                    end -= Unit.MICROSECOND.relativedelta(1)
-            else:
-                end = self.interval.end
-            self.start, self.end = end + self.shift
+            return lambda interval: interval.start + shift
 
 
 @_dataclass
@@ -845,27 +1483,29 @@ class Before(_IntervalOp):
     interval_included: bool = False
     span: (int, int) = dataclasses.field(default=None, repr=False)
 
-    def __post_init__(self):
-        if not self.interval.is_defined():
-            self.start = None
-            self.end = None
-        elif isinstance(self.shift, (Repeating, ShiftUnion, RepeatingIntersection)):
-            start = self.interval.end if self.interval_included else self.interval.start
-            for i in range(self.n - 1):
-                start = (start - self.shift).start
-            self.start, self.end = start - self.shift
-        elif isinstance(self.shift, (Period, PeriodSum)):
-            if self.interval_included:
+    def _kernel(self) -> typing.Callable[[Interval], Interval | tuple]:
+        shift = self.shift
+        n = self.n
+        interval_included = self.interval_included
+
+        if isinstance(shift, _REPEATING_SHIFTS):
+            def before(interval: Interval) -> Interval | tuple:
+                start = interval.end if interval_included else interval.start
+                return _nth_point(shift, start, n - 1, from_end=True) - shift
+        elif isinstance(shift, (Period, PeriodSum)) and not interval_included:
+            def before(interval: Interval) -> Interval | tuple:
+                return (_nth_point(shift, interval.start, n, from_end=True),
+                        _nth_point(shift, interval.end, n, from_end=True))
+        elif isinstance(shift, (Period, PeriodSum)):
+            def before(interval: Interval) -> Interval | tuple:
                 raise ValueError("interval_included=True cannot be used with Periods")
-            self.start, self.end = self.interval
-            for i in range(self.n):
-                self.start = (self.start - self.shift).start
-                self.end = (self.end - self.shift).start
-        elif self.shift is None:
-            self.start = None
-            self.end = self.interval.start
+        elif shift is None:
+            def before(interval: Interval) -> Interval | tuple:
+                return None, interval.start
         else:
-            raise NotImplementedError
+            def before(interval: Interval) -> Interval | tuple:
+                raise NotImplementedError
+        return before
 
 
 @_dataclass
@@ -888,29 +1528,135 @@ class After(_IntervalOp):
     interval_included: bool = False
     span: (int, int) = dataclasses.field(default=None, repr=False)
 
-    def __post_init__(self):
-        if not self.interval.is_defined():
-            self.start = None
-            self.end = None
-        elif isinstance(self.shift, (Repeating, ShiftUnion, RepeatingIntersection)):
-            # to allow repeating intervals to overlap start with our start, subtract a tiny amount
-            end = self.interval.start - Unit.MICROSECOND.relativedelta(
-                1) if self.interval_included else self.interval.end
-            for i in range(self.n - 1):
-                end = (end + self.shift).end
-            self.start, self.end = end + self.shift
-        elif isinstance(self.shift, (Period, PeriodSum)):
-            if self.interval_included:
+    def _kernel(self) -> typing.Callable[[Interval], Interval | tuple]:
+        shift = self.shift
+        n = self.n
+        interval_included = self.interval_included
+        tiny = _delta(Unit.MICROSECOND, 1)
+
+        if isinstance(shift, _REPEATING_SHIFTS):
+            def after(interval: Interval) -> Interval | tuple:
+                # to allow repeating intervals to overlap start with our start, subtract a tiny amount
+                end = interval.start - tiny if interval_included else interval.end
+                return _nth_point(shift, end, n - 1, from_end=False) + shift
+        elif isinstance(shift, (Period, PeriodSum)) and not interval_included:
+            def after(interval: Interval) -> Interval | tuple:
+                return (_nth_point(shift, interval.start, n, from_end=False),
+                        _nth_point(shift, interval.end, n, from_end=False))
+        elif isinstance(shift, (Period, PeriodSum)):
+            def after(interval: Interval) -> Interval | tuple:
                 raise ValueError("interval_included=True cannot be used with Periods")
-            self.start, self.end = self.interval
-            for i in range(self.n):
-                self.start = (self.start + self.shift).end
-                self.end = (self.end + self.shift).end
-        elif self.shift is None:
-            self.start = self.interval.end
-            self.end = None
+        elif shift is None:
+            def after(interval: Interval) -> Interval | tuple:
+                return interval.end, None
+        else:
+            def after(interval: Interval) -> Interval | tuple:
+                raise NotImplementedError
+        return after
+
+
+def _regular_period(shift: Shift) -> Period | None:
+    """
+    The fixed Period between consecutive occurrences of a Repeating, if it has one.
+    For example, Mondays repeat every WEEK and the 15th day of the month repeats every MONTH, but the 31st day of the
+    month and the 60th day of the year do not repeat at a regular period.
+
+    :return: The Period, or None if the occurrences are irregular or the Shift is not a Repeating.
+    """
+    if type(shift) is not Repeating or shift.unit is None:
+        return None
+    if not shift.rrule_kwargs:
+        # weeks and centuries are truncated irregularly at year and century boundaries
+        if shift.unit in {Unit.WEEK, Unit.CENTURY}:
+            return None
+        return shift.period
+    if shift.n_units != 1 or len(shift.rrule_kwargs) != 2 or type(shift.value) is not int:
+        return None
+    match (shift.unit, shift.range):
+        case (Unit.SECOND, Unit.MINUTE) | (Unit.MINUTE, Unit.HOUR) | (Unit.HOUR, Unit.DAY) \
+             | (Unit.DAY, Unit.WEEK) | (Unit.MONTH, Unit.YEAR):
+            return Period(shift.range, 1)
+        case (Unit.DAY, Unit.MONTH) if 1 <= shift.value <= 28:
+            return Period(Unit.MONTH, 1)
+        case _:
+            return None
+
+
+def _nth_point(shift: Shift, point: datetime.datetime, n: int, from_end: bool) -> datetime.datetime:
+    """
+    Applies the Shift n times, each time starting from the end (or, if from_end, the start) of the previous result.
+    Periods and regularly repeating Repeatings jump directly to the result instead of taking n steps.
+
+    :return: The end (or, if from_end, the start) of the nth application of the Shift.
+    """
+    if n <= 0:
+        return point
+    sign = -1 if from_end else 1
+    if isinstance(shift, Period) and type(shift.n) is int and shift.unit is not None \
+            and point != datetime.datetime.min and (shift.unit < Unit.MONTH or point.day <= 28):
+        return point + _delta(shift.unit, sign * n * shift.n)
+    interval = point - shift if from_end else point + shift
+    period = _regular_period(shift) if n > 1 else None
+    if period is not None:
+        # the first step aligned the point with the occurrences, so jump over the remaining ones
+        point = interval.start if from_end else interval.end
+        if period.unit < Unit.MONTH or point.day <= 28:
+            return point + _delta(period.unit, sign * (n - 1) * period.n)
+    for interval in itertools.islice(_iter_shifted(shift, interval, forward=not from_end), n - 1):
+        pass
+    return interval.start if from_end else interval.end
+
+
+def _iter_shifted(shift: Shift, first: Interval, forward: bool) -> typing.Iterator[Interval]:
+    """
+    Yields the intervals that follow from repeatedly applying the Shift: `first.end + shift`, then the end of that plus
+    the Shift, etc., or if not forward, `first.start - shift`, then the start of that minus the Shift, etc.
+    Instead of evaluating the Shift from scratch for each interval, Periods and regularly repeating Repeatings are
+    multiplied out, and other Repeatings share a single solver or rrule iterator.
+    """
+    sign = 1 if forward else -1
+    previous = first
+    period = _regular_period(shift)
+    if isinstance(shift, Period) and type(shift.n) is int and shift.unit is not None:
+        point = first.start if forward else first.end
+        if point != datetime.datetime.min and (shift.unit < Unit.MONTH or point.day <= 28):
+            for k in itertools.count(2):
+                other = point + _delta(shift.unit, sign * k * shift.n)
+                previous = Interval(previous.end, other) if forward else Interval(other, previous.start)
+                yield previous
+    elif period is not None and (period.unit < Unit.MONTH or first.start.day <= 28):
+        # without end-of-month clipping, stepping by the period is the same as multiplying it out
+        step = _delta(period.unit, sign * period.n)
+        length = _delta(shift.period.unit, shift.period.n)
+        start = first.start
+        while True:
+            start += step
+            yield Interval(start, start + length)
+    elif isinstance(shift, Repeating) and shift.rrule_kwargs:
+        length = _delta(shift.period.unit, shift.period.n)
+        solver = _repeating_solver(shift.unit, _freeze_rrule_kwargs(shift.rrule_kwargs))
+        if solver is not None:
+            # the nearest occurrence that does not overlap the previous interval is the next one
+            while (start := solver(previous.end if forward else previous.start - length, forward)) is not None:
+                previous = Interval(start, start + length)
+                yield previous
         else:
-            raise NotImplementedError
+            if forward:
+                occurrences = _iter_rrule(first.start, shift.rrule_kwargs, first.end, forward=True)
+            else:
+                # as in Repeating, going backwards requires a distant starting point
+                dtstart = first.start - Unit.YEAR.relativedelta(100)
+                occurrences = _iter_rrule(dtstart, shift.rrule_kwargs, first.start, forward=False)
+            for start in occurrences:
+                interval = Interval(start, start + length)
+                # skip occurrences that overlap the previous interval
+                if interval.start >= previous.end if forward else interval.end <= previous.start:
+                    previous = interval
+                    yield interval
+    # otherwise, or if there are no more occurrences, apply the Shift one step at a time
+    while True:
+        previous = previous.end + shift if forward else previous.start - shift
+        yield previous
 
 
 @_dataclass
@@ -935,7 +1681,7 @@ class Nth(_IntervalOp):
     from_end: bool = False
     span: (int, int) = dataclasses.field(default=None, repr=False)
 
-    def __post_init__(self):
+    def _resolve(self):
         if self.shift is None or (self.from_end and self.interval.end is None) \
                 or (not self.from_end and self.interval.start is None):
             self.start = None
@@ -945,13 +1691,17 @@ class Nth(_IntervalOp):
             # to allow repeating intervals to overlap start with our start, subtract a tiny amount
             if isinstance(self.shift, (Repeating, ShiftUnion, RepeatingIntersection)) \
                     and not self.from_end and not point == datetime.datetime.min:
-                point -= Unit.MICROSECOND.relativedelta(1)
-            for i in range(self.index - 1):
-                point = (point - self.shift).start if self.from_end else (point + self.shift).end
-            self.start, self.end = point - self.shift if self.from_end else point + self.shift
-            if (self.start is not None and self.interval.start is not None and self.start < self.interval.start) or \
-                    (self.end is not None and self.interval.end is not None and self.end > self.interval.end):
-                raise ValueError(f"{self.isoformat()} is not within {self.interval.isoformat()}:\n{self}")
+                point -= _delta(Unit.MICROSECOND, 1)
+            self._resolve_at(_nth_point(self.shift, point, self.index - 1, self.from_end))
+
+    def _resolve_at(self, point: datetime.datetime):
+        """
+        Applies the Shift once more to the point reached after index - 1 applications.
+        """
+        self.start, self.end = point - self.shift if self.from_end else point + self.shift
+        if (self.start is not None and self.interval.start is not None and self.start < self.interval.start) or \
+                (self.end is not None and self.interval.end is not None and self.end > self.interval.end):
+            raise ValueError(f"{self.isoformat()} is not within {self.interval.isoformat()}:\n{self}")
 
 
 @_dataclass
@@ -975,29 +1725,33 @@ class This(_IntervalOp):
     end: datetime.datetime | None = dataclasses.field(init=False, repr=False)
     span: (int, int) = dataclasses.field(default=None, repr=False)
 
-    def __post_init__(self):
-        if not self.interval.is_defined() or self.shift is None:
-            self.start = None
-            self.end = None
-        elif isinstance(self.shift, (Repeating, ShiftUnion, RepeatingIntersection)):
-            if self.shift.range is None:
-                self.start = self.end = None
-            else:
-                start = self.shift.range.truncate(self.interval.start)
-                self.start, self.end = start - Unit.MICROSECOND.relativedelta(1) + self.shift
-                if (self.end + self.shift).end < self.interval.end:
-                    raise ValueError(f"there is more than one {self.shift} in {self.interval.isoformat()}")
-        elif isinstance(self.shift, (Period, PeriodSum)):
-            if self.shift.unit is None or self.shift.n is None:
-                self.start = self.end = None
-            else:
-                self.start, self.end = self.shift.unit.expand(self.interval, self.shift.n)
+    def _kernel(self) -> typing.Callable[[Interval], Interval | tuple]:
+        shift = self.shift
+        if shift is None or (isinstance(shift, _REPEATING_SHIFTS) and shift.range is None):
+            def this(interval: Interval) -> Interval | tuple:
+                return None, None
+        elif isinstance(shift, _REPEATING_SHIFTS):
+            range_unit = shift.range
+            tiny = _delta(Unit.MICROSECOND, 1)
+
+            def this(interval: Interval) -> Interval | tuple:
+                result = range_unit.truncate(interval.start) - tiny + shift
+                if (result.end + shift).end < interval.end:
+                    raise ValueError(f"there is more than one {shift} in {interval.isoformat()}")
+                return result
+        elif isinstance(shift, (Period, PeriodSum)):
+            def this(interval: Interval) -> Interval | tuple:
+                if shift.unit is None or shift.n is None:
+                    return None, None
+                return shift.unit.expand(interval, shift.n)
         else:
-            raise NotImplementedError
+            def this(interval: Interval) -> Interval | tuple:
+                raise NotImplementedError
+        return this
 
 
 @_dataclass
-class Between(Interval):
+class Between(_LazyInterval):
     """
     Selects the interval between a start and an end interval.
     For example, "since 1994" written on 09 Jan 2007 and interpreted as [1995-01-01T00:00:00, 2007-01-09T00:00:00)
@@ -1020,7 +1774,7 @@ class Between(Interval):
     end: datetime.datetime | None = dataclasses.field(init=False, repr=False)
     span: (int, int) = dataclasses.field(default=None, repr=False)
 
-    def __post_init__(self):
+    def _resolve(self):
         if not self.start_interval.is_defined() or not self.end_interval.is_defined():
             self.start = None
             self.end = None
@@ -1034,7 +1788,7 @@ class Between(Interval):
 
 
 @_dataclass
-class Intersection(Interval):
+class Intersection(_LazyInterval):
     """
     Selects the interval in which all given intervals overlap.
     For example, "Earlier that day" in the context of "We met at 6:00 on 24 Jan 1979. Earlier that day..." would be
@@ -1047,7 +1801,7 @@ class Intersection(Interval):
     end: datetime.datetime | None = dataclasses.field(init=False, repr=False)
     span: (int, int) = dataclasses.field(default=None, repr=False)
 
-    def __post_init__(self):
+    def _resolve(self):
         if any(i.start is None and i.end is None for i in self.intervals):
             self.start = self.end = None
         else:
@@ -1057,10 +1811,45 @@ class Intersection(Interval):
             raise ValueError(f"{self.start.isoformat()} is not before {self.end.isoformat()}")
 
 
-class Intervals(collections.abc.Iterable[Interval], abc.ABC):
+@_dataclass
+class DocTime(Interval):
+    """
+    A placeholder for the document creation time, allowing a tree of operators to be built once and then evaluated
+    against many document creation times with :func:`bind`. For example, "last Friday" could be represented as::
+
+        with lazy_evaluation():
+            last_friday = Last(DocTime(), Repeating(DAY, WEEK, value=4))
+        bind(last_friday, Interval.of(2024, 3, 16))
+
+    Operators over a DocTime must be created with :func:`lazy_evaluation`, since a DocTime has no start or end.
+    A DocTime with a unit stands for the document creation time expanded to that unit, e.g., DocTime(YEAR) for the year
+    of the document creation time.
+    """
+    unit: Unit = None
+    start: datetime.datetime | None = dataclasses.field(init=False, repr=False)
+    end: datetime.datetime | None = dataclasses.field(init=False, repr=False)
+    span: (int, int) = dataclasses.field(default=None, repr=False)
+
+    def __post_init__(self):
+        self.start = None
+        self.end = None
+
+    def bind(self, doc_time: Interval) -> Interval:
+        match self.unit:
+            case None:
+                return doc_time
+            case Unit.YEAR:
+                return Year(doc_time.start.year)
+            case other:
+                raise NotImplementedError(other)
+
+
+class Intervals(_Spanned, collections.abc.Iterable[Interval], abc.ABC):
     """
     A collection of intervals on the timeline.
     """
+    __slots__ = ()
+
     def isoformats(self) -> list[str]:
         return [interval.isoformat() for interval in self]
 
@@ -1083,8 +1872,20 @@ class _N(Intervals):
         interval = self.interval
         interval_included = self.interval_included
         n = 2 if self.n is None else self.n
+        intervals = None
         for i in range(n):
-            interval = self.base_class(interval, self.shift, interval_included)
+            if intervals is None:
+                interval = self.base_class(interval, self.shift, interval_included)
+                if self.base_class in {Last, Next} and self.shift is not None and interval.is_defined():
+                    intervals = _iter_shifted(self.shift, interval, forward=self.base_class is Next)
+            else:
+                # take the following repetitions from a shared cursor instead of evaluating each from scratch
+                token = _LAZY.set(True)
+                try:
+                    interval = self.base_class(interval, self.shift, interval_included)
+                finally:
+                    _LAZY.reset(token)
+                interval.start, interval.end = next(intervals)
             if self.n is None and i == 1:
                 self._adjust_for_n_none(interval)
             yield interval
@@ -1140,8 +1941,16 @@ class NthN(Intervals):
     def __iter__(self) -> typing.Iterator[Interval]:
         n = 2 if self.n is None else self.n
         start = 1 + (self.index - 1) * n
+        point = None
         for index in range(start, start + n):
-            interval = Nth(self.interval, self.shift, index, from_end=self.from_end)
+            if point is None:
+                interval = Nth(self.interval, self.shift, index, from_end=self.from_end)
+            else:
+                # continue from the previous repetition instead of counting again from the end of the interval
+                with lazy_evaluation():
+                    interval = Nth(self.interval, self.shift, index, from_end=self.from_end)
+                interval._resolve_at(point)
+            point = interval.start if self.from_end else interval.end
             if self.n is None and index == start + 1:
                 if self.from_end:
                     interval.start = None
@@ -1161,8 +1970,15 @@ class These(Intervals):
     interval: Interval
     shift: Shift
     span: (int, int) = dataclasses.field(default=None, repr=False)
+    _expanded: bool = dataclasses.field(default=False, init=False, repr=False, compare=False)
 
     def __post_init__(self):
+        # in lazy mode, keep the interval as given and expand it to the Shift range when iterating
+        if not _LAZY.get():
+            self.interval = self._expand()
+            self._expanded = True
+
+    def _expand(self) -> Interval:
         if not self.interval.is_defined() or self.shift is None:
             start = None
             end = None
@@ -1175,89 +1991,323 @@ class These(Intervals):
             end = range_unit.truncate(self.interval.end)
             if end != self.interval.end:
                 _, end = end + Repeating(range_unit)
-        self.interval = Interval(start, end)
+        return Interval(start, end)
 
     def __iter__(self) -> typing.Iterator[Interval]:
+        range_interval = self.interval if self._expanded else self._expand()
         # without a start, we can't find anything
-        if self.interval.start is None:
+        if range_interval.start is None:
             yield Interval(None, None)
         # without an end, we would generate an infinite number of intervals
-        elif self.interval.end is None:
+        elif range_interval.end is None:
             yield Interval(None, None)
         else:
-            interval = self.interval.start + self.shift
+            interval = range_interval.start + self.shift
+            intervals = None
             while True:
                 if interval.end is None:
                     yield Interval(None, None)
                     break
-                if interval.end > self.interval.end:
+                if interval.end > range_interval.end:
                     break
                 yield interval
-                interval = interval.end + self.shift
+                if intervals is None:
+                    # take the following occurrences from a shared cursor instead of evaluating each from scratch
+                    intervals = _iter_shifted(self.shift, interval, forward=True)
+                interval = next(intervals)
 
 
 def from_xml(elem: et.Element,
-             known_intervals: dict[(int, int), Interval] = None) -> list[Shift | Interval | Intervals]:
+             known_intervals: dict[(int, int), Interval] = None,
+             lazy: bool = False) -> list[Shift | Interval | Intervals]:
     """
     Reads Intervals and Shifts from SCATE Anafora XML.
 
     :param elem: The root <data> element of a SCATE Anafora XML document.
     :param known_intervals: A mapping from character offset spans to Intervals, representing intervals that are already
     known before parsing begins. The document creation time should be specified with the span (None, None).
+    To parse once and evaluate against many document creation times, specify a :class:`DocTime` placeholder, which
+    implies :code:`lazy=True`, and then call :func:`bind` on the results.
+    :param lazy: Postpone computing the start and end of each Interval until it is first accessed.
+    See :func:`lazy_evaluation`.
     :return: Intervals and Shifts corresponding to the XML definitions.
     """
+    if known_intervals is not None and isinstance(known_intervals.get((None, None)), DocTime):
+        lazy = True
+    with lazy_evaluation(lazy):
+        return _from_xml(elem.findall(".//entity"), known_intervals)
+
+
+def iter_from_xml(source: str | os.PathLike | typing.BinaryIO,
+                  known_intervals: dict[(int, int), Interval] = None,
+                  lazy: bool = False) -> typing.Iterator[Shift | Interval | Intervals]:
+    """
+    Reads Intervals and Shifts from a SCATE Anafora XML file without loading the whole file, e.g., for a large dump of
+    many <data> documents under a common root element. Entities are parsed one <data> document at a time (since an
+    entity may refer to one later in its document), and each document's elements are discarded once its Intervals and
+    Shifts have been yielded, so memory use is bounded by the largest document rather than the whole file.
+
+    :param source: The path to, or a binary file object of, the Anafora XML.
+    :param known_intervals: As for :func:`from_xml`, and used for every document.
+    :param lazy: As for :func:`from_xml`.
+    :return: An iterator over the same Intervals and Shifts that :func:`from_xml` would return for each document.
+    """
+    if known_intervals is not None and isinstance(known_intervals.get((None, None)), DocTime):
+        lazy = True
+    root = None
+    entities = []
+    for event, element in et.iterparse(source, events=("start", "end")):
+        if root is None:
+            root = element
+        if event == "start":
+            continue
+        if element.tag == "entity":
+            entities.append(element)
+        elif element.tag == "data":
+            with lazy_evaluation(lazy):
+                objects = _from_xml(entities, known_intervals, clear=True)
+            entities = []
+            element.clear()
+            # drop the finished documents from the root of a multi-document file
+            if element is not root:
+                root.clear()
+            yield from objects
+    # entities outside of any <data> element
+    if entities:
+        with lazy_evaluation(lazy):
+            objects = _from_xml(entities, known_intervals, clear=True)
+        yield from objects
+
+
+@functools.cache
+def _source_version() -> str:
+    # scate has no release version, so any change to its source code invalidates cached objects
+    return hashlib.sha256(pathlib.Path(__file__).read_bytes()).hexdigest()
+
+
+class XMLCache:
+    """
+    An on-disk cache of the Intervals and Shifts read from Anafora XML, for re-reading the same files, e.g., in each
+    run of an experiment. For example::
+
+        cache = XMLCache("~/.cache/scate", max_bytes=2 ** 30, max_age=datetime.timedelta(days=30))
+        objects = cache.from_xml(xml_path, known_intervals={(None, None): doc_time})
+
+    Entries are keyed by a hash of the XML bytes, the known intervals (including the document creation time), and the
+    scate source code, so a change to any of them is a cache miss. Entries older than max_age are ignored and deleted,
+    and when the entries take more than max_bytes, the least recently used are deleted. Several processes may share a
+    directory. Entries are stored in the binary form of :func:`to_bytes`.
+    """
+    _SUFFIX = ".scate"
+
+    def __init__(self,
+                 directory: str | os.PathLike,
+                 max_bytes: int | None = None,
+                 max_age: datetime.timedelta | None = None):
+        """
+        :param directory: Where to store the entries. It is created if it does not exist.
+        :param max_bytes: The maximum total size of the entries, or None for no limit.
+        :param max_age: The maximum time since an entry was last written or read, or None for no limit.
+        """
+        self.directory = pathlib.Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # the last use time and the size of each entry, scanned once, so that eviction does not list the directory
+        self._entries: dict[pathlib.Path, tuple[float, int]] = {}
+        self._n_bytes = 0
+        for path in self.directory.glob(f"*{self._SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            self._add(path, stat.st_mtime, stat.st_size)
+        self.evict()
+
+    def _add(self, path: pathlib.Path, mtime: float, size: int):
+        self._discard(path)
+        self._entries[path] = (mtime, size)
+        self._n_bytes += size
+
+    def _discard(self, path: pathlib.Path):
+        _, size = self._entries.pop(path, (None, 0))
+        self._n_bytes -= size
+
+    def _delete(self, path: pathlib.Path):
+        self._discard(path)
+        path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _key(xml_bytes: bytes, known_intervals: dict[(int, int), Interval] | None, lazy: bool) -> str:
+        digest = hashlib.sha256(_source_version().encode())
+        for span, interval in sorted((known_intervals or {}).items(), key=lambda item: repr(item[0])):
+            value = interval.isoformat() if type(interval) is Interval else repr(interval)
+            digest.update(f"{span!r}={type(interval).__qualname__}:{value};".encode())
+        digest.update(b"lazy;" if lazy else b"eager;")
+        digest.update(xml_bytes)
+        return digest.hexdigest()
+
+    def from_xml(self,
+                 source: str | os.PathLike | bytes,
+                 known_intervals: dict[(int, int), Interval] = None,
+                 lazy: bool = False) -> list[Shift | Interval | Intervals]:
+        """
+        Reads Intervals and Shifts as :func:`from_xml` would (or, for multi-document files, as :func:`iter_from_xml`
+        would), from the cache if possible.
+
+        :param source: The path to, or the bytes of, the Anafora XML.
+        :param known_intervals: As for :func:`from_xml`.
+        :param lazy: As for :func:`from_xml`.
+        :return: The Intervals and Shifts corresponding to the XML definitions.
+        """
+        xml_bytes = source if isinstance(source, bytes) else pathlib.Path(source).read_bytes()
+        path = self.directory / f"{self._key(xml_bytes, known_intervals, lazy)}{self._SUFFIX}"
+        now = time.time()
+        try:
+            with open(path, "rb") as cache_file:
+                stat = os.fstat(cache_file.fileno())
+                if self.max_age is None or now - stat.st_mtime <= self.max_age.total_seconds():
+                    objects = from_bytes(cache_file.read())
+                    # mark the entry as recently used
+                    with contextlib.suppress(OSError):
+                        os.utime(path, (now, now))
+                    self._add(path, now, stat.st_size)
+                    return objects
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            # e.g., an entry corrupted on disk
+            pass
+        objects = list(iter_from_xml(io.BytesIO(xml_bytes), known_intervals, lazy))
+        self._store(path, objects)
+        return objects
+
+    def _store(self, path: pathlib.Path, objects: list[Shift | Interval | Intervals]):
+        try:
+            data = to_bytes(objects)
+        except TypeError:
+            # objects with fields that cannot be serialized, e.g., some created by hand in known_intervals
+            return
+        # write to a uniquely named temporary file and then rename it, so that other processes and threads never read
+        # (or write to) a partial entry
+        temp_file = None
+        try:
+            with tempfile.NamedTemporaryFile(dir=self.directory, prefix=path.name, suffix=".tmp",
+                                             delete=False) as temp_file:
+                temp_file.write(data)
+            os.replace(temp_file.name, path)
+            stat = path.stat()
+        except OSError:
+            # e.g., a full disk or a read-only directory; the objects were parsed, so they are returned uncached
+            if temp_file is not None:
+                pathlib.Path(temp_file.name).unlink(missing_ok=True)
+            return
+        self._add(path, stat.st_mtime, stat.st_size)
+        if self.max_bytes is not None and self._n_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Deletes the entries that are older than max_age, and then, if the entries take more than max_bytes, the least
+        recently used entries, until they take at most 90% of max_bytes (so that eviction is not needed on every
+        write). Entries are also evicted as needed when the cache is created and when entries are written.
+        """
+        if self.max_age is not None:
+            oldest = time.time() - self.max_age.total_seconds()
+            for path, (mtime, _) in list(self._entries.items()):
+                if mtime < oldest:
+                    self._delete(path)
+        if self.max_bytes is not None and self._n_bytes > self.max_bytes:
+            for path, _ in sorted(self._entries.items(), key=lambda item: item[1][0]):
+                if self._n_bytes <= 0.9 * self.max_bytes:
+                    break
+                self._delete(path)
+
+
+def _from_xml(entities: typing.Iterable[et.Element],
+              known_intervals: dict[(int, int), Interval] = None,
+              clear: bool = False) -> list[Shift | Interval | Intervals]:
     if known_intervals is None:
         known_intervals = {}
 
     @_dataclass
-    class Number:
+    class Number(_Spanned):
         value: int | float
         shift: Shift = None
         span: (int, int) = dataclasses.field(default=None, repr=False)
 
     @_dataclass
-    class AMPM:
+    class AMPM(_Spanned):
         value: str
         span: (int, int) = dataclasses.field(default=None, repr=False)
 
     id_to_entity = {}
+    id_to_properties = {}
     id_to_children = {}
     id_to_n_parents = collections.Counter()
-    for entity in elem.findall(".//entity"):
+    for entity in entities:
         entity_id = entity.findtext("id")
         if entity_id in id_to_entity:
             other = id_to_entity[entity_id]
             raise ValueError(f"duplicate id {entity_id} on {et.tostring(entity)} and {et.tostring(other)}")
         id_to_entity[entity_id] = entity
-        id_to_children[entity_id] = set()
+        # read each property once, keeping all the values of repeated properties (e.g., Intervals) in order
+        id_to_properties[entity_id] = properties = collections.defaultdict(list)
+        id_to_children[entity_id] = children = set()
         for prop in entity.find("properties"):
+            properties[prop.tag].append(prop.text or "")
             if prop.text and '@' in prop.text:
-                id_to_children[entity_id].add(prop.text)
+                children.add(prop.text)
                 id_to_n_parents[prop.text] += 1
 
-    # to avoid infinite loops below, remove non-existent entities (i.e., values that are not keys)
-    for key in id_to_children:
-        id_to_children[key].intersection_update(id_to_children.keys())
-
-    # topological sort
-    sorted_ids = {}
-    while id_to_children:
-        for key in list(id_to_children):
-            if not id_to_children[key]:
-                id_to_children.pop(key)
-                sorted_ids[key] = True
-        for key, values in id_to_children.items():
-            id_to_children[key] -= sorted_ids.keys()
+    # topological sort (Kahn's algorithm), ignoring non-existent entities (i.e., values that are not keys)
+    id_to_parents = collections.defaultdict(list)
+    id_to_n_unsorted = {}
+    for key, children in id_to_children.items():
+        # filter rather than intersection_update, which would iterate over all of the keys for each entity
+        children = id_to_children[key] = {child for child in children if child in id_to_children}
+        id_to_n_unsorted[key] = len(children)
+        for child in children:
+            id_to_parents[child].append(key)
+    # entities are ordered by height (leaves first), and then by document order, so group them into levels
+    level = [key for key, n_unsorted in id_to_n_unsorted.items() if not n_unsorted]
+    id_to_height = dict.fromkeys(level, 0)
+    while level:
+        next_level = []
+        for key in level:
+            for parent in id_to_parents[key]:
+                id_to_n_unsorted[parent] -= 1
+                if not id_to_n_unsorted[parent]:
+                    next_level.append(parent)
+                    id_to_height[parent] = id_to_height[key] + 1
+        level = next_level
+    if len(id_to_height) < len(id_to_entity):
+        cycle_ids = [key for key in id_to_entity if key not in id_to_height]
+        raise ValueError(f"cyclic references among {cycle_ids}")
+    levels = [[] for _ in range(max(id_to_height.values(), default=-1) + 1)]
+    for key in id_to_entity:
+        levels[id_to_height[key]].append(key)
+    sorted_ids = [key for level in levels for key in level]
 
     id_to_obj = {}
+    # the span and trigger span of each object; value types are shared (see intern), so their spans are kept here
+    id_to_spans = {}
     for entity_id in sorted_ids:
-        entity = id_to_entity[entity_id]
-        sub_interval_id = entity.findtext("properties/Sub-Interval")
-        super_interval_id = entity.findtext("properties/Super-Interval")
+        # nothing refers to the element once its object has been created
+        entity = id_to_entity.pop(entity_id)
+        properties = id_to_properties.pop(entity_id)
+
+        # helper for the text of a property, like entity.findtext(f"properties/{prop_name}")
+        def prop_text(prop_name: str) -> str | None:
+            values = properties.get(prop_name)
+            return values[0] if values else None
+
+        sub_interval_id = prop_text("Sub-Interval")
+        super_interval_id = prop_text("Super-Interval")
         entity_type = entity.findtext("type")
-        prop_value = entity.findtext("properties/Value")
-        prop_type = entity.findtext("properties/Type")
-        prop_number = entity.findtext("properties/Number")
+        prop_value = prop_text("Value")
+        prop_type = prop_text("Type")
+        prop_number = prop_text("Number")
         spans = []
 
         # TODO: revisit whether discontinuous spans need to be retained
@@ -1273,17 +2323,17 @@ def from_xml(elem: et.Element,
             if not id_to_n_parents[obj_id]:
                 id_to_obj.pop(obj_id)
             if result.__class__ is not Interval:  # raw Interval has no span attribute
-                spans.append(result.span)
+                spans.append(id_to_spans[obj_id][0])
             return result
 
-        # helper for ET.findall + text + pop
+        # helper for all values of a property + pop
         def pop_all_prop(prop_name: str) -> list[Interval | Shift | Period | Repeating | Number | AMPM]:
-            return [pop(e.text) for e in entity.findall(f"properties/{prop_name}") if e.text]
+            return [pop(text) for text in properties.get(prop_name, ()) if text]
 
         # helper for managing the multiple interval properties
         def get_interval(prop_name: str) -> Interval:
-            prop_interval_type = entity.findtext(f"properties/{prop_name}-Type")
-            prop_interval = entity.findtext(f"properties/{prop_name}")
+            prop_interval_type = prop_text(f"{prop_name}-Type")
+            prop_interval = prop_text(prop_name)
             match prop_interval_type:
                 case "Link":
                     return pop(prop_interval)
@@ -1291,7 +2341,9 @@ def from_xml(elem: et.Element,
                     return known_intervals.get((None, None))
                 case "DocTime-Year" if (None, None) in known_intervals:
                     doc_time = known_intervals.get((None, None))
-                    return Year(doc_time.start.year)
+                    if isinstance(doc_time, DocTime):
+                        return DocTime(Unit.YEAR)
+                    return _interned(Year, doc_time.start.year)
                 case "DocTime" | "DocTime-Year":
                     raise ValueError(f"known_intervals[(None, None)] required")
                 case "DocTime-Era":
@@ -1303,12 +2355,12 @@ def from_xml(elem: et.Element,
 
         # helper for managing the multiple shift properties
         def get_shift() -> Shift:
-            prop_shift = entity.findtext("properties/Period") or entity.findtext("properties/Repeating-Interval")
+            prop_shift = prop_text("Period") or prop_text("Repeating-Interval")
             return pop(prop_shift) if prop_shift else None
 
         # helper for managing Included properties
         def get_included(prop_name: str) -> bool:
-            match entity.findtext(f"properties/{prop_name}"):
+            match prop_text(prop_name):
                 case "Included" | "Interval-Included":
                     return True
                 case "Not-Included" | "Interval-Not-Included" | "Standard":
@@ -1332,33 +2384,33 @@ def from_xml(elem: et.Element,
                         n = pop(prop_number).value
                     else:
                         n = None
-                    obj = Period(unit, n)
+                    obj = _interned(Period, unit, n)
                 case "Sum":
-                    obj = PeriodSum(pop_all_prop("Periods"))
+                    obj = _interned(PeriodSum, pop_all_prop("Periods"))
                 case "Year" | "Two-Digit-Year":
                     digits_str = prop_value.rstrip('?')
                     n_missing_digits = len(prop_value) - len(digits_str)
                     digits = int(digits_str)
                     match entity_type:
                         case "Year":
-                            obj = Year(digits, n_missing_digits)
+                            obj = _interned(Year, digits, n_missing_digits)
                         case "Two-Digit-Year":
                             obj = YearSuffix(get_interval("Interval"), digits, n_missing_digits)
                         case other:
                             raise NotImplementedError(other)
                 case "Month-Of-Year":
                     month_int = datetime.datetime.strptime(prop_type, '%B').month
-                    obj = Repeating(Unit.MONTH, Unit.YEAR, value=month_int)
+                    obj = _interned(Repeating, Unit.MONTH, Unit.YEAR, value=month_int)
                 case "Day-Of-Month":
-                    obj = Repeating(Unit.DAY, Unit.MONTH, value=int(prop_value))
+                    obj = _interned(Repeating, Unit.DAY, Unit.MONTH, value=int(prop_value))
                 case "Day-Of-Week":
                     day_int = getattr(dateutil.relativedelta, prop_type.upper()[:2]).weekday
-                    obj = Repeating(Unit.DAY, Unit.WEEK, value=day_int)
+                    obj = _interned(Repeating, Unit.DAY, Unit.WEEK, value=day_int)
                 case "AMPM-Of-Day":
                     obj = AMPM(prop_type)
                 case "Hour-Of-Day":
                     hour = int(prop_value)
-                    prop_am_pm = entity.findtext("properties/AMPM-Of-Day")
+                    prop_am_pm = prop_text("AMPM-Of-Day")
                     if prop_am_pm:
                         match pop(prop_am_pm).value:
                             case "AM" if hour == 12:
@@ -1369,23 +2421,23 @@ def from_xml(elem: et.Element,
                                 pass
                             case other:
                                 raise NotImplementedError(other)
-                    obj = Repeating(Unit.HOUR, Unit.DAY, value=hour)
+                    obj = _interned(Repeating, Unit.HOUR, Unit.DAY, value=hour)
                 case "Minute-Of-Hour":
-                    obj = Repeating(Unit.MINUTE, Unit.HOUR, value=int(prop_value))
+                    obj = _interned(Repeating, Unit.MINUTE, Unit.HOUR, value=int(prop_value))
                 case "Second-Of-Minute":
-                    obj = Repeating(Unit.SECOND, Unit.MINUTE, value=int(prop_value))
+                    obj = _interned(Repeating, Unit.SECOND, Unit.MINUTE, value=int(prop_value))
                 case "Part-Of-Day" | "Season-Of-Year" if prop_type in {"Unknown", "Dawn", "Dusk"}:
                     # TODO: improve handling of location-dependent times
-                    obj = Repeating(None)
+                    obj = _interned(Repeating, None)
                 case "Part-Of-Day" | "Part-Of-Week" | "Season-Of-Year":
-                    obj = globals()[prop_type]()
+                    obj = _interned(globals()[prop_type])
                 case "Calendar-Interval":
                     unit_name = prop_type.upper().replace("-", "_")
-                    obj = Repeating(Unit.__members__[unit_name])
+                    obj = _interned(Repeating, Unit.__members__[unit_name])
                 case "Union":
-                    obj = ShiftUnion(pop_all_prop("Repeating-Intervals"))
+                    obj = _interned(ShiftUnion, pop_all_prop("Repeating-Intervals"))
                 case "Every-Nth":
-                    obj = EveryNth(get_shift(), int(prop_value))
+                    obj = _interned(EveryNth, get_shift(), int(prop_value))
                 case "Last" | "Next" | "Before" | "After" | "NthFromEnd" | "NthFromStart":
                     cls_name = "Nth" if entity_type.startswith("Nth") else entity_type
                     interval = get_interval("Interval")
@@ -1415,11 +2467,11 @@ def from_xml(elem: et.Element,
                         case intervals, []:
                             obj = Intersection(intervals)
                         case [], repeating_intervals:
-                            obj = RepeatingIntersection(repeating_intervals)
+                            obj = _interned(RepeatingIntersection, repeating_intervals)
                         case [interval], [repeating_interval]:
                             obj = This(interval, repeating_interval)
                         case [interval], repeating_intervals:
-                            obj = This(interval, RepeatingIntersection(repeating_intervals))
+                            obj = This(interval, _interned(RepeatingIntersection, repeating_intervals))
                         case other:
                             raise NotImplementedError(other)
                 case "Number":
@@ -1445,8 +2497,13 @@ def from_xml(elem: et.Element,
                     raise NotImplementedError(other)
 
             # add spans to objects
-            obj.span = obj.trigger_span = trigger_span
-            spans.append(obj.span)
+            base_obj = obj
+            if isinstance(obj, _VALUE_TYPES):
+                own_trigger_span = trigger_span
+            else:
+                obj.span = obj.trigger_span = trigger_span
+                own_trigger_span = None
+            spans.append(trigger_span)
 
             # if Number property is present, wrap shift with number for later use
             # skip this for Periods, which directly consume their Number above
@@ -1464,7 +2521,7 @@ def from_xml(elem: et.Element,
                     case "Month-Of-Year" | "Day-Of-Month" | "Day-Of-Week" | \
                          "Part-Of-Week" | "Part-Of-Day" | \
                          "Hour-Of-Day" | "Minute-Of-Hour" | "Second-Of-Minute":
-                        obj = RepeatingIntersection([obj, sub_interval])
+                        obj = _interned(RepeatingIntersection, [obj, sub_interval])
                     case other:
                         raise NotImplementedError(other)
 
@@ -1475,24 +2532,40 @@ def from_xml(elem: et.Element,
                     case Year() | YearSuffix() | This():
                         obj = This(super_interval, obj)
                     case Repeating():
-                        obj = RepeatingIntersection([super_interval, obj])
+                        obj = _interned(RepeatingIntersection, [super_interval, obj])
                     case other:
                         raise NotImplementedError(other)
 
-            obj.span = (min(start for start, _ in spans), max(end for _, end in spans))
+            span = (min(start for start, _ in spans), max(end for _, end in spans))
+            if isinstance(obj, _VALUE_TYPES):
+                # only the base object has a trigger span, not the intersections created for sub- and super-intervals
+                id_to_spans[entity_id] = (span, own_trigger_span if obj is base_obj else None)
+            else:
+                obj.span = span
+                id_to_spans[entity_id] = (span, None)
 
         except Exception as ex:
             raise AnaforaXMLParsingError(entity, trigger_span) from ex
 
         # add the object to the mapping
         id_to_obj[entity_id] = obj
-
-    # remove any Number objects as they're internal implementation details
-    for key in list(id_to_obj):
-        if isinstance(id_to_obj[key], Number):
-            del id_to_obj[key]
-
-    return list(id_to_obj.values())
+        if clear:
+            entity.clear()
+
+    # remove any Number objects as they're internal implementation details, and give each shared value type that is
+    # returned its own copy with spans
+    result = []
+    for key, obj in id_to_obj.items():
+        if isinstance(obj, Number):
+            continue
+        if isinstance(obj, _VALUE_TYPES):
+            span, trigger_span = id_to_spans[key]
+            obj = _unshared(obj)
+            obj.span = span
+            if trigger_span is not None:
+                obj.trigger_span = trigger_span
+        result.append(obj)
+    return result
 
 
 class AnaforaXMLParsingError(RuntimeError):
@@ -1528,6 +2601,1022 @@ def flatten(shift_or_interval: Shift | Interval) -> Shift | Interval:
             return shift_or_interval
 
 
+def bind(obj: Shift | Interval | Intervals, doc_time: Interval) -> Shift | Interval | Intervals:
+    """
+    Replaces the :class:`DocTime` placeholders in an object created by :func:`from_xml` (or by hand).
+    For example, to evaluate the same annotations against two document creation times::
+
+        objects = from_xml(elem, known_intervals={(None, None): DocTime()})
+        for doc_time in [Interval.of(2024, 3, 16), Interval.of(1998, 2, 16)]:
+            print([bind(obj, doc_time) for obj in objects])
+
+    Only the parts of the object that depend on the document creation time are recreated; everything else, including
+    all Shifts, is shared with the original object.
+
+    :param obj: The object containing DocTime placeholders.
+    :param doc_time: The document creation time.
+    :return: The object with any DocTime placeholders replaced by the document creation time.
+    """
+    return _bind(obj, doc_time, {})
+
+
+def _bind(obj, doc_time: Interval, memo: dict[int, typing.Any]):
+    if id(obj) in memo:
+        return memo[id(obj)]
+    match obj:
+        case DocTime():
+            result = obj.bind(doc_time)
+        case Shift():
+            # Shifts do not contain Intervals
+            result = obj
+        case list() | tuple():
+            items = [_bind(item, doc_time, memo) for item in obj]
+            changed = any(new is not old for new, old in zip(items, obj))
+            result = type(obj)(items) if changed else obj
+        case Interval() | Intervals() if dataclasses.is_dataclass(obj):
+            changes = {}
+            for field in dataclasses.fields(obj):
+                if field.init:
+                    value = getattr(obj, field.name)
+                    new_value = _bind(value, doc_time, memo)
+                    if new_value is not value:
+                        changes[field.name] = new_value
+            if not changes:
+                result = obj
+            else:
+                result = dataclasses.replace(obj, **changes)
+                try:
+                    result.trigger_span = obj.trigger_span
+                except AttributeError:
+                    pass
+        case _:
+            result = obj
+    memo[id(obj)] = result
+    return result
+
+
+def compile(obj: Shift | Interval | Intervals) -> typing.Callable[[Interval], Shift | Interval | Intervals]:
+    """
+    Lowers an object containing :class:`DocTime` placeholders into a function from a document creation time to the
+    evaluated object. For example, to evaluate "last Friday" against many document creation times::
+
+        with lazy_evaluation():
+            last_friday = compile(Last(DocTime(), Repeating(DAY, WEEK, value=4)))
+        for doc_time in [Interval.of(2024, 3, 16), Interval.of(1998, 2, 16)]:
+            print(last_friday(doc_time).isoformat())
+
+    The result of calling the function has the same start and end as :code:`bind(obj, doc_time)`, but the work that
+    does not depend on the document creation time is done only once, when compiling: Last, Next, Before, After and This
+    decide how to apply their Shift, and parts of the object without a DocTime are shared across calls.
+    Last, Next, Before, After and This evaluate to plain Intervals; other operators evaluate to new operators, as in
+    :func:`bind`.
+
+    :param obj: The object containing DocTime placeholders.
+    :return: A function that takes the document creation time and returns the evaluated object.
+    """
+    function, _ = _compile(obj, {})
+    return function
+
+
+def _compile(obj, memo: dict[int, tuple[typing.Callable, bool]]) -> tuple[typing.Callable, bool]:
+    """
+    :return: The compiled function, and whether it returns the same object regardless of the document creation time.
+    """
+    if id(obj) in memo:
+        return memo[id(obj)]
+    result = None
+    match obj:
+        case DocTime() if obj.unit is None:
+            result = (lambda doc_time: doc_time), False
+        case DocTime():
+            result = obj.bind, False
+        case Shift():
+            # Shifts do not contain Intervals
+            pass
+        case list() | tuple():
+            compiled = [_compile(item, memo) for item in obj]
+            if not all(constant for _, constant in compiled):
+                functions = [function for function, _ in compiled]
+                result = (lambda doc_time: type(obj)(function(doc_time) for function in functions)), False
+        case _IntervalOp() if type(obj)._kernel is not _IntervalOp._kernel:
+            interval, constant = _compile(obj.interval, memo)
+            if not constant:
+                kernel = obj._kernel()
+
+                def apply_kernel(doc_time: Interval) -> Interval:
+                    input_interval = interval(doc_time)
+                    if not input_interval.is_defined():
+                        return Interval(None, None)
+                    return Interval(*kernel(input_interval))
+                result = apply_kernel, False
+        case Interval() | Intervals() if dataclasses.is_dataclass(obj):
+            compiled = {field.name: _compile(getattr(obj, field.name), memo)
+                        for field in dataclasses.fields(obj) if field.init}
+            functions = {name: function for name, (function, constant) in compiled.items() if not constant}
+            if functions:
+                def replace(doc_time: Interval) -> Interval | Intervals:
+                    replaced = dataclasses.replace(obj, **{name: f(doc_time) for name, f in functions.items()})
+                    try:
+                        replaced.trigger_span = obj.trigger_span
+                    except AttributeError:
+                        pass
+                    return replaced
+                result = replace, False
+    if result is None:
+        result = (lambda doc_time: obj), True
+    memo[id(obj)] = result
+    return result
+
+
+_VALUE_TYPES = (Period, PeriodSum, Repeating, EveryNth, ShiftUnion, RepeatingIntersection, Year)
+# the canonical instances, least recently used first; bounded, so that a long-running process does not keep every
+# distinct value alive forever
+_INTERNED: collections.OrderedDict[tuple, Shift | Interval] = collections.OrderedDict()
+_INTERNED_MAX_SIZE = 65536
+_INTERNED_LOCK = threading.Lock()
+
+
+def intern(obj: Shift | Interval) -> Shift | Interval:
+    """
+    Returns a canonical, shared instance of a value type: Period, PeriodSum, Repeating (including Spring, Morning,
+    etc.), EveryNth, ShiftUnion, RepeatingIntersection or Year.
+    For example, the two Fridays below are the same object::
+
+        intern(Repeating(DAY, WEEK, value=4, span=(5, 11))) is intern(Repeating(DAY, WEEK, value=4))
+
+    Sharing avoids storing many copies of the same value, and makes the memoized results of evaluating a repeating
+    interval against an anchor available to every expression that uses it. :func:`from_xml` shares values this way
+    too, keeping spans only on the operators that use them and on the objects it returns.
+    Since canonical instances are shared, they have no span or trigger_span, and should not be modified.
+
+    :param obj: The object to intern. Objects that are not value types are returned unchanged.
+    :return: The canonical instance equal to obj, ignoring spans.
+    """
+    match obj:
+        case Period() | PeriodSum() | Repeating() | EveryNth() | ShiftUnion() | RepeatingIntersection() | Year():
+            key = _value_key(obj)
+            with _INTERNED_LOCK:
+                result = _INTERNED.get(key)
+                if result is not None:
+                    _INTERNED.move_to_end(key)
+                    return result
+            values = {}
+            for field in _init_fields(obj.__class__):
+                match getattr(obj, field.name):
+                    case Shift() | Year() as value:
+                        values[field.name] = intern(value)
+                    case list() as values_list:
+                        values[field.name] = [intern(value) for value in values_list]
+                    case dict() as values_dict:
+                        values[field.name] = dict(values_dict)
+                    case value:
+                        values[field.name] = value
+            # the object itself can be the canonical one, unless it has a span or children that are not canonical
+            children = [(value, getattr(obj, name)) for name, value in values.items() if not isinstance(value, dict)]
+            children = [(new, old) for value, obj_value in children
+                        for new, old in (zip(value, obj_value) if isinstance(value, list) else [(value, obj_value)])]
+            if _has_slot_value(obj, "trigger_span") or getattr(obj, "span", None) is not None or \
+                    any(new is not old for new, old in children):
+                obj = obj.__class__(**values)
+            return _add_interned(obj, key)
+        case _:
+            return obj
+
+
+@functools.cache
+def _init_fields(cls: type) -> tuple[dataclasses.Field, ...]:
+    # the fields that determine the value of an object: everything passed to the constructor, except the span
+    return tuple(field for field in dataclasses.fields(cls) if field.init and field.name != "span")
+
+
+def _value_key(obj: Shift | Interval) -> tuple:
+    return obj.__class__, *(_hashable(getattr(obj, field.name)) for field in _init_fields(obj.__class__))
+
+
+def _add_interned(obj: Shift | Interval, *keys: tuple) -> Shift | Interval:
+    # adds obj as the canonical instance for its keys, unless another thread has already added an equal one
+    with _INTERNED_LOCK:
+        result = _INTERNED.setdefault(keys[0], obj)
+        for key in keys:
+            _INTERNED[key] = result
+            _INTERNED.move_to_end(key)
+        while len(_INTERNED) > _INTERNED_MAX_SIZE:
+            _INTERNED.popitem(last=False)
+    return result
+
+
+def _interned(cls: type, *args, **kwargs) -> Shift | Interval:
+    """
+    Like :code:`intern(cls(*args, **kwargs))`, but also keyed on the constructor arguments, so that no object is created
+    when there is already a canonical one. The arguments must not include a span, and any Shift or Interval arguments
+    should already be canonical.
+    """
+    fields = _init_fields(cls)
+    values = dict(zip((field.name for field in fields), args), **kwargs)
+    for field in fields:
+        if field.name not in values:
+            if field.default_factory is not dataclasses.MISSING:
+                values[field.name] = field.default_factory()
+            elif field.default is not dataclasses.MISSING:
+                values[field.name] = field.default
+    # the arguments may differ from the fields, e.g., __post_init__ fills in a Repeating's rrule_kwargs
+    arguments_key = ("arguments", cls, *(_hashable(values.get(field.name, dataclasses.MISSING)) for field in fields))
+    with _INTERNED_LOCK:
+        result = _INTERNED.get(arguments_key)
+        if result is not None:
+            _INTERNED.move_to_end(arguments_key)
+            return result
+    result = cls(**values)
+    return _add_interned(result, _value_key(result), arguments_key)
+
+
+def _unshared(obj: Shift | Interval) -> Shift | Interval:
+    # a copy of a canonical instance, to which spans can be attached
+    names = _slot_names(obj.__class__)
+    return _copy_slots(obj.__class__, {name: object.__getattribute__(obj, name)
+                                       for name in names if _has_slot_value(obj, name)})
+
+
+def _hashable(value):
+    match value:
+        case list() | tuple():
+            return tuple(_hashable(item) for item in value)
+        case dict():
+            return _freeze_rrule_kwargs(value)
+        case _:
+            return value
+
+
+class _Frozen:
+    """
+    A mixin for the frozen variants of scate classes created by :func:`freeze`.
+    """
+    __slots__ = ()
+    _unfrozen: type
+
+    def __init__(self, *args, **kwargs):
+        # construction, e.g., by dataclasses.replace in bind, is allowed, and then the result is sealed
+        super().__init__(*args, **kwargs)
+        _seal(self, {})
+
+    def __setattr__(self, name: str, value):
+        if getattr(self, "_sealed", False):
+            # lazy operators may still compute their start and end, but never change them
+            if name not in {"start", "end"} or (_has_slot_value(self, name) and getattr(self, name) != value):
+                raise dataclasses.FrozenInstanceError(f"cannot assign to field {name!r} of frozen {self!r}")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str):
+        if getattr(self, "_sealed", False):
+            raise dataclasses.FrozenInstanceError(f"cannot delete field {name!r} of frozen {self!r}")
+        object.__delattr__(self, name)
+
+    def _key(self) -> tuple:
+        # the semantic fields: everything passed to the constructor, except the span
+        return tuple(_hashable(getattr(self, field.name))
+                     for field in dataclasses.fields(self) if field.init and field.name != "span")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, _Frozen) or self._unfrozen is not other._unfrozen:
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            result = hash((self._unfrozen, self._key()))
+            object.__setattr__(self, "_hash", result)
+            return result
+
+    def __reduce__(self):
+        return _restore_frozen, (self._unfrozen, {name: object.__getattribute__(self, name)
+                                                  for name in _slot_names(self._unfrozen)
+                                                  if _has_slot_value(self, name)})
+
+
+def _has_slot_value(obj, name: str) -> bool:
+    # unlike hasattr, never triggers the computation of a lazy operator's start or end
+    try:
+        object.__getattribute__(obj, name)
+        return True
+    except AttributeError:
+        return False
+
+
+@functools.cache
+def _slot_names(cls: type) -> tuple[str, ...]:
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    return tuple(name for name in names if name not in {"__weakref__", "__dict__"})
+
+
+@functools.cache
+def _frozen_class(cls: type) -> type:
+    namespace = {"__slots__": ("_sealed", "_hash"), "__qualname__": cls.__qualname__, "__module__": cls.__module__,
+                 "__doc__": cls.__doc__, "_unfrozen": cls}
+    return type(cls.__name__, (_Frozen, cls), namespace)
+
+
+def _restore_frozen(cls: type, values: dict) -> _Frozen:
+    return freeze(_copy_slots(cls, values))
+
+
+def _copy_slots(cls: type, values: dict):
+    obj = object.__new__(cls)
+    for name, value in values.items():
+        object.__setattr__(obj, name, value)
+    return obj
+
+
+def _seal(obj: _Frozen, memo: dict[int, typing.Any]):
+    # replace the fields with frozen versions, then disallow any further changes
+    for field in dataclasses.fields(obj):
+        if field.init and _has_slot_value(obj, field.name):
+            object.__setattr__(obj, field.name, _freeze(object.__getattribute__(obj, field.name), memo))
+    object.__setattr__(obj, "_sealed", True)
+
+
+def freeze(obj: Shift | Interval | Intervals) -> Shift | Interval | Intervals:
+    """
+    Returns an immutable, hashable copy of an object created by :func:`from_xml` (or by hand), so that it can be used
+    as a dict key, or shared across threads, e.g., in a cache of parsed expressions. For example::
+
+        cache[xml_text] = [freeze(obj) for obj in from_xml(elem)]
+
+    The copy is an instance of a frozen subclass of the original class, so, e.g., :code:`isinstance(freeze(obj), Last)`,
+    and it works with :func:`bind`, :func:`compile` and iteration as usual. Assigning to or deleting its fields raises
+    a :class:`dataclasses.FrozenInstanceError`, except that a lazy operator (see :func:`lazy_evaluation`) may still
+    compute its start and end when they are first accessed. Lists, e.g., of Intersection intervals, become tuples.
+    Frozen objects are equal (and hash the same) when they are of the same class and have equal fields, ignoring spans.
+    They are never equal to objects that are not frozen.
+
+    :param obj: The object to freeze. Objects that are already frozen are returned unchanged.
+    :return: The frozen copy.
+    """
+    return _freeze(obj, {})
+
+
+def _freeze(obj, memo: dict[int, typing.Any]):
+    if id(obj) in memo:
+        return memo[id(obj)]
+    match obj:
+        case _Frozen():
+            result = obj
+        case list() | tuple():
+            result = tuple(_freeze(item, memo) for item in obj)
+        case Shift() | Interval() | Intervals() if dataclasses.is_dataclass(obj):
+            cls = _frozen_class(type(obj))
+            result = _copy_slots(cls, {name: object.__getattribute__(obj, name)
+                                       for name in _slot_names(type(obj)) if _has_slot_value(obj, name)})
+            memo[id(obj)] = result
+            _seal(result, memo)
+        case _:
+            result = obj
+    memo[id(obj)] = result
+    return result
+
+
+SCHEMA_VERSION = 1
+"""
+The version of the format written by :func:`to_json` and :func:`to_bytes`, incremented on incompatible changes.
+"""
+
+_BINARY_MAGIC = b"SCATE"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Ref:
+    # a reference to an earlier node of a serialized node table
+    index: int
+
+
+@functools.cache
+def _serializable_classes() -> dict[str, type]:
+    return {cls.__name__: cls
+            for root in (Interval, Shift, Intervals)
+            for cls in _subclasses(root)
+            if dataclasses.is_dataclass(cls) and not issubclass(cls, _Frozen)}
+
+
+@functools.cache
+def _restores_directly(cls: type) -> bool:
+    # objects whose only derived fields are their start and end can be restored without running __post_init__
+    return all(field.init or field.name in {"start", "end"} for field in dataclasses.fields(cls))
+
+
+def _node_fields(obj) -> typing.Iterator[tuple[str, typing.Any]]:
+    cls = obj._unfrozen if isinstance(obj, _Frozen) else type(obj)
+    names = set()
+    for field in dataclasses.fields(cls):
+        if (field.init or field.name in {"start", "end"}) and _has_slot_value(obj, field.name):
+            value = object.__getattribute__(obj, field.name)
+            names.add(field.name)
+            # leave out fields with their default values, e.g., most spans when not created by from_xml
+            if field.default is not dataclasses.MISSING and type(value) is type(field.default) \
+                    and value == field.default:
+                continue
+            yield field.name, value
+    for name in ["span", "trigger_span"]:
+        if name not in names and _has_slot_value(obj, name) and object.__getattribute__(obj, name) is not None:
+            yield name, object.__getattribute__(obj, name)
+
+
+def _is_node(value) -> bool:
+    return isinstance(value, (Interval, Shift, Intervals)) and dataclasses.is_dataclass(value)
+
+
+def _nodes_in(value) -> typing.Iterator:
+    match value:
+        case _ if _is_node(value):
+            yield value
+        case list() | tuple():
+            for item in value:
+                yield from _nodes_in(item)
+        case dict():
+            for item in value.values():
+                yield from _nodes_in(item)
+
+
+def _with_refs(value, memo: dict[int, int]):
+    match value:
+        case _ if _is_node(value):
+            return _Ref(memo[id(value)])
+        case list():
+            return [_with_refs(item, memo) for item in value]
+        case tuple():
+            return tuple(_with_refs(item, memo) for item in value)
+        case dict():
+            return {key: _with_refs(item, memo) for key, item in value.items()}
+        case _:
+            return value
+
+
+def _node_table(objects: typing.Iterable) -> tuple[list[tuple[str, list[tuple[str, typing.Any]]]], list[int]]:
+    # each object appears once, after the objects it refers to, so shared subtrees are stored once, and the table can
+    # be built (and read) without recursion, however deeply the objects are nested
+    memo: dict[int, int] = {}
+    nodes = []
+    roots = []
+    for root in objects:
+        if not _is_node(root):
+            raise TypeError(f"expected an Interval, Shift or Intervals, found {root!r}")
+        stack = [(root, False)]
+        while stack:
+            obj, children_done = stack.pop()
+            if id(obj) in memo:
+                continue
+            fields = list(_node_fields(obj))
+            if not children_done:
+                stack.append((obj, True))
+                stack.extend((child, False) for _, value in reversed(fields)
+                             for child in reversed(list(_nodes_in(value))) if id(child) not in memo)
+                continue
+            cls = obj._unfrozen if isinstance(obj, _Frozen) else type(obj)
+            nodes.append((cls.__name__, [(name, _with_refs(value, memo)) for name, value in fields]))
+            memo[id(obj)] = len(nodes) - 1
+        roots.append(memo[id(root)])
+    return nodes, roots
+
+
+def _restore_nodes(nodes: typing.Iterable[tuple[str, dict[str, typing.Any]]], roots: list[int]) -> list:
+    classes = _serializable_classes()
+    objects = []
+
+    def resolve(value):
+        match value:
+            case _Ref(index):
+                return objects[index]
+            case list():
+                return [resolve(item) for item in value]
+            case tuple():
+                return tuple(resolve(item) for item in value)
+            case dict():
+                return {key: resolve(item) for key, item in value.items()}
+            case _:
+                return value
+
+    for class_name, values in nodes:
+        cls = classes.get(class_name)
+        if cls is None:
+            raise ValueError(f"unknown class {class_name!r}")
+        values = {name: resolve(value) for name, value in values.items()}
+        fields = {field.name: field for field in dataclasses.fields(cls)}
+        if _restores_directly(cls):
+            obj = object.__new__(cls)
+            for name, field in fields.items():
+                if name in values:
+                    object.__setattr__(obj, name, values.pop(name))
+                elif field.default is not dataclasses.MISSING:
+                    object.__setattr__(obj, name, field.default)
+                elif field.default_factory is not dataclasses.MISSING:
+                    object.__setattr__(obj, name, field.default_factory())
+                # otherwise, e.g., the start and end of an unresolved lazy operator, which are computed when accessed
+        else:
+            obj = cls(**{name: values.pop(name) for name in list(values) if name in fields and fields[name].init})
+        for name, value in values.items():
+            object.__setattr__(obj, name, value)
+        objects.append(obj)
+    return [objects[index] for index in roots]
+
+
+def _to_json_value(value):
+    match value:
+        case None | bool() | int() | float() | str():
+            return value
+        case _Ref(index):
+            return {"ref": index}
+        case list():
+            return [_to_json_value(item) for item in value]
+        case tuple():
+            return {"tuple": [_to_json_value(item) for item in value]}
+        case dict():
+            return {"dict": [[_to_json_value(key), _to_json_value(item)] for key, item in value.items()]}
+        case datetime.datetime() if value.tzinfo is None:
+            return {"datetime": value.isoformat()}
+        case Unit():
+            return {"unit": value.name}
+        case type() if value.__name__ in _serializable_classes():
+            return {"class": value.__name__}
+        case _:
+            raise TypeError(f"cannot serialize {value!r}")
+
+
+def _from_json_value(value):
+    match value:
+        case list():
+            return [_from_json_value(item) for item in value]
+        case {"ref": index}:
+            return _Ref(index)
+        case {"tuple": items}:
+            return tuple(_from_json_value(item) for item in items)
+        case {"dict": items}:
+            return {_from_json_value(key): _from_json_value(item) for key, item in items}
+        case {"datetime": text}:
+            return datetime.datetime.fromisoformat(text)
+        case {"unit": name}:
+            return Unit[name]
+        case {"class": name}:
+            return _serializable_classes()[name]
+        case dict():
+            raise ValueError(f"unknown value {value!r}")
+        case _:
+            return value
+
+
+def to_json(objects: typing.Iterable[Shift | Interval | Intervals], **kwargs) -> str:
+    """
+    Serializes Intervals, Shifts and Intervals collections, e.g., those created by :func:`from_xml`, as JSON. For
+    example, :code:`to_json([Last(Interval.of(2024, 3, 16), Repeating(DAY, WEEK, value=4))])` produces::
+
+        {"schema": 1, "nodes": [{"type": "Interval", "start": {"datetime": "2024-03-16T00:00:00"}, ...},
+                                {"type": "Repeating", "unit": {"unit": "DAY"}, "range": {"unit": "WEEK"}, ...},
+                                {"type": "Last", "interval": {"ref": 0}, "shift": {"ref": 1}, ...}],
+         "roots": [2]}
+
+    Each object is a node with its class name and its fields, including its start and end if they have been computed,
+    and refers to other objects by their index in the nodes. An object that is referred to more than once, e.g., a
+    Repeating shared by several operators, is stored once and is shared again by :func:`from_json`.
+
+    :param objects: The objects to serialize.
+    :param kwargs: Keyword arguments for json.dumps, e.g., indent.
+    :return: The JSON string.
+    """
+    nodes, roots = _node_table(objects)
+    return json.dumps({"schema": SCHEMA_VERSION,
+                       "nodes": [{"type": class_name, **{name: _to_json_value(value) for name, value in fields}}
+                                 for class_name, fields in nodes],
+                       "roots": roots}, **kwargs)
+
+
+def from_json(text: str | bytes) -> list[Shift | Interval | Intervals]:
+    """
+    Deserializes objects serialized by :func:`to_json`. Starts and ends that were serialized are not recomputed.
+
+    :param text: The JSON string.
+    :return: The objects, in the order they were serialized.
+    """
+    data = json.loads(text)
+    if data.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"unsupported schema version {data.get('schema')!r}, expected {SCHEMA_VERSION}")
+    nodes = []
+    for node in data["nodes"]:
+        node = dict(node)
+        class_name = node.pop("type")
+        nodes.append((class_name, {name: _from_json_value(value) for name, value in node.items()}))
+    return _restore_nodes(nodes, data["roots"])
+
+
+class _Tag(enum.IntEnum):
+    NONE = 0
+    FALSE = 1
+    TRUE = 2
+    INT = 3
+    FLOAT = 4
+    STR = 5
+    LIST = 6
+    TUPLE = 7
+    DICT = 8
+    DATETIME = 9
+    UNIT = 10
+    CLASS = 11
+    REF = 12
+
+
+_FLOAT = struct.Struct("<d")
+_MICROSECOND_DELTA = datetime.timedelta(microseconds=1)
+
+
+def _write_varint(buffer: bytearray, n: int):
+    while n >= 0x80:
+        buffer.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buffer.append(n)
+
+
+def to_bytes(objects: typing.Iterable[Shift | Interval | Intervals]) -> bytes:
+    """
+    Serializes objects like :func:`to_json`, but in a compact binary form for bulk storage: variable-length integers,
+    time points as microseconds, and each class and field name stored once.
+
+    :param objects: The objects to serialize.
+    :return: The serialized bytes.
+    """
+    nodes, roots = _node_table(objects)
+    strings: dict[str, int] = {}
+    body = bytearray()
+
+    def write_string_index(text: str):
+        _write_varint(body, strings.setdefault(text, len(strings)))
+
+    def write_value(value):
+        match value:
+            case None:
+                body.append(_Tag.NONE)
+            case bool():
+                body.append(_Tag.TRUE if value else _Tag.FALSE)
+            case _Ref(index):
+                body.append(_Tag.REF)
+                _write_varint(body, index)
+            case int():
+                body.append(_Tag.INT)
+                # zigzag encoding, so that small negative numbers are small too
+                _write_varint(body, value * 2 if value >= 0 else -value * 2 - 1)
+            case float():
+                body.append(_Tag.FLOAT)
+                body.extend(_FLOAT.pack(value))
+            case str():
+                body.append(_Tag.STR)
+                encoded = value.encode()
+                _write_varint(body, len(encoded))
+                body.extend(encoded)
+            case list() | tuple():
+                body.append(_Tag.LIST if isinstance(value, list) else _Tag.TUPLE)
+                _write_varint(body, len(value))
+                for item in value:
+                    write_value(item)
+            case dict():
+                body.append(_Tag.DICT)
+                _write_varint(body, len(value))
+                for key, item in value.items():
+                    write_value(key)
+                    write_value(item)
+            case datetime.datetime() if value.tzinfo is None:
+                body.append(_Tag.DATETIME)
+                _write_varint(body, (value - datetime.datetime.min) // _MICROSECOND_DELTA)
+            case Unit():
+                body.append(_Tag.UNIT)
+                write_string_index(value.name)
+            case type() if value.__name__ in _serializable_classes():
+                body.append(_Tag.CLASS)
+                write_string_index(value.__name__)
+            case _:
+                raise TypeError(f"cannot serialize {value!r}")
+
+    _write_varint(body, len(nodes))
+    for class_name, fields in nodes:
+        write_string_index(class_name)
+        _write_varint(body, len(fields))
+        for name, value in fields:
+            write_string_index(name)
+            write_value(value)
+    _write_varint(body, len(roots))
+    for index in roots:
+        _write_varint(body, index)
+
+    header = bytearray(_BINARY_MAGIC)
+    _write_varint(header, SCHEMA_VERSION)
+    _write_varint(header, len(strings))
+    for text in strings:
+        encoded = text.encode()
+        _write_varint(header, len(encoded))
+        header.extend(encoded)
+    return bytes(header + body)
+
+
+def from_bytes(data: bytes) -> list[Shift | Interval | Intervals]:
+    """
+    Deserializes objects serialized by :func:`to_bytes`.
+
+    :param data: The serialized bytes.
+    :return: The objects, in the order they were serialized.
+    """
+    if not data.startswith(_BINARY_MAGIC):
+        raise ValueError("not serialized scate objects")
+    data = memoryview(data)
+    position = len(_BINARY_MAGIC)
+
+    def read_varint() -> int:
+        nonlocal position
+        result = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def read_str() -> str:
+        nonlocal position
+        length = read_varint()
+        position += length
+        return str(data[position - length:position], "utf-8")
+
+    def read_value():
+        nonlocal position
+        tag = data[position]
+        position += 1
+        match tag:
+            case _Tag.NONE:
+                return None
+            case _Tag.FALSE:
+                return False
+            case _Tag.TRUE:
+                return True
+            case _Tag.INT:
+                n = read_varint()
+                return n // 2 if not n % 2 else -(n + 1) // 2
+            case _Tag.FLOAT:
+                position += _FLOAT.size
+                return _FLOAT.unpack_from(data, position - _FLOAT.size)[0]
+            case _Tag.STR:
+                return read_str()
+            case _Tag.LIST:
+                return [read_value() for _ in range(read_varint())]
+            case _Tag.TUPLE:
+                return tuple(read_value() for _ in range(read_varint()))
+            case _Tag.DICT:
+                return {read_value(): read_value() for _ in range(read_varint())}
+            case _Tag.DATETIME:
+                return datetime.datetime.min + datetime.timedelta(microseconds=read_varint())
+            case _Tag.UNIT:
+                return Unit[strings[read_varint()]]
+            case _Tag.CLASS:
+                return _serializable_classes()[strings[read_varint()]]
+            case _Tag.REF:
+                return _Ref(read_varint())
+            case other:
+                raise ValueError(f"unknown tag {other}")
+
+    try:
+        version = read_varint()
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"unsupported schema version {version}, expected {SCHEMA_VERSION}")
+        strings = [read_str() for _ in range(read_varint())]
+        nodes = []
+        for _ in range(read_varint()):
+            class_name = strings[read_varint()]
+            nodes.append((class_name, {strings[read_varint()]: read_value() for _ in range(read_varint())}))
+        roots = [read_varint() for _ in range(read_varint())]
+    except (IndexError, KeyError, struct.error, UnicodeDecodeError) as ex:
+        raise ValueError("corrupt serialized scate objects") from ex
+    return _restore_nodes(nodes, roots)
+
+
+@dataclasses.dataclass
+class _ProfileStats:
+    calls: int = 0
+    seconds: float = 0.0
+    rrule_occurrences: int = 0
+
+
+class Profile:
+    """
+    Records, for each operator (Last, Nth, These, etc.) and each Shift type (Repeating, Spring, etc.), the number of
+    calls, the cumulative wall time, and the number of rrule occurrences iterated.
+    Times and occurrences are inclusive: those of a Last include the time spent in its Shift.
+    See :func:`profile` for how to start recording.
+    """
+
+    def __init__(self):
+        self.operators: dict[str, _ProfileStats] = collections.defaultdict(_ProfileStats)
+        self.shifts: dict[str, _ProfileStats] = collections.defaultdict(_ProfileStats)
+        self.rrule_occurrences = 0
+
+    def report(self) -> dict:
+        """
+        :return: A JSON-compatible dict with the total number of rrule occurrences iterated, and the calls, seconds and
+        rrule occurrences of each operator and each Shift type, from slowest to fastest.
+        """
+        def stats_report(stats: dict[str, _ProfileStats]) -> dict:
+            return {name: {"calls": s.calls, "seconds": s.seconds, "rrule_occurrences": s.rrule_occurrences}
+                    for name, s in sorted(stats.items(), key=lambda item: -item[1].seconds)}
+        return {"rrule_occurrences": self.rrule_occurrences,
+                "operators": stats_report(self.operators),
+                "shifts": stats_report(self.shifts)}
+
+    def update(self, other: "Profile"):
+        """
+        Adds the calls, times and occurrences recorded by another Profile, e.g., one recorded in another process.
+
+        :param other: The Profile to add.
+        """
+        for stats, other_stats in [(self.operators, other.operators), (self.shifts, other.shifts)]:
+            for name, other_stat in other_stats.items():
+                stat = stats[name]
+                stat.calls += other_stat.calls
+                stat.seconds += other_stat.seconds
+                stat.rrule_occurrences += other_stat.rrule_occurrences
+        self.rrule_occurrences += other.rrule_occurrences
+
+    def to_json(self, **kwargs) -> str:
+        """
+        :param kwargs: Keyword arguments for json.dumps, e.g., indent.
+        :return: The report as a JSON string.
+        """
+        return json.dumps(self.report(), **kwargs)
+
+
+_PROFILES: list[Profile] = []
+_PROFILES_LOCK = threading.Lock()
+# guards the calls, seconds and rrule occurrences of the Profiles, which all threads add to
+_PROFILE_STATS_LOCK = threading.Lock()
+
+
+class _ProfileThread(threading.local):
+    def __init__(self):
+        # the number of calls in progress in this thread for each _ProfileStats (by id), so that recursive calls are
+        # timed only once, while calls in other threads are timed independently
+        self.depths: collections.Counter[int] = collections.Counter()
+        # the number of rrule occurrences iterated by this thread while profiling
+        self.rrule_occurrences = 0
+
+
+_PROFILE_THREAD = _ProfileThread()
+_UNPROFILED: dict[tuple[type, str], typing.Callable] = {}
+
+
+@contextlib.contextmanager
+def profile() -> typing.Iterator[Profile]:
+    """
+    Records the operators and Shifts evaluated within this context. For example::
+
+        with profile() as p:
+            Last(Interval.of(2024, 3, 16), Repeating(DAY, WEEK, value=4))
+        print(p.to_json(indent=2))
+
+    Profiling replaces the evaluation methods of the scate classes with timed versions on entry, and restores them on
+    exit, so there is no cost when no profile is active.
+    Since the methods are replaced for all threads, evaluations in other threads are also recorded.
+    While a profile is active, evaluations of repeating Shifts bypass the memo of earlier results, so that calls,
+    times and rrule occurrences do not depend on what was evaluated before.
+    Setting the environment variable SCATE_PROFILE before importing scate profiles the whole process and prints the
+    report to stderr at exit.
+
+    :return: The Profile that records the evaluations.
+    """
+    global _PROFILES
+    result = Profile()
+    with _PROFILES_LOCK:
+        if not _PROFILES:
+            _install_profiling()
+        # replaced rather than modified, so that evaluations in other threads never see a list that is changing
+        _PROFILES = [*_PROFILES, result]
+    try:
+        yield result
+    finally:
+        with _PROFILES_LOCK:
+            _PROFILES = [p for p in _PROFILES if p is not result]
+            if not _PROFILES:
+                _uninstall_profiling()
+
+
+def _subclasses(cls: type) -> typing.Iterator[type]:
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _subclasses(subclass)
+
+
+def _install_profiling():
+    global _evaluate_shift, _iter_rrule
+    methods = [(cls, "_resolve") for cls in _subclasses(_LazyInterval)]
+    methods += [(cls, "__iter__") for cls in _subclasses(Intervals)]
+    methods += [(cls, name) for cls in _subclasses(Shift) for name in ["__rsub__", "__radd__"]]
+    for cls, name in methods:
+        if name in cls.__dict__:
+            method = cls.__dict__[name]
+            _UNPROFILED[cls, name] = method
+            wrapper = _profiled_iter(method) if name == "__iter__" else _profiled(method)
+            setattr(cls, name, functools.wraps(method)(wrapper))
+    _UNPROFILED[None, "_iter_rrule"] = _iter_rrule
+    _iter_rrule = _profiled_iter_rrule(_iter_rrule)
+    _UNPROFILED[None, "_evaluate_shift"] = _evaluate_shift
+    _evaluate_shift = _evaluate_shift.__wrapped__
+
+
+def _uninstall_profiling():
+    global _evaluate_shift, _iter_rrule
+    _iter_rrule = _UNPROFILED.pop((None, "_iter_rrule"))
+    _evaluate_shift = _UNPROFILED.pop((None, "_evaluate_shift"))
+    for (cls, name), method in _UNPROFILED.items():
+        setattr(cls, name, method)
+    _UNPROFILED.clear()
+
+
+def _profile_stats(obj) -> list[_ProfileStats]:
+    name = obj.__class__.__name__
+    return [(p.shifts if isinstance(obj, Shift) else p.operators)[name] for p in _PROFILES]
+
+
+def _profile_start(stats: list[_ProfileStats], count_call: bool = True) -> tuple[float, int]:
+    depths = _PROFILE_THREAD.depths
+    if count_call:
+        with _PROFILE_STATS_LOCK:
+            for s in stats:
+                s.calls += 1
+    for s in stats:
+        depths[id(s)] += 1
+    return time.perf_counter(), _PROFILE_THREAD.rrule_occurrences
+
+
+def _profile_stop(stats: list[_ProfileStats], start: tuple[float, int]):
+    seconds = time.perf_counter() - start[0]
+    rrule_occurrences = _PROFILE_THREAD.rrule_occurrences - start[1]
+    depths = _PROFILE_THREAD.depths
+    with _PROFILE_STATS_LOCK:
+        for s in stats:
+            depths[id(s)] -= 1
+            if not depths[id(s)]:
+                del depths[id(s)]
+                s.seconds += seconds
+                s.rrule_occurrences += rrule_occurrences
+
+
+def _profiled(method: typing.Callable) -> typing.Callable:
+    def wrapper(self, *args):
+        stats = _profile_stats(self)
+        start = _profile_start(stats)
+        try:
+            return method(self, *args)
+        finally:
+            _profile_stop(stats, start)
+    return wrapper
+
+
+def _profiled_iter(method: typing.Callable) -> typing.Callable:
+    def wrapper(self):
+        stats = _profile_stats(self)
+        iterator = method(self)
+        count_call = True
+        while True:
+            # time only the work of producing each item, not the work of the caller between items
+            start = _profile_start(stats, count_call)
+            count_call = False
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _profile_stop(stats, start)
+            yield item
+    return wrapper
+
+
+def _profiled_iter_rrule(iter_rrule: typing.Callable) -> typing.Callable:
+    # the unprofiled function is captured here, so calls already in progress when profiling is uninstalled still work
+    def wrapper(*args, **kwargs) -> typing.Iterator[datetime.datetime]:
+        return _count_rrule_occurrences(iter_rrule(*args, **kwargs), list(_PROFILES))
+    return wrapper
+
+
+def _count_rrule_occurrences(occurrences: typing.Iterator[datetime.datetime],
+                             profiles: list[Profile]) -> typing.Iterator[datetime.datetime]:
+    for occurrence in occurrences:
+        _PROFILE_THREAD.rrule_occurrences += 1
+        with _PROFILE_STATS_LOCK:
+            for p in profiles:
+                p.rrule_occurrences += 1
+        yield occurrence
+
+
+if os.environ.get("SCATE_PROFILE"):
+    _process_profile = profile()
+    atexit.register(lambda p: print(p.to_json(indent=2), file=sys.stderr), _process_profile.__enter__())
+
+
 def _main():
     parser = argparse.ArgumentParser()
     parser.add_argument("xml_dir")
@@ -1536,37 +3625,104 @@ def _main():
     parser.add_argument("--dct-dir")
     parser.add_argument("--silent", action="store_true")
     parser.add_argument("--flatten", action="store_true")
+    parser.add_argument("--profile", action="store_true",
+                        help="print the time spent in each operator and Shift type to stderr")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="the number of processes to parse files in (0 for one per CPU); "
+                             "output is in the same order as with a single process")
+    parser.add_argument("--cache-dir",
+                        help="a directory for caching the objects parsed from each file, reused while the XML, the "
+                             "document creation time and the scate code are unchanged")
+    parser.add_argument("--cache-max-bytes", type=int,
+                        help="delete the least recently used cache entries when they take more than this")
+    parser.add_argument("--cache-max-days", type=float,
+                        help="delete cache entries that have not been used for this many days")
     args = parser.parse_args()
 
-    n_errors = 0
-
     # iterate over the selected Anafora XML paths
     xml_paths = list(pathlib.Path(args.xml_dir).glob(f"**/*{args.xml_suffix}"))
     if not xml_paths:
         parser.exit(message=f"no such paths: {args.xml_dir}/**/*.{args.xml_suffix}\n")
-    for xml_path in xml_paths:
+    process_profile = Profile() if args.profile else None
+    start = time.perf_counter()
+    n_objects, error_types = _process(xml_paths, args, process_profile)
+    seconds = time.perf_counter() - start
 
-        # load the document creation time, if provided
-        if args.dct_dir is not None:
-            dct_name = xml_path.name.replace(args.xml_suffix, ".dct")
-            dct_path = pathlib.Path(args.dct_dir) / dct_name
-            with open(dct_path) as dct_file:
-                [year_str, month_str, day_str] = dct_file.read().strip().split("-")
-                doc_time = Interval.of(int(year_str), int(month_str), int(day_str))
+    if process_profile is not None:
+        print(process_profile.to_json(indent=2), file=sys.stderr)
+    print(f"Processed {len(xml_paths)} files and {n_objects} objects in {seconds:.1f} seconds "
+          f"({len(xml_paths) / seconds:.1f} files/sec, {n_objects / seconds:.1f} objects/sec)", file=sys.stderr)
+    if error_types:
+        counts = ", ".join(f"{name}: {count}" for name, count in error_types.most_common())
+        print(f"Errors: {error_types.total()} ({counts})", file=sys.stderr)
 
-        # use today for the document creation time, if not provided
-        else:
-            today = datetime.date.today()
-            doc_time = Interval.of(today.year, today.month, today.day)
 
-        # parse the Anafora XML into Intervals, Shifts, etc.
-        elem = et.parse(xml_path).getroot()
+@dataclasses.dataclass
+class _FileResult:
+    lines: list[str]
+    # the exception type and the message with the traceback and text context, for each parsing error
+    errors: list[tuple[str, str]]
+    n_objects: int
+    profile: Profile | None
+
+
+def _process(xml_paths: list[pathlib.Path],
+             args: argparse.Namespace,
+             process_profile: Profile | None) -> tuple[int, collections.Counter]:
+    n_objects = 0
+    error_types = collections.Counter()
+    process_file = functools.partial(_process_file, args=args)
+    with contextlib.ExitStack() as stack:
+        if args.jobs == 1:
+            results = map(process_file, xml_paths)
+        else:
+            executor = stack.enter_context(concurrent.futures.ProcessPoolExecutor(args.jobs or None))
+            # map yields the results in the order of the paths, as each becomes available
+            results = executor.map(process_file, xml_paths)
+        for result in results:
+            for line in result.lines:
+                print(line)
+            for error_type, msg in result.errors:
+                print(msg, file=sys.stderr)
+                error_types[error_type] += 1
+            n_objects += result.n_objects
+            if process_profile is not None:
+                process_profile.update(result.profile)
+    return n_objects, error_types
+
+
+def _process_file(xml_path: pathlib.Path, args: argparse.Namespace) -> _FileResult:
+    result = _FileResult([], [], 0, None)
+
+    # load the document creation time, if provided
+    if args.dct_dir is not None:
+        dct_name = xml_path.name.replace(args.xml_suffix, ".dct")
+        dct_path = pathlib.Path(args.dct_dir) / dct_name
+        with open(dct_path) as dct_file:
+            [year_str, month_str, day_str] = dct_file.read().strip().split("-")
+            doc_time = Interval.of(int(year_str), int(month_str), int(day_str))
+
+    # use today for the document creation time, if not provided
+    else:
+        today = datetime.date.today()
+        doc_time = Interval.of(today.year, today.month, today.day)
+
+    # parse the Anafora XML into Intervals, Shifts, etc.
+    known_intervals = {(None, None): doc_time}
+    with profile() if args.profile else contextlib.nullcontext() as file_profile:
+        result.profile = file_profile
         try:
-            for obj in from_xml(elem, known_intervals={(None, None): doc_time}):
+            if args.cache_dir is not None:
+                cache = _open_cache(args.cache_dir, args.cache_max_bytes, args.cache_max_days)
+                objects = cache.from_xml(xml_path, known_intervals)
+            else:
+                objects = iter_from_xml(xml_path, known_intervals)
+            for obj in objects:
                 if args.flatten:
                     obj = flatten(obj)
+                result.n_objects += 1
                 if not args.silent:
-                    print(obj)
+                    result.lines.append(str(obj))
         except AnaforaXMLParsingError as e:
             text_name = xml_path.name.replace(args.xml_suffix, "")
             text_dir = pathlib.Path(args.text_dir) if args.text_dir else xml_path.parent
@@ -1576,13 +3732,16 @@ def _main():
             start, end = e.trigger_span
             pre_text = text[max(0, start - 100):start]
             post_text = text[end:min(len(text), end + 100)]
-            traceback.print_exception(e.__cause__)
-            msg = f"\nContext:\n{pre_text}[[{text[start:end]}]]{post_text}\nXML:\n{e}\nFile:\n{xml_path}\n"
-            print(msg, file=sys.stderr)
-            n_errors += 1
+            trace = "".join(traceback.format_exception(e.__cause__))
+            msg = f"{trace}\nContext:\n{pre_text}[[{text[start:end]}]]{post_text}\nXML:\n{e}\nFile:\n{xml_path}\n"
+            result.errors.append((type(e.__cause__).__name__, msg))
+    return result
+
 
-    if n_errors:
-        print(f"Errors: {n_errors}", file=sys.stderr)
+@functools.cache
+def _open_cache(directory: str, max_bytes: int | None, max_days: float | None) -> XMLCache:
+    # open each cache once per process, since opening scans the directory
+    return XMLCache(directory, max_bytes, None if max_days is None else datetime.timedelta(days=max_days))
 
 
 if __name__ == "__main__":
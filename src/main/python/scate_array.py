@@ -0,0 +1,1321 @@
+"""
+NumPy-backed batch operations for scate: evaluating expressions over many anchors at once, and storing many
+intervals in columnar form.
+
+Time points are represented as ``datetime64[us]`` arrays, with NaT standing for the ``None`` endpoints that
+:class:`scate.Interval` allows.
+"""
+import calendar
+import collections.abc
+import dataclasses
+import datetime
+import enum
+import functools
+import typing
+
+import numpy as np
+
+import scate
+
+_US = np.timedelta64(1, "us")
+_WEEK = np.timedelta64(7, "D")
+
+# microseconds per unit for units that scate.Unit.relativedelta implements with a fixed length
+_FIXED_MICROSECONDS = {
+    scate.MICROSECOND: 1,
+    scate.SECOND: 10 ** 6,
+    scate.MINUTE: 60 * 10 ** 6,
+    scate.HOUR: 60 * 60 * 10 ** 6,
+    scate.DAY: 24 * 60 * 60 * 10 ** 6,
+    scate.WEEK: 7 * 24 * 60 * 60 * 10 ** 6,
+}
+
+# months per unit for units that scate.Unit.relativedelta implements with months or years
+_MONTHS = {
+    scate.MONTH: 1,
+    scate.QUARTER_YEAR: 3,
+    scate.YEAR: 12,
+    scate.DECADE: 10 * 12,
+    scate.QUARTER_CENTURY: 25 * 12,
+    scate.CENTURY: 100 * 12,
+}
+
+# anchors outside of this range are evaluated one at a time, since scate special-cases the first century and Python
+# datetimes cannot represent years beyond 9999
+_MIN_VECTOR = np.datetime64("0101-01-01", "us")
+_MIN_RESULT = np.datetime64("0001-01-01", "us")
+_MAX_RESULT = np.datetime64("10000-01-01", "us")
+
+Points = np.ndarray
+Kernel = typing.Callable[[Points], tuple[Points, Points]]
+Finder = typing.Callable[[Points], Points]
+
+
+def as_datetime64(points: typing.Iterable[datetime.datetime | None] | np.ndarray) -> Points:
+    """
+    Converts time points to a ``datetime64[us]`` array, mapping None to NaT.
+    """
+    return np.asarray(points, dtype="datetime64[us]")
+
+
+def _to_datetime(point: np.datetime64) -> datetime.datetime | None:
+    return None if np.isnat(point) else point.astype(datetime.datetime)
+
+
+def _nat_like(points: Points) -> Points:
+    return np.full(points.shape, np.datetime64("NaT", "us"))
+
+
+def _truncate(unit: scate.Unit, points: Points) -> Points:
+    """
+    Vectorized :meth:`scate.Unit.truncate`.
+    """
+    match unit:
+        case scate.MICROSECOND:
+            return points
+        case scate.MILLISECOND:
+            return points.astype("datetime64[ms]").astype("datetime64[us]")
+        case scate.SECOND | scate.MINUTE | scate.HOUR | scate.DAY | scate.MONTH | scate.YEAR:
+            numpy_unit = {scate.SECOND: "s", scate.MINUTE: "m", scate.HOUR: "h",
+                          scate.DAY: "D", scate.MONTH: "M", scate.YEAR: "Y"}[unit]
+            return points.astype(f"datetime64[{numpy_unit}]").astype("datetime64[us]")
+        case scate.WEEK:
+            days = points.astype("datetime64[D]")
+            years = points.astype("datetime64[Y]")
+            year_starts = years.astype("datetime64[D]")
+            year_lengths = (years + np.timedelta64(1, "Y")).astype("datetime64[D]") - year_starts
+            # 1970-01-01 was a Thursday, i.e., weekday 3
+            weekdays = (days.astype(np.int64) + 3) % 7
+            diffs = (days - year_starts).astype(np.int64) + 1 - weekdays
+            # like Unit.truncate, which maps day-of-year numbers through a non-leap year, in leap years a diff of 60
+            # or more (i.e., from March on) lands one day after the Monday, and a diff of 366 wraps to January 1
+            offsets = diffs - 1 + ((year_lengths == np.timedelta64(366, "D")) & (diffs >= 60))
+            offsets[diffs == 366] = 0
+            return (year_starts + offsets.astype("timedelta64[D]")).astype("datetime64[us]")
+        case scate.QUARTER_YEAR:
+            months = points.astype("datetime64[M]").astype(np.int64)
+            return (months - months % 3).astype("datetime64[M]").astype("datetime64[us]")
+        case scate.DECADE | scate.QUARTER_CENTURY | scate.CENTURY:
+            n_years = {scate.DECADE: 10, scate.QUARTER_CENTURY: 25, scate.CENTURY: 100}[unit]
+            years = points.astype("datetime64[Y]").astype(np.int64) + 1970
+            years = years // n_years * n_years
+            years[years == 0] = 1  # year 0 does not exist
+            return (years - 1970).astype("datetime64[Y]").astype("datetime64[us]")
+        case _:
+            raise NotImplementedError(unit)
+
+
+def _add_months(points: Points, n_months: int) -> Points:
+    # like relativedelta(months=n), keep the day of the month, but clip it to the length of the new month
+    months = points.astype("datetime64[M]")
+    days = points.astype("datetime64[D]")
+    day_offsets = days - months.astype("datetime64[D]")
+    time_offsets = points - days.astype("datetime64[us]")
+    new_months = months + np.timedelta64(n_months, "M")
+    month_lengths = (new_months + np.timedelta64(1, "M")).astype("datetime64[D]") - new_months.astype("datetime64[D]")
+    day_offsets = np.minimum(day_offsets, month_lengths - np.timedelta64(1, "D"))
+    return (new_months.astype("datetime64[D]") + day_offsets).astype("datetime64[us]") + time_offsets
+
+
+def _offset(unit: scate.Unit, n: int | float) -> typing.Callable[[Points], Points] | None:
+    """
+    A vectorized version of adding :code:`unit.relativedelta(n)`, or None if that can't be vectorized.
+    """
+    if isinstance(n, float) and n.is_integer():
+        n = int(n)
+    if not isinstance(n, (int, np.integer)):
+        return None
+    if unit in _FIXED_MICROSECONDS:
+        delta = np.timedelta64(int(n) * _FIXED_MICROSECONDS[unit], "us")
+        return lambda points: points + delta
+    if unit in _MONTHS:
+        n_months = int(n) * _MONTHS[unit]
+        return lambda points: _add_months(points, n_months)
+    return None
+
+
+def _weekly_offsets(rrule_kwargs: dict, unit: scate.Unit) -> np.ndarray | None:
+    """
+    For rrules whose occurrences repeat every week (i.e., that constrain only weekdays and times of day), the sorted
+    offsets of the occurrences from the start of the week (Monday 00:00), or None for any other rrule.
+
+    :param unit: The unit to which the rrule's dtstart is truncated.
+    """
+    copied = scate._copied_dtstart_fields(datetime.datetime(2000, 1, 1), rrule_kwargs)
+    if copied is None:
+        return None
+    month, day, weekday, *time_fields = copied
+    if month is not None or day is not None or weekday is not None:
+        return None
+    # time fields copied from dtstart are 0 only if they are smaller than the unit that dtstart was truncated to
+    for value, field_unit in zip(time_fields, [scate.HOUR, scate.MINUTE, scate.SECOND]):
+        if value is not None and not field_unit < unit:
+            return None
+    fields = scate._compile_rrule_fields(scate._freeze_rrule_kwargs(rrule_kwargs), (None, None, None, *time_fields))
+    if fields is None or any(values is not None for values in [
+            fields.months, fields.month_days, fields.year_days, fields.weeknos]):
+        return None
+    weekdays = sorted(fields.weekdays) if fields.weekdays is not None else range(7)
+    if len(weekdays) * len(fields.hours) * len(fields.minutes) * len(fields.seconds) > 100_000:
+        return None
+    seconds = (np.array(weekdays)[:, None, None, None] * 24 * 60 * 60
+               + np.array(fields.hours)[None, :, None, None] * 60 * 60
+               + np.array(fields.minutes)[None, None, :, None] * 60
+               + np.array(fields.seconds)[None, None, None, :])
+    return np.sort(seconds.ravel()).astype("timedelta64[s]").astype("timedelta64[us]")
+
+
+def _mondays(points: Points) -> Points:
+    # the start of the calendar week (unlike _truncate(WEEK), always a Monday)
+    days = points.astype("datetime64[D]")
+    # 1970-01-01 was a Thursday, i.e., weekday 3
+    weekdays = (days.astype(np.int64) + 3) % 7
+    return (days - weekdays.astype("timedelta64[D]")).astype("datetime64[us]")
+
+
+def _weekly_before(offsets: np.ndarray, points: Points) -> Points:
+    # the last occurrence at or before each point
+    week_starts = _mondays(points)
+    indexes = np.searchsorted(offsets, points - week_starts, side="right") - 1
+    previous_week = indexes < 0
+    week_starts[previous_week] -= _WEEK
+    indexes[previous_week] = len(offsets) - 1
+    return week_starts + offsets[indexes]
+
+
+def _weekly_after(offsets: np.ndarray, points: Points) -> Points:
+    # the first occurrence at or after each point
+    week_starts = _mondays(points)
+    indexes = np.searchsorted(offsets, points - week_starts, side="left")
+    next_week = indexes == len(offsets)
+    week_starts[next_week] += _WEEK
+    indexes[next_week] = 0
+    return week_starts + offsets[indexes]
+
+
+def _time_offsets(fields: "scate._RRuleFields") -> np.ndarray | None:
+    # the sorted offsets of the occurrence times from the start of a day
+    if len(fields.hours) * len(fields.minutes) * len(fields.seconds) > 100_000:
+        return None
+    seconds = (np.array(fields.hours)[:, None, None] * 60 * 60
+               + np.array(fields.minutes)[None, :, None] * 60
+               + np.array(fields.seconds)[None, None, :])
+    return np.sort(seconds.ravel()).astype("timedelta64[s]").astype("timedelta64[us]")
+
+
+# the most months between two occurrences of an rrule whose days depend only on the month and day, e.g., the 8 years
+# from February 29, 1896 to February 29, 1904
+_MAX_MONTHLY_GAP = 12 * 8 + 1
+
+
+def _monthly_days(rrule_kwargs: dict, unit: scate.Unit) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """
+    For rrules whose occurrences depend only on the month, the day of the month and the time of day (e.g., March, the
+    13th, or March 13 at 18:00), tables for finding the previous and next occurrence days, and the sorted offsets of
+    the occurrence times from the start of a day, or None for any other rrule.
+    The tables are indexed by whether the year is a leap year, the month (0-11) and a day of the month (0-32), and give
+    the last occurrence day before that day, and the first occurrence day after it, or 0 if there is none in the month.
+
+    :param unit: The unit to which the rrule's dtstart is truncated.
+    """
+    copied = scate._copied_dtstart_fields(datetime.datetime(2000, 1, 1), rrule_kwargs)
+    if copied is None:
+        return None
+    month, day, weekday, *time_fields = copied
+    # date fields copied from dtstart are January and 1 only if dtstart was truncated to the year or the month
+    if weekday is not None or (month is not None and unit < scate.YEAR) or (day is not None and unit < scate.MONTH):
+        return None
+    for value, field_unit in zip(time_fields, [scate.HOUR, scate.MINUTE, scate.SECOND]):
+        if value is not None and not field_unit < unit:
+            return None
+    fields = scate._compile_rrule_fields(scate._freeze_rrule_kwargs(rrule_kwargs), (month, day, None, *time_fields))
+    if fields is None or any(values is not None for values in [fields.year_days, fields.weeknos, fields.weekdays]):
+        return None
+    times = _time_offsets(fields)
+    if times is None:
+        return None
+    previous_days = np.zeros((2, 12, 33), dtype=np.int64)
+    next_days = np.zeros((2, 12, 33), dtype=np.int64)
+    for leap, year in enumerate([2001, 2000]):
+        for month_index in range(12):
+            n_days = calendar.monthrange(year, month_index + 1)[1]
+            days = [day for day in range(1, n_days + 1)
+                    if (fields.months is None or month_index + 1 in fields.months)
+                    and (fields.month_days is None or day in fields.month_days
+                         or day - n_days - 1 in fields.month_days)]
+            for limit in range(33):
+                previous_days[leap, month_index, limit] = max((day for day in days if day < limit), default=0)
+                next_days[leap, month_index, limit] = min((day for day in days if day > limit), default=0)
+    if not next_days.any():
+        return None
+    return previous_days, next_days, times
+
+
+def _month_fields(months: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # whether each datetime64[M] month is in a leap year, and its month of the year (0-11)
+    years = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    leaps = ((years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))).astype(np.int64)
+    return leaps, months.astype(np.int64) % 12
+
+
+def _monthly_search(day_table: np.ndarray, months: Points, limits: np.ndarray, step: int) -> Points:
+    # the occurrence day nearest to the limit days in each month, moving by step months until one is found
+    result = np.full(months.shape, np.datetime64("NaT", "D"))
+    todo = np.arange(len(months))
+    for _ in range(_MAX_MONTHLY_GAP):
+        if not len(todo):
+            break
+        leaps, month_indexes = _month_fields(months[todo])
+        days = day_table[leaps, month_indexes, limits[todo]]
+        found = days > 0
+        result[todo[found]] = months[todo[found]].astype("datetime64[D]") + (days[found] - 1).astype("timedelta64[D]")
+        todo = todo[~found]
+        months[todo] += np.timedelta64(step, "M")
+        limits[todo] = 32 if step < 0 else 0
+    return result
+
+
+def _monthly_before(previous_days: np.ndarray, next_days: np.ndarray, times: np.ndarray, points: Points) -> Points:
+    # the last occurrence at or before each point
+    days = points.astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    month_days = (days - months.astype("datetime64[D]")).astype(np.int64) + 1
+    leaps, month_indexes = _month_fields(months)
+    indexes = np.searchsorted(times, points - days.astype("datetime64[us]"), side="right") - 1
+    # on the day of the point, if it is an occurrence day and an occurrence time is at or before the point
+    today = (previous_days[leaps, month_indexes, month_days + 1] == month_days) & (indexes >= 0)
+    result = days.astype("datetime64[us]") + times[np.maximum(indexes, 0)]
+    earlier = ~today
+    previous = _monthly_search(previous_days, months[earlier], month_days[earlier], -1)
+    result[earlier] = previous.astype("datetime64[us]") + times[-1]
+    return result
+
+
+def _monthly_after(previous_days: np.ndarray, next_days: np.ndarray, times: np.ndarray, points: Points) -> Points:
+    # the first occurrence at or after each point
+    days = points.astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    month_days = (days - months.astype("datetime64[D]")).astype(np.int64) + 1
+    leaps, month_indexes = _month_fields(months)
+    indexes = np.searchsorted(times, points - days.astype("datetime64[us]"), side="left")
+    # on the day of the point, if it is an occurrence day and an occurrence time is at or after the point
+    today = (next_days[leaps, month_indexes, month_days - 1] == month_days) & (indexes < len(times))
+    result = days.astype("datetime64[us]") + times[np.minimum(indexes, len(times) - 1)]
+    later = ~today
+    following = _monthly_search(next_days, months[later], month_days[later], 1)
+    result[later] = following.astype("datetime64[us]") + times[0]
+    return result
+
+
+def _occurrences(rrule_kwargs: dict, unit: scate.Unit) -> tuple[Finder, Finder] | None:
+    """
+    Vectorized versions of finding the last rrule occurrence at or before each point, and the first at or after each
+    point, or None if the rrule's occurrences do not follow a weekly or a monthly pattern.
+
+    :param unit: The unit to which the rrule's dtstart is truncated.
+    """
+    offsets = _weekly_offsets(rrule_kwargs, unit)
+    if offsets is not None:
+        return functools.partial(_weekly_before, offsets), functools.partial(_weekly_after, offsets)
+    tables = _monthly_days(rrule_kwargs, unit)
+    if tables is not None:
+        return functools.partial(_monthly_before, *tables), functools.partial(_monthly_after, *tables)
+    return None
+
+
+@dataclasses.dataclass
+class _VectorShift:
+    """
+    Vectorized versions of :code:`point - shift` (rsub) and :code:`point + shift` (radd) for a Shift.
+    """
+    rsub: Kernel
+    radd: Kernel
+
+
+def _vectorize_shift(shift: scate.Shift) -> _VectorShift | None:
+    """
+    Creates the vectorized version of a Shift, or None if the Shift can't be vectorized.
+    """
+    match shift:
+        case scate.Period(unit=None) | scate.Period(n=None):
+            return _VectorShift(rsub=lambda points: (_nat_like(points), points),
+                                radd=lambda points: (points, _nat_like(points)))
+        case scate.Period():
+            add = _offset(shift.unit, shift.n)
+            subtract = _offset(shift.unit, -shift.n)
+            if add is None or subtract is None:
+                return None
+            return _VectorShift(rsub=lambda points: (subtract(points), points),
+                                radd=lambda points: (points, add(points)))
+        case scate.PeriodSum():
+            periods = [_vectorize_shift(period) for period in shift.periods]
+            if any(p is None or period.unit is None or period.n is None
+                   for p, period in zip(periods, shift.periods)):
+                return None
+
+            def rsub(points: Points) -> tuple[Points, Points]:
+                starts = points
+                for period in periods:
+                    starts, _ = period.rsub(starts)
+                return starts, points
+
+            def radd(points: Points) -> tuple[Points, Points]:
+                ends = points
+                for period in periods:
+                    _, ends = period.radd(ends)
+                return points, ends
+
+            return _VectorShift(rsub=rsub, radd=radd)
+        case scate.Repeating(unit=None):
+            return None
+        case scate.Repeating() if not shift.rrule_kwargs:
+            return _vectorize_repeating_unit(shift)
+        case scate.Repeating():
+            return _vectorize_repeating_field(shift)
+        case scate.RepeatingIntersection():
+            return _vectorize_repeating_intersection(shift)
+        case scate.ShiftUnion():
+            return _vectorize_shift_union(shift)
+        case scate.EveryNth():
+            inner = _vectorize_shift(shift.shift)
+            if inner is None:
+                return None
+
+            def rsub(points: Points) -> tuple[Points, Points]:
+                starts, ends = inner.rsub(points)
+                for _ in range(shift.n - 1):
+                    starts, ends = inner.rsub(starts)
+                return starts, ends
+
+            def radd(points: Points) -> tuple[Points, Points]:
+                starts, ends = inner.radd(points)
+                for _ in range(shift.n - 1):
+                    starts, ends = inner.radd(ends)
+                return starts, ends
+
+            return _VectorShift(rsub=rsub, radd=radd)
+        case _:
+            return None
+
+
+def _vectorize_repeating_unit(repeating: scate.Repeating) -> _VectorShift | None:
+    # a calendar unit, e.g., Repeating(DAY), with no rrule
+    unit, n = repeating.period.unit, repeating.period.n
+    add_n, subtract_n, add_1 = _offset(unit, n), _offset(unit, -n), _offset(unit, 1)
+    if add_n is None or subtract_n is None or add_1 is None:
+        return None
+
+    def rsub(points: Points) -> tuple[Points, Points]:
+        ends = _truncate(repeating.unit, points)
+        return subtract_n(ends), ends
+
+    def radd(points: Points) -> tuple[Points, Points]:
+        starts = _truncate(repeating.unit, points)
+        starts = np.where(starts < points, add_1(starts), starts)
+        return starts, add_n(starts)
+
+    return _VectorShift(rsub=rsub, radd=radd)
+
+
+def _vectorize_repeating_field(repeating: scate.Repeating) -> _VectorShift | None:
+    # a calendar field, e.g., Repeating(HOUR, DAY, value=18) or Repeating(MONTH, YEAR, value=3), whose rrule repeats
+    # weekly or monthly
+    occurrences = _occurrences(repeating.rrule_kwargs, repeating.unit)
+    add_n = _offset(repeating.period.unit, repeating.period.n)
+    subtract_n = _offset(repeating.period.unit, -repeating.period.n)
+    if occurrences is None or add_n is None or subtract_n is None:
+        return None
+    before, after = occurrences
+
+    def rsub(points: Points) -> tuple[Points, Points]:
+        min_ends = subtract_n(_truncate(repeating.unit, points))
+        starts = before(min_ends)
+        return starts, add_n(starts)
+
+    def radd(points: Points) -> tuple[Points, Points]:
+        starts = after(points)
+        return starts, add_n(starts)
+
+    return _VectorShift(rsub=rsub, radd=radd)
+
+
+def _vectorize_repeating_intersection(intersection: scate.RepeatingIntersection) -> _VectorShift | None:
+    if intersection.unit is None:
+        return None
+    min_period = intersection.min_period
+    rrule_period = intersection.rrule_period
+    non_rrule_period = intersection.non_rrule_period
+    add_min = _offset(min_period.unit, min_period.n)
+    if add_min is None:
+        return None
+
+    # without an rrule, this is just the smallest calendar unit
+    if rrule_period is None:
+        subtract_non_rrule = _offset(non_rrule_period.unit, -non_rrule_period.n)
+        if subtract_non_rrule is None:
+            return None
+
+        def rsub(points: Points) -> tuple[Points, Points]:
+            ends = _truncate(min_period.unit, points)
+            return subtract_non_rrule(ends), ends
+
+        def radd(points: Points) -> tuple[Points, Points]:
+            starts = _truncate(min_period.unit, points)
+            starts = np.where(starts < points, add_min(starts), starts)
+            return starts, add_min(starts)
+
+        return _VectorShift(rsub=rsub, radd=radd)
+
+    # mixing rrule and non-rrule periods requires a search over occurrences that is not vectorized
+    if non_rrule_period is not None or rrule_period.unit not in _FIXED_MICROSECONDS:
+        return None
+    occurrences = _occurrences(intersection.rrule_kwargs, min_period.unit)
+    add_rrule = _offset(rrule_period.unit, rrule_period.n)
+    subtract_rrule = _offset(rrule_period.unit, -rrule_period.n)
+    if occurrences is None or add_rrule is None or subtract_rrule is None:
+        return None
+    before, after = occurrences
+
+    def rsub(points: Points) -> tuple[Points, Points]:
+        # the rrule period has a fixed length, so an occurrence plus the period ends by the point if and only if the
+        # occurrence is at or before the point minus the period
+        starts = before(np.minimum(_truncate(min_period.unit, points), subtract_rrule(points)))
+        return starts, add_rrule(starts)
+
+    def radd(points: Points) -> tuple[Points, Points]:
+        starts = _truncate(min_period.unit, points)
+        starts = np.where(starts < points, add_min(starts), starts)
+        starts = after(starts)
+        return starts, add_min(starts)
+
+    return _VectorShift(rsub=rsub, radd=radd)
+
+
+def _vectorize_shift_union(union: scate.ShiftUnion) -> _VectorShift | None:
+    shifts = [_vectorize_shift(shift) for shift in union.shifts]
+    if not shifts or any(shift is None for shift in shifts):
+        return None
+
+    def rsub(points: Points) -> tuple[Points, Points]:
+        # the latest ending interval, preferring the longer interval when ends are tied
+        best_starts, best_ends = shifts[0].rsub(points)
+        for shift in shifts[1:]:
+            starts, ends = shift.rsub(points)
+            better = (ends > best_ends) | ((ends == best_ends) & (ends - starts > best_ends - best_starts))
+            best_starts = np.where(better, starts, best_starts)
+            best_ends = np.where(better, ends, best_ends)
+        return best_starts, best_ends
+
+    def radd(points: Points) -> tuple[Points, Points]:
+        # the earliest starting interval, preferring the longer interval when starts are tied
+        best_starts, best_ends = shifts[0].radd(points)
+        for shift in shifts[1:]:
+            starts, ends = shift.radd(points)
+            better = (starts < best_starts) | ((starts == best_starts) & (starts - ends < best_starts - best_ends))
+            best_starts = np.where(better, starts, best_starts)
+            best_ends = np.where(better, ends, best_ends)
+        return best_starts, best_ends
+
+    return _VectorShift(rsub=rsub, radd=radd)
+
+
+_REPEATING_TYPES = (scate.Repeating, scate.ShiftUnion, scate.RepeatingIntersection)
+
+
+def _is_moving_period(shift: scate.Shift) -> bool:
+    # a Period that Before and After can apply repeatedly (a Period without a unit or n yields None endpoints)
+    return isinstance(shift, scate.PeriodSum) or (
+        isinstance(shift, scate.Period) and shift.unit is not None and shift.n is not None)
+
+
+def _evaluate_vectorized(template: scate.Interval,
+                         shift: _VectorShift,
+                         starts: Points,
+                         ends: Points) -> tuple[Points, Points] | None:
+    match template:
+        case scate.Last():
+            return shift.rsub(ends if template.interval_included else starts)
+        case scate.Next():
+            if template.interval_included:
+                points = starts
+                # to allow repeating intervals to start with our start, subtract a tiny amount
+                if isinstance(template.shift, _REPEATING_TYPES):
+                    points = points - _US
+            else:
+                points = ends
+            return shift.radd(points)
+        case scate.Before() if isinstance(template.shift, _REPEATING_TYPES):
+            points = ends if template.interval_included else starts
+            for _ in range(template.n - 1):
+                points, _ = shift.rsub(points)
+            return shift.rsub(points)
+        case scate.Before() if _is_moving_period(template.shift) and not template.interval_included:
+            for _ in range(template.n):
+                starts, _ = shift.rsub(starts)
+                ends, _ = shift.rsub(ends)
+            return starts, ends
+        case scate.After() if isinstance(template.shift, _REPEATING_TYPES):
+            # to allow repeating intervals to overlap start with our start, subtract a tiny amount
+            points = starts - _US if template.interval_included else ends
+            for _ in range(template.n - 1):
+                _, points = shift.radd(points)
+            return shift.radd(points)
+        case scate.After() if _is_moving_period(template.shift) and not template.interval_included:
+            for _ in range(template.n):
+                _, starts = shift.radd(starts)
+                _, ends = shift.radd(ends)
+            return starts, ends
+        case _:
+            return None
+
+
+def _evaluate_one(template: scate.Interval, start: np.datetime64, end: np.datetime64) -> tuple[Points, Points]:
+    interval = scate.Interval(_to_datetime(start), _to_datetime(end))
+    result = dataclasses.replace(template, interval=interval)
+    return as_datetime64(result.start), as_datetime64(result.end)
+
+
+def evaluate(template: scate.Interval,
+             starts: typing.Iterable[datetime.datetime | None] | np.ndarray,
+             ends: typing.Iterable[datetime.datetime | None] | np.ndarray) -> tuple[Points, Points]:
+    """
+    Evaluates an operator such as Last, Next, Before, or After against many anchor intervals at once.
+    For example, "last Friday" against three document creation times would be evaluated as::
+
+        template = Last(Interval(None, None), Repeating(DAY, WEEK, value=4))
+        starts, ends = evaluate(template, anchor_starts, anchor_ends)
+
+    For Last, Next, Before, and After over Period, PeriodSum, Repeating, RepeatingIntersection, ShiftUnion and EveryNth
+    shifts, calendar arithmetic is vectorized. Other operators, shifts that cannot be vectorized (e.g., a day of the
+    month, whose occurrences do not repeat weekly), and anchors near the limits of the calendar are evaluated one
+    anchor at a time by replacing the interval of the template.
+
+    :param template: An operator whose interval will be replaced by each of the anchor intervals.
+    :param starts: The starts of the anchor intervals, as a datetime64 array (NaT for None) or datetimes.
+    :param ends: The ends of the anchor intervals, as a datetime64 array (NaT for None) or datetimes.
+    :return: The starts and ends of the resulting intervals, as datetime64[us] arrays.
+    """
+    if not isinstance(template, scate._IntervalOp):
+        raise TypeError(f"expected a Last, Next, Before, After, Nth or This template, found {template!r}")
+    starts = as_datetime64(starts)
+    ends = as_datetime64(ends)
+    if starts.shape != ends.shape:
+        raise ValueError(f"starts and ends must have the same shape, found {starts.shape} and {ends.shape}")
+    result_starts = _nat_like(starts)
+    result_ends = _nat_like(ends)
+
+    # intervals without both a start and an end produce undefined intervals
+    defined = ~np.isnat(starts) & ~np.isnat(ends)
+    one_at_a_time = np.zeros(starts.shape, dtype=bool)
+    if template.shift is None or not isinstance(template, (scate.Last, scate.Next, scate.Before, scate.After)):
+        one_at_a_time = defined
+    else:
+        shift = _vectorize_shift(template.shift)
+        vector = defined & (starts >= _MIN_VECTOR)
+        result = None if shift is None else _evaluate_vectorized(template, shift, starts[vector], ends[vector])
+        if result is None:
+            one_at_a_time = defined
+        else:
+            result_starts[vector], result_ends[vector] = result
+            # redo anything outside the range of Python datetimes so that scate can report the error
+            out_of_range = np.zeros(starts.shape, dtype=bool)
+            for points in [result_starts, result_ends]:
+                out_of_range |= ~np.isnat(points) & ((points < _MIN_RESULT) | (points >= _MAX_RESULT))
+            one_at_a_time = defined & (~vector | out_of_range)
+
+    for i in np.flatnonzero(one_at_a_time):
+        result_starts[i], result_ends[i] = _evaluate_one(template, starts[i], ends[i])
+    return result_starts, result_ends
+
+
+def _enumerate_these(these: scate.These) -> tuple[Points, Points] | None:
+    """
+    The starts and ends of all the intervals of a These, computed in one pass with array arithmetic, or None if its
+    Shift is not a Period or a Repeating whose occurrences recur at a fixed Period.
+    """
+    range_interval = these.interval if these._expanded else these._expand()
+    if range_interval.start is None or range_interval.end is None or these.shift is None:
+        return None
+    shift = these.shift
+    if isinstance(shift, scate.Period):
+        if type(shift.n) is not int or shift.unit is None:
+            return None
+        step = length = shift
+    else:
+        step = scate._regular_period(shift)
+        if step is None:
+            return None
+        length = shift.period
+    first = range_interval.start + shift
+    if first.end is None or first.end > range_interval.end:
+        return None
+    add_length = _offset(length.unit, length.n)
+    if add_length is None:
+        return None
+    start = as_datetime64(first.start)
+    last = as_datetime64(range_interval.end)
+    if step.unit in _FIXED_MICROSECONDS:
+        delta = np.timedelta64(step.n * _FIXED_MICROSECONDS[step.unit], "us")
+        starts = start + np.arange((last - start) // delta + 1) * delta
+    elif step.unit in _MONTHS and first.start.day <= 28:
+        # without end-of-month clipping, the day and time within the month stay the same
+        n_months = step.n * _MONTHS[step.unit]
+        month = start.astype("datetime64[M]")
+        in_month = start - month.astype("datetime64[us]")
+        count = (last.astype("datetime64[M]") - month) // np.timedelta64(n_months, "M") + 1
+        months = month + (np.arange(count) * n_months).astype("timedelta64[M]")
+        starts = months.astype("datetime64[us]") + in_month
+    else:
+        return None
+    ends = add_length(starts)
+    # ends increase with starts, so the intervals that fit in the range are a prefix
+    n = np.searchsorted(ends, last, side="right")
+    return starts[:n], ends[:n]
+
+
+class IntervalArray(collections.abc.Sequence):
+    """
+    A columnar collection of intervals, storing starts and ends as two contiguous ``datetime64[us]`` arrays, with NaT
+    for None. For example, "the next three Fridays" written on Sat 22 Dec 1714 could be stored as::
+
+        IntervalArray.from_intervals(NextN(Interval.of(1714, 12, 22), Repeating(DAY, WEEK, value=4), n=3))
+
+    Indexing with an integer produces a :class:`scate.Interval`, while indexing with a slice, an index array or a
+    boolean mask produces another IntervalArray.
+    """
+    __slots__ = ("starts", "ends")
+
+    def __init__(self,
+                 starts: typing.Iterable[datetime.datetime | None] | np.ndarray,
+                 ends: typing.Iterable[datetime.datetime | None] | np.ndarray):
+        """
+        :param starts: The (inclusive) starts of the intervals. A ``datetime64[us]`` array is used without copying.
+        :param ends: The (exclusive) ends of the intervals. A ``datetime64[us]`` array is used without copying.
+        """
+        self.starts = as_datetime64(starts)
+        self.ends = as_datetime64(ends)
+        if self.starts.ndim != 1 or self.starts.shape != self.ends.shape:
+            raise ValueError(f"starts and ends must be 1-dimensional with the same shape, "
+                             f"found {self.starts.shape} and {self.ends.shape}")
+
+    @classmethod
+    def from_intervals(cls, intervals: typing.Iterable[scate.Interval]) -> "IntervalArray":
+        """
+        Collects intervals, e.g., from the :class:`scate.Intervals` operators LastN, NextN, NthN and These.
+        For a These over a Period or a regularly repeating Repeating, e.g., "every day of this century", all the
+        intervals are computed at once, without creating a :class:`scate.Interval` for each.
+
+        :param intervals: The intervals to store.
+        :return: An IntervalArray with the starts and ends of the intervals.
+        """
+        if isinstance(intervals, IntervalArray):
+            return intervals
+        if isinstance(intervals, scate.These):
+            enumerated = _enumerate_these(intervals)
+            if enumerated is not None:
+                return cls(*enumerated)
+        # iterate only once, since the Intervals operators recompute their intervals on each iteration
+        starts = []
+        ends = []
+        for interval in intervals:
+            starts.append(interval.start)
+            ends.append(interval.end)
+        return cls(starts, ends)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> scate.Interval: ...
+
+    @typing.overload
+    def __getitem__(self, index: slice | np.ndarray) -> "IntervalArray": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return scate.Interval(_to_datetime(self.starts[index]), _to_datetime(self.ends[index]))
+        return IntervalArray(self.starts[index], self.ends[index])
+
+    def __iter__(self) -> typing.Iterator[scate.Interval]:
+        for start, end in zip(self.starts.astype(object), self.ends.astype(object)):
+            yield scate.Interval(start, end)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IntervalArray):
+            return NotImplemented
+        # unlike elsewhere in numpy, NaT here equals NaT, just as None equals None
+        return len(self) == len(other) and all(
+            np.array_equal(mine, theirs, equal_nan=True)
+            for mine, theirs in [(self.starts, other.starts), (self.ends, other.ends)])
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.isoformats()!r})"
+
+    def is_defined(self) -> np.ndarray:
+        """
+        :return: A boolean array, True where the interval has both a start and an end.
+        """
+        return ~np.isnat(self.starts) & ~np.isnat(self.ends)
+
+    def isoformats(self) -> list[str]:
+        """
+        Formats each interval as :meth:`scate.Interval.isoformat` would.
+        """
+        return np.char.add(np.char.add(self._isoformat(self.starts), " "), self._isoformat(self.ends)).tolist()
+
+    @staticmethod
+    def _isoformat(points: np.ndarray) -> np.ndarray:
+        # like datetime.isoformat, include microseconds only when they are non-zero
+        has_microseconds = points != points.astype("datetime64[s]")
+        strings = np.where(has_microseconds,
+                           np.datetime_as_string(points, unit="us"),
+                           np.datetime_as_string(points, unit="s"))
+        return np.where(np.isnat(points), "...", strings)
+
+    def durations(self) -> np.ndarray:
+        """
+        :return: A ``timedelta64[us]`` array of the interval lengths, NaT where the interval is not defined.
+        """
+        return self.ends - self.starts
+
+    def overlaps(self, other: "scate.Interval | IntervalArray") -> np.ndarray:
+        """
+        Tests whether each interval shares any time with the other interval (or the corresponding interval, if other is
+        an IntervalArray). Intervals without a start or an end overlap nothing.
+
+        :param other: The interval or intervals to compare against.
+        :return: A boolean array.
+        """
+        other_starts, other_ends = self._endpoints(other)
+        return (self.starts < other_ends) & (other_starts < self.ends)
+
+    def contains(self, other: "scate.Interval | IntervalArray") -> np.ndarray:
+        """
+        Tests whether each interval includes all the time in the other interval (or the corresponding interval, if
+        other is an IntervalArray). Intervals without a start or an end contain nothing and are contained by nothing.
+
+        :param other: The interval or intervals to compare against.
+        :return: A boolean array.
+        """
+        other_starts, other_ends = self._endpoints(other)
+        return (self.starts <= other_starts) & (other_ends <= self.ends)
+
+    @staticmethod
+    def _endpoints(other: "scate.Interval | IntervalArray") -> tuple[np.ndarray, np.ndarray]:
+        if isinstance(other, IntervalArray):
+            return other.starts, other.ends
+        return as_datetime64(other.start), as_datetime64(other.end)
+
+
+# None starts and ends are indexed as the earliest and latest representable points (the minimum int64 is NaT)
+_EARLIEST = np.iinfo(np.int64).min + 1
+_LATEST = np.iinfo(np.int64).max
+
+# nodes of the interval tree with this many intervals or fewer are searched by brute force
+_LEAF_SIZE = 32
+
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+
+def _as_int64(points: Points, none: int) -> np.ndarray:
+    result = points.astype(np.int64)
+    result[np.isnat(points)] = none
+    return result
+
+
+class _Node:
+    """
+    A node of a centered interval tree. Its intervals contain its center, and are stored both sorted by start and
+    sorted by end. Intervals that end at or before the center are under left, and ones that start after it under right.
+    A leaf (with center None) stores its intervals unsorted.
+    """
+    __slots__ = ("center", "starts", "start_rows", "ends", "end_rows", "left", "right")
+
+    def __init__(self, rows: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+        if len(rows) <= _LEAF_SIZE:
+            self.center = self.left = self.right = None
+            self.starts, self.ends, self.start_rows = starts[rows], ends[rows], rows
+            self.end_rows = rows
+            return
+        row_starts = starts[rows]
+        row_ends = ends[rows]
+        # the median start contains at least the interval it came from, so each child has fewer intervals
+        self.center = np.partition(row_starts, len(rows) // 2)[len(rows) // 2]
+        here = rows[(row_starts <= self.center) & (self.center < row_ends)]
+        by_start = np.argsort(starts[here], kind="stable")
+        by_end = np.argsort(ends[here], kind="stable")
+        self.start_rows, self.starts = here[by_start], starts[here][by_start]
+        self.end_rows, self.ends = here[by_end], ends[here][by_end]
+        left = rows[row_ends <= self.center]
+        right = rows[row_starts > self.center]
+        self.left = _Node(left, starts, ends) if len(left) else None
+        self.right = _Node(right, starts, ends) if len(right) else None
+
+    def stab(self, point: int) -> list[np.ndarray]:
+        """
+        :return: Arrays of the rows of the intervals that start at or before the point and end after it.
+        """
+        result = []
+        node = self
+        while node is not None:
+            if node.center is None:
+                result.append(node.start_rows[(node.starts <= point) & (point < node.ends)])
+                node = None
+            elif point < node.center:
+                # all the intervals here end after the center, so the ones that start at or before the point match
+                result.append(node.start_rows[:np.searchsorted(node.starts, point, side="right")])
+                node = node.left
+            else:
+                # all the intervals here start at or before the center, so the ones that end after the point match
+                result.append(node.end_rows[np.searchsorted(node.ends, point, side="right"):])
+                node = node.right
+        return result
+
+
+class IntervalIndex:
+    """
+    An index over many intervals, e.g., all the resolved time expressions in a document, that finds the intervals
+    related to a query interval without comparing against each one. For example::
+
+        index = IntervalIndex.from_objects(from_xml(elem))
+        for row in index.overlapping(Interval.of(2024, 3)):
+            print(index.objects[row], index.intervals[row])
+
+    Intervals are half-open, and a None start or end is treated as unbounded, e.g., Interval(None, end) includes all
+    time before its end. Intervals without either a start or an end are undefined, and are never found. Queries return
+    the (sorted) positions of the matching intervals in :attr:`intervals`, and take logarithmic time plus time
+    proportional to the number of matches (or, for :meth:`contained_in`, to the number of intervals that start within
+    the query).
+    """
+    __slots__ = ("intervals", "objects", "_starts", "_ends", "_start_rows", "_sorted_starts", "_end_rows",
+                 "_sorted_ends", "_root")
+
+    def __init__(self, intervals: typing.Iterable[scate.Interval] | IntervalArray, objects: typing.Sequence = None):
+        """
+        :param intervals: The intervals to index.
+        :param objects: An optional object to associate with each interval, e.g., the scate object it came from.
+        """
+        self.intervals = IntervalArray.from_intervals(intervals)
+        if objects is not None and len(objects) != len(self.intervals):
+            raise ValueError(f"expected one object per interval, found {len(objects)} for {len(self.intervals)}")
+        self.objects = objects
+        self._starts = _as_int64(self.intervals.starts, _EARLIEST)
+        self._ends = _as_int64(self.intervals.ends, _LATEST)
+        rows = np.flatnonzero(~np.isnat(self.intervals.starts) | ~np.isnat(self.intervals.ends))
+        by_start = rows[np.argsort(self._starts[rows], kind="stable")]
+        by_end = rows[np.argsort(self._ends[rows], kind="stable")]
+        self._start_rows, self._sorted_starts = by_start, self._starts[by_start]
+        self._end_rows, self._sorted_ends = by_end, self._ends[by_end]
+        # empty intervals contain no point, and so are left out of the tree
+        rows = rows[self._starts[rows] < self._ends[rows]]
+        self._root = _Node(rows, self._starts, self._ends) if len(rows) else None
+
+    @classmethod
+    def from_objects(cls, objects: typing.Iterable[scate.Interval | scate.Intervals | scate.Shift]) -> "IntervalIndex":
+        """
+        Indexes the output of :func:`scate.from_xml`. Each Interval is indexed once, each Intervals (e.g., a LastN) is
+        indexed once per interval it contains, and Shifts (e.g., a Repeating), which are not on the timeline, are
+        skipped.
+
+        :param objects: The scate objects to index.
+        :return: An IntervalIndex whose :attr:`objects` are the scate object for each interval.
+        """
+        starts = []
+        ends = []
+        sources = []
+        for obj in objects:
+            match obj:
+                case scate.Interval():
+                    members = [obj]
+                case scate.Intervals():
+                    members = obj
+                case _:
+                    members = []
+            for interval in members:
+                starts.append(interval.start)
+                ends.append(interval.end)
+                sources.append(obj)
+        return cls(IntervalArray(starts, ends), sources)
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.intervals!r})"
+
+    @staticmethod
+    def _query(interval: scate.Interval) -> tuple[int, int] | None:
+        if interval.start is None and interval.end is None:
+            return None
+        start = _EARLIEST if interval.start is None else int(as_datetime64(interval.start).astype(np.int64))
+        end = _LATEST if interval.end is None else int(as_datetime64(interval.end).astype(np.int64))
+        return start, end
+
+    def _stab(self, point: int) -> np.ndarray:
+        return np.concatenate(self._root.stab(point)) if self._root is not None else _NO_ROWS
+
+    def _starting(self, start: int, end: int, end_side: str) -> np.ndarray:
+        # the rows of the intervals starting in [start, end) or, with end_side "right", [start, end]
+        low = np.searchsorted(self._sorted_starts, start, side="left")
+        high = np.searchsorted(self._sorted_starts, end, side=end_side)
+        return self._start_rows[low:high]
+
+    def overlapping(self, interval: scate.Interval) -> np.ndarray:
+        """
+        Finds the intervals that share any time with the query, as :meth:`IntervalArray.overlaps` would.
+
+        :param interval: The query interval.
+        :return: The positions of the overlapping intervals.
+        """
+        query = self._query(interval)
+        if query is None:
+            return _NO_ROWS
+        start, end = query
+        # an overlapping interval either starts within the query, or starts before it and contains its start
+        starting = self._starting(start, end, "left")
+        starting = starting[self._ends[starting] > start]
+        stabbed = self._stab(start)
+        stabbed = stabbed[self._starts[stabbed] < start]
+        return np.sort(np.concatenate([starting, stabbed]))
+
+    def containing(self, interval: scate.Interval) -> np.ndarray:
+        """
+        Finds the intervals that include all the time in the query, as :meth:`IntervalArray.contains` would.
+
+        :param interval: The query interval.
+        :return: The positions of the containing intervals.
+        """
+        query = self._query(interval)
+        if query is None:
+            return _NO_ROWS
+        start, end = query
+        # a containing interval contains the query's start, or, if the query is empty, may end exactly at its start
+        low = np.searchsorted(self._sorted_ends, start, side="left")
+        high = np.searchsorted(self._sorted_ends, start, side="right")
+        candidates = np.concatenate([self._stab(start), self._end_rows[low:high]])
+        return np.sort(candidates[(self._starts[candidates] <= start) & (end <= self._ends[candidates])])
+
+    def contained_in(self, interval: scate.Interval) -> np.ndarray:
+        """
+        Finds the intervals whose time is all within the query.
+
+        :param interval: The query interval.
+        :return: The positions of the contained intervals.
+        """
+        query = self._query(interval)
+        if query is None:
+            return _NO_ROWS
+        start, end = query
+        candidates = self._starting(start, end, "right")
+        return np.sort(candidates[self._ends[candidates] <= end])
+
+    def before(self, interval: scate.Interval) -> np.ndarray:
+        """
+        Finds the intervals that end at or before the start of the query.
+
+        :param interval: The query interval.
+        :return: The positions of the earlier intervals.
+        """
+        query = self._query(interval)
+        if query is None:
+            return _NO_ROWS
+        return np.sort(self._end_rows[:np.searchsorted(self._sorted_ends, query[0], side="right")])
+
+    def after(self, interval: scate.Interval) -> np.ndarray:
+        """
+        Finds the intervals that start at or after the end of the query.
+
+        :param interval: The query interval.
+        :return: The positions of the later intervals.
+        """
+        query = self._query(interval)
+        if query is None:
+            return _NO_ROWS
+        return np.sort(self._start_rows[np.searchsorted(self._sorted_starts, query[1], side="left"):])
+
+    def nearest(self, interval: scate.Interval) -> int | None:
+        """
+        Finds the interval closest to the query, i.e., with the smallest gap between it and the query. If any intervals
+        overlap the query, the gap is zero and the first of them is returned. Otherwise, ties are broken in favor of
+        intervals before the query, and then of earlier positions.
+
+        :param interval: The query interval.
+        :return: The position of the nearest interval, or None if there are no defined intervals.
+        """
+        query = self._query(interval)
+        if query is None:
+            return None
+        start, end = query
+        overlapping = self.overlapping(interval)
+        if len(overlapping):
+            return int(overlapping[0])
+        candidates = []
+        n_before = np.searchsorted(self._sorted_ends, start, side="right")
+        if n_before:
+            # the latest end, and among intervals with that end, the first position
+            latest = self._sorted_ends[n_before - 1]
+            first = np.searchsorted(self._sorted_ends, latest, side="left")
+            candidates.append((start - int(latest), int(self._end_rows[first:n_before].min())))
+        n_not_after = np.searchsorted(self._sorted_starts, end, side="left")
+        if n_not_after < len(self._sorted_starts):
+            earliest = self._sorted_starts[n_not_after]
+            last = np.searchsorted(self._sorted_starts, earliest, side="right")
+            candidates.append((int(earliest) - end, int(self._start_rows[n_not_after:last].min())))
+        # min is stable, so a gap before the query wins a tie with an equal gap after it
+        return min(candidates, key=lambda candidate: candidate[0])[1] if candidates else None
+
+
+class AllenRelation(enum.IntEnum):
+    """
+    The 13 relations of Allen's interval algebra, read as "first <relation> second", e.g., BEFORE means the first
+    interval ends before the second starts. :func:`allen_relations` stores them as these integer codes, using
+    :data:`UNDEFINED_RELATION` for intervals without either a start or an end.
+    """
+    BEFORE = 0
+    MEETS = 1
+    OVERLAPS = 2
+    STARTS = 3
+    DURING = 4
+    FINISHES = 5
+    EQUALS = 6
+    FINISHED_BY = 7
+    CONTAINS = 8
+    STARTED_BY = 9
+    OVERLAPPED_BY = 10
+    MET_BY = 11
+    AFTER = 12
+
+
+UNDEFINED_RELATION = -1
+
+# the relations of overlapping intervals, indexed by the signs (plus one) of the differences of the starts and the ends
+_OVERLAP_RELATIONS = np.array([
+    [AllenRelation.OVERLAPS, AllenRelation.FINISHED_BY, AllenRelation.CONTAINS],
+    [AllenRelation.STARTS, AllenRelation.EQUALS, AllenRelation.STARTED_BY],
+    [AllenRelation.DURING, AllenRelation.FINISHES, AllenRelation.OVERLAPPED_BY],
+], dtype=np.int8)
+
+# the number of pairs of intervals to compare at once, which bounds the size of the temporary arrays
+_BLOCK_PAIRS = 1 << 20
+
+
+def _bounded(intervals: IntervalArray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # int64 starts and ends with None as unbounded, as in IntervalIndex, and whether each interval is defined
+    starts_nat = np.isnat(intervals.starts)
+    ends_nat = np.isnat(intervals.ends)
+    return (_as_int64(intervals.starts, _EARLIEST), _as_int64(intervals.ends, _LATEST), ~(starts_nat & ends_nat))
+
+
+def _sign(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    # unlike np.sign(first - second), cannot overflow on the unbounded endpoints
+    return (first > second).view(np.int8) - (first < second).view(np.int8)
+
+
+def _relation_blocks(first: IntervalArray, second: IntervalArray,
+                     block_size: int | None) -> typing.Iterator[tuple[int, np.ndarray]]:
+    first_starts, first_ends, first_defined = _bounded(first)
+    second_starts, second_ends, second_defined = _bounded(second)
+    if block_size is None:
+        block_size = max(1, _BLOCK_PAIRS // max(1, len(second_starts)))
+    second_starts, second_ends = second_starts[np.newaxis, :], second_ends[np.newaxis, :]
+    for offset in range(0, len(first_starts), block_size):
+        block = slice(offset, offset + block_size)
+        starts = first_starts[block, np.newaxis]
+        ends = first_ends[block, np.newaxis]
+        relations = _OVERLAP_RELATIONS[_sign(starts, second_starts) + 1, _sign(ends, second_ends) + 1]
+        # intervals that do not overlap are checked last, so that, e.g., an empty interval at the start of another
+        # meets it rather than starting it
+        relations[ends == second_starts] = AllenRelation.MEETS
+        relations[ends < second_starts] = AllenRelation.BEFORE
+        relations[starts == second_ends] = AllenRelation.MET_BY
+        relations[starts > second_ends] = AllenRelation.AFTER
+        relations[~first_defined[block, np.newaxis] | ~second_defined[np.newaxis, :]] = UNDEFINED_RELATION
+        yield offset, relations
+
+
+def allen_relations(first: typing.Iterable[scate.Interval] | IntervalArray,
+                    second: typing.Iterable[scate.Interval] | IntervalArray,
+                    block_size: int = None) -> np.ndarray:
+    """
+    Computes the Allen relation between every interval in first and every interval in second, e.g., between the
+    events and the time expressions of a document. A None start or end is treated as unbounded, as in
+    :class:`IntervalIndex`, so that, e.g., Interval(None, 2000-01-01) STARTS Interval(None, 2010-01-01).
+
+    :param first: The intervals for the rows.
+    :param second: The intervals for the columns.
+    :param block_size: The number of rows to compute at once. By default, enough to compare about a million pairs.
+    :return: An ``int8`` matrix of :class:`AllenRelation` codes, with :data:`UNDEFINED_RELATION` where either interval
+             has neither a start nor an end.
+    """
+    first = IntervalArray.from_intervals(first)
+    second = IntervalArray.from_intervals(second)
+    result = np.empty((len(first), len(second)), dtype=np.int8)
+    for offset, relations in _relation_blocks(first, second, block_size):
+        result[offset:offset + len(relations)] = relations
+    return result
+
+
+def allen_pairs(first: typing.Iterable[scate.Interval] | IntervalArray,
+                second: typing.Iterable[scate.Interval] | IntervalArray,
+                relations: AllenRelation | typing.Iterable[AllenRelation],
+                block_size: int = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the pairs of intervals with the given relation(s), without storing the full matrix of
+    :func:`allen_relations`, e.g., all the (event, time expression) pairs where the event is DURING the time.
+
+    :param first: The intervals for the first element of each pair.
+    :param second: The intervals for the second element of each pair.
+    :param relations: The relation, or relations, to look for.
+    :param block_size: The number of intervals of first to compare at once. By default, enough to compare about a
+                       million pairs.
+    :return: The positions in first and the positions in second of the pairs, in row-major order.
+    """
+    codes = np.array([relations] if isinstance(relations, AllenRelation) else list(relations), dtype=np.int8)
+    first_positions = []
+    second_positions = []
+    first = IntervalArray.from_intervals(first)
+    second = IntervalArray.from_intervals(second)
+    for offset, block in _relation_blocks(first, second, block_size):
+        rows, columns = np.nonzero(np.isin(block, codes))
+        first_positions.append(rows + offset)
+        second_positions.append(columns)
+    if not first_positions:
+        return _NO_ROWS, _NO_ROWS
+    return np.concatenate(first_positions), np.concatenate(second_positions)
+
+
+def _from_int64(points: np.ndarray) -> Points:
+    result = points.astype("datetime64[us]")
+    result[(points == _EARLIEST) | (points == _LATEST)] = np.datetime64("NaT")
+    return result
+
+
+def _merge_sorted(starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # merges intervals, sorted by start, that overlap or touch, e.g., [1, 3), [2, 4) and [4, 5) become [1, 5)
+    if not len(starts):
+        return starts, ends
+    reach = np.maximum.accumulate(ends)
+    first = np.empty(len(starts), dtype=bool)
+    first[0] = True
+    first[1:] = starts[1:] > reach[:-1]
+    last = np.empty(len(starts), dtype=bool)
+    last[:-1] = first[1:]
+    last[-1] = True
+    return starts[first], reach[last]
+
+
+class IntervalSet:
+    """
+    A set of points on the timeline, stored as the sorted starts and ends of non-overlapping, non-adjacent intervals.
+    For example, the Mondays and Fridays of 2025, except for holidays, could be computed as::
+
+        year = Interval.of(2025)
+        mondays = IntervalSet(These(year, Repeating(DAY, WEEK, value=0)))
+        fridays = IntervalSet(These(year, Repeating(DAY, WEEK, value=4)))
+        ((mondays | fridays) & IntervalSet([year])) - IntervalSet(holidays)
+
+    Union (``|``), intersection (``&``), difference (``-``) and complement (``~``) take time linear in the number of
+    intervals in the two sets. As in :class:`IntervalIndex`, a None start or end is unbounded. Intervals with neither a
+    start nor an end are undefined, and so are not included, but the complement of an empty set contains the whole
+    timeline, which is shown as Interval(None, None).
+    """
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, intervals: typing.Iterable[scate.Interval] | IntervalArray = ()):
+        """
+        :param intervals: The intervals whose points are in the set. They may overlap and be in any order.
+        """
+        intervals = IntervalArray.from_intervals(intervals)
+        starts = _as_int64(intervals.starts, _EARLIEST)
+        ends = _as_int64(intervals.ends, _LATEST)
+        keep = (~np.isnat(intervals.starts) | ~np.isnat(intervals.ends)) & (starts < ends)
+        order = np.argsort(starts[keep], kind="stable")
+        self._starts, self._ends = _merge_sorted(starts[keep][order], ends[keep][order])
+
+    @classmethod
+    def _of(cls, starts: np.ndarray, ends: np.ndarray) -> "IntervalSet":
+        result = cls.__new__(cls)
+        result._starts = starts
+        result._ends = ends
+        return result
+
+    @property
+    def intervals(self) -> IntervalArray:
+        """
+        :return: The normalized intervals, in order.
+        """
+        return IntervalArray(_from_int64(self._starts), _from_int64(self._ends))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> typing.Iterator[scate.Interval]:
+        return iter(self.intervals)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return np.array_equal(self._starts, other._starts) and np.array_equal(self._ends, other._ends)
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.intervals.isoformats()!r})"
+
+    def __contains__(self, point: datetime.datetime) -> bool:
+        point = int(as_datetime64(point).astype(np.int64))
+        i = np.searchsorted(self._starts, point, side="right") - 1
+        return bool(i >= 0 and point < self._ends[i])
+
+    def _combine(self, other: "IntervalSet",
+                 keep: typing.Callable[[np.ndarray, np.ndarray], np.ndarray]) -> "IntervalSet":
+        # each set's starts and ends are sorted, so a stable sort of the four arrays only merges sorted runs
+        points = np.concatenate([self._starts, self._ends, other._starts, other._ends])
+        order = np.argsort(points, kind="stable")
+        points = points[order]
+        n_self = 2 * len(self._starts)
+        n_other = 2 * len(other._starts)
+        # +1 where an interval starts and -1 where it ends, so the running sums say what each set covers
+        in_self = np.concatenate([np.ones(len(self._starts), np.int8), -np.ones(len(self._ends), np.int8),
+                                  np.zeros(n_other, np.int8)])[order].cumsum(dtype=np.int64)
+        in_other = np.concatenate([np.zeros(n_self, np.int8), np.ones(len(other._starts), np.int8),
+                                   -np.ones(len(other._ends), np.int8)])[order].cumsum(dtype=np.int64)
+        # the coverage between one distinct point and the next is the running sum after the last event at the point
+        last = np.empty(len(points), dtype=bool)
+        last[:-1] = points[1:] != points[:-1]
+        last[-1:] = True
+        points = points[last]
+        covered = keep(in_self[last][:-1] > 0, in_other[last][:-1] > 0)
+        return self._of(*_merge_sorted(points[:-1][covered], points[1:][covered]))
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        """
+        :return: The points in either set.
+        """
+        return self._combine(other, np.logical_or)
+
+    def intersection(self, other: "IntervalSet") -> "IntervalSet":
+        """
+        :return: The points in both sets.
+        """
+        return self._combine(other, np.logical_and)
+
+    def difference(self, other: "IntervalSet") -> "IntervalSet":
+        """
+        :return: The points in this set but not in the other.
+        """
+        return self._combine(other, lambda mine, theirs: mine & ~theirs)
+
+    def complement(self, within: scate.Interval | None = None) -> "IntervalSet":
+        """
+        :param within: If given, only the points of this interval are considered.
+        :return: The points not in this set.
+        """
+        if within is None:
+            everything = self._of(np.array([_EARLIEST], np.int64), np.array([_LATEST], np.int64))
+        else:
+            everything = IntervalSet([within])
+        return everything.difference(self)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __invert__ = complement
@@ -0,0 +1,98 @@
+"""
+Benchmarks for scate. These are not run by pytest; run them directly, e.g.::
+
+    PYTHONPATH=src/main/python python src/test/python/bench_scate.py memory
+"""
+import argparse
+import datetime
+import gc
+import inspect
+import timeit
+import tracemalloc
+
+import scate
+
+
+def _expressions(i: int) -> list:
+    # a mix of the objects that from_xml produces for a typical document, with spans as from_xml assigns them
+    doc_time = scate.Interval.of(2000 + i % 20, 1 + i % 12, 1 + i % 28)
+    friday = scate.Repeating(scate.DAY, scate.WEEK, value=4)
+    months = scate.Period(scate.MONTH, 3)
+    objects = [
+        friday,
+        months,
+        scate.Year(1990 + i % 30),
+        scate.Last(doc_time, friday),
+        scate.Next(doc_time, months),
+        scate.Before(doc_time, scate.Period(scate.YEAR, 1)),
+        scate.This(doc_time, scate.Repeating(scate.MONTH, scate.YEAR, value=1 + i % 12)),
+        scate.Nth(scate.Year(2016), scate.Repeating(scate.DAY), index=1 + i % 10),
+        scate.NextN(doc_time, friday, n=3),
+        scate.RepeatingIntersection([scate.Repeating(scate.DAY, scate.WEEK, value=5), scate.Morning()]),
+    ]
+    for obj in objects:
+        obj.span = obj.trigger_span = (i, i + 10)
+    return objects
+
+
+def bench_memory(n: int) -> None:
+    """
+    Reports the bytes retained per parsed-expression object.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    expressions = [_expressions(i) for i in range(n)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_objects = sum(len(objects) for objects in expressions)
+    print(f"{n_objects} objects: {(after - before) / 2 ** 20:.1f} MiB, "
+          f"{(after - before) / n_objects:.0f} bytes per object")
+    for obj in expressions[0]:
+        size = obj.__sizeof__()
+        if hasattr(obj, "__dict__"):
+            size += obj.__dict__.__sizeof__()
+        print(f"  {obj.__class__.__name__}: {size} bytes (excluding referenced objects)")
+
+
+def bench_kernels(n: int) -> None:
+    """
+    Reports the time per call of Unit.truncate and Unit.relativedelta, and the time to run the test_scate tests.
+    """
+    points = [datetime.datetime(1900 + i % 200, 1 + i % 12, 1 + i % 28, i % 24, i % 60, i % 60, i) for i in range(n)]
+    for unit in scate.Unit:
+        if unit is not scate.MILLISECOND:
+            seconds = timeit.timeit(lambda: [unit.relativedelta(i % 4) for i in range(n)], number=1)
+            print(f"  {unit.name}.relativedelta: {seconds / n * 1e9:.0f} ns per call")
+    for unit in scate.Unit:
+        seconds = timeit.timeit(lambda: [unit.truncate(point) for point in points], number=1)
+        print(f"  {unit.name}.truncate: {seconds / n * 1e9:.0f} ns per call")
+
+    import test_scate
+    tests = [func for name, func in inspect.getmembers(test_scate, inspect.isfunction)
+             if name.startswith("test_") and not inspect.signature(func).parameters]
+    seconds = 0.0
+    for _ in range(10):
+        # don't let memoized shift evaluations from one run speed up the next
+        scate._evaluate_shift.cache_clear()
+        seconds += timeit.timeit(lambda: [test() for test in tests], number=1)
+    print(f"{len(tests)} test_scate tests: {seconds / 10 * 1e3:.1f} ms per run")
+
+
+def _main():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(required=True)
+    memory_parser = subparsers.add_parser("memory", help=bench_memory.__doc__.strip())
+    memory_parser.add_argument("-n", type=int, default=10_000)
+    memory_parser.set_defaults(func=lambda args: bench_memory(args.n))
+    kernels_parser = subparsers.add_parser("kernels", help=bench_kernels.__doc__.strip())
+    kernels_parser.add_argument("-n", type=int, default=100_000)
+    kernels_parser.set_defaults(func=lambda args: bench_kernels(args.n))
+    args = parser.parse_args()
+    start = datetime.datetime.now()
+    args.func(args)
+    print(f"elapsed: {datetime.datetime.now() - start}")
+
+
+if __name__ == "__main__":
+    _main()
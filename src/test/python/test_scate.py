@@ -1,6 +1,12 @@
 import scate
+import concurrent.futures
+import dataclasses
 import datetime
+import json
+import pickle
 import pytest
+import threading
+import time
 
 
 def test_interval():
@@ -140,6 +146,20 @@ def test_repeating_field():
     assert (sun_2024_10_27 + mon).isoformat() == "2024-10-28T00:00:00 2024-10-29T00:00:00"
     assert (sun_2024_10_27 - sat).isoformat() == "2024-10-26T00:00:00 2024-10-27T00:00:00"
 
+    interval = scate.Interval.fromisoformat("2002-03-22T11:30:30 2003-05-10T22:10:20")
+    hour18 = scate.Repeating(scate.HOUR, scate.DAY, value=18)
+    assert (interval - hour18).isoformat() == "2002-03-21T18:00:00 2002-03-21T19:00:00"
+    assert (interval + hour18).isoformat() == "2003-05-11T18:00:00 2003-05-11T19:00:00"
+    minute45 = scate.Repeating(scate.MINUTE, scate.HOUR, value=45)
+    assert (interval - minute45).isoformat() == "2002-03-22T10:45:00 2002-03-22T10:46:00"
+    assert (interval + minute45).isoformat() == "2003-05-10T22:45:00 2003-05-10T22:46:00"
+    second10 = scate.Repeating(scate.SECOND, scate.MINUTE, value=10)
+    assert (interval - second10).isoformat() == "2002-03-22T11:30:10 2002-03-22T11:30:11"
+    assert (interval + second10).isoformat() == "2003-05-10T22:11:10 2003-05-10T22:11:11"
+    day366 = scate.Repeating(scate.DAY, scate.YEAR, value=366)
+    assert (interval - day366).isoformat() == "2000-12-31T00:00:00 2001-01-01T00:00:00"
+    assert (interval + day366).isoformat() == "2004-12-31T00:00:00 2005-01-01T00:00:00"
+
 
 def test_every_nth():
     interval = scate.Interval.of(2000, 1, 1)
@@ -310,6 +330,25 @@ def test_repeating_intersection():
     assert (scate.Interval.of(2000, 11, 25, 12, 1) + m11d25noon).isoformat() == \
            "2001-11-25T12:00:00 2001-11-25T12:01:00"
 
+    # Sat 16 Mar 2024
+    interval = scate.Interval.of(2024, 3, 16, 8)
+    sat_mar_mornings = scate.RepeatingIntersection([
+        scate.Repeating(scate.DAY, scate.WEEK, value=5),
+        scate.Repeating(scate.MONTH, scate.YEAR, value=3),
+        scate.Morning(),
+    ])
+    assert (interval - sat_mar_mornings).isoformat() == "2024-03-09T06:00:00 2024-03-09T12:00:00"
+    assert (interval - sat_mar_mornings - sat_mar_mornings).isoformat() == "2024-03-02T06:00:00 2024-03-02T12:00:00"
+    assert (interval + sat_mar_mornings).isoformat() == "2024-03-23T06:00:00 2024-03-23T12:00:00"
+
+    # weekly rules with week numbers are left to dateutil
+    tue_week10 = scate.RepeatingIntersection([
+        scate.Repeating(scate.WEEK, scate.YEAR, value=10),
+        scate.Repeating(scate.DAY, scate.WEEK, value=1),
+    ])
+    assert (interval - tue_week10).isoformat() == "2024-03-05T00:00:00 2024-03-06T00:00:00"
+    assert (interval + tue_week10).isoformat() == "2025-03-04T00:00:00 2025-03-05T00:00:00"
+
 
 def test_year():
     assert scate.Year(1985).isoformat() == "1985-01-01T00:00:00 1986-01-01T00:00:00"
@@ -486,6 +525,20 @@ def test_nth():
     with pytest.raises(ValueError):
         scate.Nth(interval, may, 2, from_end=True)
 
+    # large indexes jump directly to the nth repetition, but must agree with stepping one repetition at a time
+    y2016 = scate.Year(2016)
+    assert scate.Nth(y2016, day, 300).isoformat() == "2016-10-26T00:00:00 2016-10-27T00:00:00"
+    assert scate.Nth(y2016, scate.Period(scate.HOUR, 1), 8000).isoformat() == "2016-11-29T07:00:00 2016-11-29T08:00:00"
+    assert scate.Nth(y2016, scate.Repeating(scate.DAY, scate.WEEK, value=0), 50).isoformat() == \
+           "2016-12-12T00:00:00 2016-12-13T00:00:00"
+    assert scate.Nth(y2016, scate.Repeating(scate.DAY, scate.MONTH, value=15), 10, from_end=True).isoformat() == \
+           "2016-03-15T00:00:00 2016-03-16T00:00:00"
+    assert scate.Nth(y2016, scate.Repeating(scate.DAY, scate.MONTH, value=31), 3).isoformat() == \
+           "2016-05-31T00:00:00 2016-06-01T00:00:00"
+    # month arithmetic clips to the end of the month at each step: Jan 31, Feb 29, Mar 29, Apr 29
+    end_of_january = scate.Interval.fromisoformat("2016-01-31 2017-01-01")
+    assert scate.Nth(end_of_january, month, 4).isoformat() == "2016-04-29T00:00:00 2016-05-29T00:00:00"
+
 
 def test_this():
     period1 = scate.Period(scate.YEAR, 1)
@@ -595,6 +648,28 @@ def test_n():
     assert scate.NthN(interval, day, index=1, n=None, from_end=True).isoformats() == \
            ["2003-05-09T00:00:00 2003-05-10T00:00:00", "... 2003-05-09T00:00:00"]
 
+    # many repetitions are streamed from a single cursor, but must agree with applying Last/Next one at a time
+    for shift in [scate.Repeating(scate.DAY, scate.WEEK, value=4),
+                  scate.Repeating(scate.DAY, scate.MONTH, value=31),
+                  scate.Repeating(scate.DAY, scate.YEAR, value=60),
+                  scate.RepeatingIntersection([scate.Repeating(scate.DAY, scate.WEEK, value=4),
+                                               scate.Repeating(scate.DAY, scate.MONTH, value=13)]),
+                  scate.Period(scate.MONTH, 1),
+                  scate.Summer()]:
+        for n_class, base_class in [(scate.LastN, scate.Last), (scate.NextN, scate.Next)]:
+            expected = []
+            previous = scate.Interval.of(2016, 1, 31)
+            for _ in range(52):
+                previous = base_class(previous, shift)
+                expected.append(previous.isoformat())
+            assert n_class(scate.Interval.of(2016, 1, 31), shift, 52).isoformats() == expected
+    # month arithmetic clips to the end of the month at each step
+    end_of_january = scate.Interval.fromisoformat("2016-01-30 2016-01-31")
+    assert scate.NextN(end_of_january, scate.Period(scate.MONTH, 1), 3).isoformats() == [
+        "2016-01-31T00:00:00 2016-02-29T00:00:00",
+        "2016-02-29T00:00:00 2016-03-29T00:00:00",
+        "2016-03-29T00:00:00 2016-04-29T00:00:00"]
+
 
 def test_these():
 
@@ -646,6 +721,21 @@ def test_these():
     day = scate.Repeating(scate.DAY)
     assert len(list(scate.These(interval_week_thu, day))) == 7
 
+    # long ranges are streamed from a single cursor, but must agree with applying the Shift one step at a time
+    years = scate.Interval.fromisoformat("2000-01-31 2020-03-01")
+    for shift in [scate.Repeating(scate.DAY, scate.WEEK, value=0),
+                  scate.Repeating(scate.DAY, scate.MONTH, value=31),
+                  scate.Repeating(scate.DAY, scate.YEAR, value=60),
+                  scate.Period(scate.MONTH, 1)]:
+        these = scate.These(years, shift)
+        expected = []
+        interval = these.interval.start + shift
+        while interval.end <= these.interval.end:
+            expected.append(interval.isoformat())
+            interval = interval.end + shift
+        assert these.isoformats() == expected
+    assert len(list(scate.These(years, scate.Repeating(scate.DAY, scate.WEEK, value=0)))) == 1048
+
 
 def test_repr():
     for obj in [
@@ -661,6 +751,341 @@ def test_repr():
         assert obj == eval(repr(obj), vars(scate))
 
 
+def test_slots():
+    for obj in [
+            scate.Interval.of(2022, 8, 13),
+            scate.Period(scate.YEAR, 2),
+            scate.PeriodSum([scate.Period(scate.YEAR, 2), scate.Period(scate.DAY, 1)]),
+            scate.Summer(),
+            scate.ShiftUnion([scate.Repeating(scate.DAY, scate.WEEK, value=0), scate.Morning()]),
+            scate.RepeatingIntersection([scate.Repeating(scate.DAY, scate.WEEK, value=5), scate.Morning()]),
+            scate.Last(scate.Interval.of(1998, 7, 13), scate.Repeating(scate.DAY, scate.MONTH, value=13)),
+            scate.NextN(scate.Interval.of(1907, 3), scate.Period(scate.QUARTER_YEAR, 3), n=2),
+    ]:
+        assert not hasattr(obj, "__dict__")
+        obj.span = obj.trigger_span = (3, 5)
+        assert obj.trigger_span == (3, 5)
+        with pytest.raises(AttributeError):
+            obj.unknown_attribute = 1
+
+
+def test_lazy_evaluation():
+    march = scate.Repeating(scate.MONTH, scate.YEAR, value=3)
+    with scate.lazy_evaluation():
+        last_march = scate.Last(scate.Interval.of(2024, 2, 1), march)
+        next_march = scate.Next(last_march, march)
+        # errors are postponed until the start or end is accessed
+        between = scate.Between(next_march, last_march)
+        with scate.lazy_evaluation(False):
+            with pytest.raises(ValueError):
+                scate.Between(next_march, last_march)
+    assert next_march.isoformat() == "2024-03-01T00:00:00 2024-04-01T00:00:00"
+    assert last_march.isoformat() == "2023-03-01T00:00:00 2023-04-01T00:00:00"
+    assert next_march == scate.Next(scate.Last(scate.Interval.of(2024, 2, 1), march), march)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            _ = between.end
+    assert scate.Between(last_march, next_march).isoformat() == "2023-04-01T00:00:00 2024-03-01T00:00:00"
+    with pytest.raises(AttributeError):
+        _ = last_march.trigger_span
+
+
+def test_bind():
+    friday = scate.Repeating(scate.DAY, scate.WEEK, value=4)
+    with scate.lazy_evaluation():
+        doc_time = scate.DocTime()
+        last_friday = scate.Last(doc_time, friday)
+        fridays = scate.These(scate.Next(doc_time, scate.Repeating(scate.MONTH)), friday)
+        since_1990 = scate.Between(scate.Year(1990), scate.DocTime(scate.YEAR), start_included=True)
+    year_1990 = since_1990.start_interval
+
+    assert scate.bind(last_friday, scate.Interval.of(2024, 3, 16)).isoformat() == \
+           "2024-03-15T00:00:00 2024-03-16T00:00:00"
+    assert scate.bind(last_friday, scate.Interval.of(1998, 2, 16)).isoformat() == \
+           "1998-02-13T00:00:00 1998-02-14T00:00:00"
+    # the weeks overlapping February 2025 start on Mon 27 Jan and end on Sun 2 Mar
+    assert scate.bind(fridays, scate.Interval.of(2025, 1, 7)).isoformats() == \
+           [scate.Interval.of(2025, 1, 31).isoformat()] + \
+           [scate.Interval.of(2025, 2, d).isoformat() for d in [7, 14, 21, 28]]
+    bound = scate.bind(since_1990, scate.Interval.of(2007, 1, 9))
+    assert bound.isoformat() == "1990-01-01T00:00:00 2007-01-01T00:00:00"
+    assert bound.start_interval is year_1990
+    assert scate.bind(year_1990, scate.Interval.of(2007, 1, 9)) is year_1990
+
+
+def test_compile():
+    friday = scate.Repeating(scate.DAY, scate.WEEK, value=4)
+    with scate.lazy_evaluation():
+        doc_time = scate.DocTime()
+        objects = [
+            scate.Last(doc_time, friday),
+            scate.Next(doc_time, friday, interval_included=True),
+            scate.Before(scate.Last(doc_time, scate.Repeating(scate.MONTH)), scate.Period(scate.DAY, 3), n=2),
+            scate.After(doc_time, friday, n=3),
+            scate.This(scate.DocTime(scate.YEAR), scate.Repeating(scate.MONTH, scate.YEAR, value=2)),
+            scate.This(doc_time, scate.Period(scate.HOUR, 5)),
+            scate.Nth(scate.DocTime(scate.YEAR), friday, index=3),
+            scate.These(scate.Next(doc_time, scate.Repeating(scate.MONTH)), friday),
+            scate.Between(scate.Year(1990), scate.Last(doc_time, None), start_included=True),
+            scate.Year(1990),
+        ]
+    for obj in objects:
+        compiled = scate.compile(obj)
+        for anchor in [scate.Interval.of(2024, 3, 16), scate.Interval.of(1998, 2, 16)]:
+            bound = scate.bind(obj, anchor)
+            if isinstance(bound, scate.Intervals):
+                assert compiled(anchor).isoformats() == bound.isoformats()
+            else:
+                assert compiled(anchor).isoformat() == bound.isoformat()
+    assert scate.compile(objects[0])(scate.Interval(None, None)).isoformat() == "... ..."
+    assert scate.compile(objects[-1])(scate.Interval.of(2024, 3, 16)) is objects[-1]
+
+    # errors that depend on the document creation time are raised when evaluating, not when compiling
+    with scate.lazy_evaluation():
+        two_days = scate.This(doc_time, scate.Repeating(scate.DAY))
+    compiled = scate.compile(two_days)
+    assert compiled(scate.Interval.of(2024, 3, 16)).isoformat() == "2024-03-16T00:00:00 2024-03-17T00:00:00"
+    with pytest.raises(ValueError):
+        compiled(scate.Interval.of(2024, 3))
+
+
+def test_intern():
+    friday = scate.Repeating(scate.DAY, scate.WEEK, value=4, span=(5, 11))
+    assert hash(friday) == hash(scate.Repeating(scate.DAY, scate.WEEK, value=4))
+    assert len({scate.Year(2014), scate.Year(2014), scate.Year(2015)}) == 2
+    assert len({scate.Spring(), scate.Spring(), scate.Summer()}) == 2
+
+    interned_friday = scate.intern(friday)
+    assert interned_friday is scate.intern(scate.Repeating(scate.DAY, scate.WEEK, value=4))
+    assert interned_friday == scate.Repeating(scate.DAY, scate.WEEK, value=4)
+    assert interned_friday.span is None and friday.span == (5, 11)
+    assert scate.intern(scate.Year(2014, span=(1, 5))) is scate.intern(scate.Year(2014))
+    assert scate.intern(scate.Morning()) is not scate.intern(scate.Afternoon())
+    friday_morning = scate.intern(scate.RepeatingIntersection([friday, scate.Morning(span=(12, 19))]))
+    assert friday_morning is scate.intern(scate.RepeatingIntersection([interned_friday, scate.Morning()]))
+    assert friday_morning.shifts[0] is interned_friday
+    last = scate.Last(scate.Interval.of(2024, 3, 16), friday)
+    assert scate.intern(last) is last
+
+    # memoized evaluations return new Intervals each time
+    date = datetime.datetime(2024, 3, 16)
+    interval = date - interned_friday
+    interval.start = None
+    assert (date - interned_friday).isoformat() == "2024-03-15T00:00:00 2024-03-16T00:00:00"
+    assert (date - friday_morning).isoformat() == "2024-03-15T06:00:00 2024-03-15T12:00:00"
+
+    # spans are ignored by equality as well as by hashing, so the memo is shared by occurrences with different spans
+    assert friday == scate.Repeating(scate.DAY, scate.WEEK, value=4, span=(20, 26))
+    assert len({friday, scate.Repeating(scate.DAY, scate.WEEK, value=4, span=(20, 26))}) == 1
+    assert scate.RepeatingIntersection([friday, scate.Morning(span=(12, 19))]) == friday_morning
+    date = datetime.datetime(1987, 6, 5, 4, 3, 2)
+    before = scate._evaluate_shift.cache_info()
+    for span in [(0, 6), (10, 16), (20, 26)]:
+        assert (date - scate.Repeating(scate.DAY, scate.WEEK, value=4, span=span)).isoformat() == \
+            "1987-05-29T00:00:00 1987-05-30T00:00:00"
+    after = scate._evaluate_shift.cache_info()
+    assert (after.hits - before.hits, after.misses - before.misses) == (2, 1)
+
+
+def test_freeze():
+    friday = scate.Repeating(scate.DAY, scate.WEEK, value=4)
+    last_friday = scate.Last(scate.Interval.of(2024, 3, 16), friday, span=(0, 11))
+    frozen = scate.freeze(last_friday)
+    assert isinstance(frozen, scate.Last)
+    assert frozen.isoformat() == last_friday.isoformat()
+    assert frozen == scate.freeze(scate.Last(scate.Interval.of(2024, 3, 16), friday))
+    assert frozen != scate.freeze(scate.Next(scate.Interval.of(2024, 3, 16), friday))
+    assert len({frozen, scate.freeze(last_friday), scate.freeze(scate.Year(2024))}) == 2
+    assert scate.freeze(frozen) is frozen
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frozen.shift = scate.Period(scate.DAY, 1)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frozen.interval.start = datetime.datetime(2000, 1, 1)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        del frozen.span
+    assert last_friday.span == (0, 11)
+    intersection = scate.freeze(scate.Intersection([scate.Year(2024), scate.Interval.of(2024, 3)]))
+    assert isinstance(intersection.intervals, tuple)
+
+    # frozen trees can be bound, and lazy ones can be evaluated from several threads at once
+    with scate.lazy_evaluation():
+        shared = scate.freeze(scate.Next(scate.DocTime(), friday))
+        next_year = scate.Next(scate.Interval.of(2024, 3, 16), scate.Repeating(scate.YEAR))
+        lazy = scate.freeze(scate.These(next_year, friday))
+    assert scate.bind(shared, scate.Interval.of(2024, 3, 16)).isoformat() == "2024-03-22T00:00:00 2024-03-23T00:00:00"
+    assert isinstance(scate.bind(shared, scate.Interval.of(2024, 3, 16)).interval, scate.Interval)
+    anchors = [scate.Interval.of(2024, 3, day) for day in range(1, 29)] * 4
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda anchor: scate.bind(shared, anchor).isoformat(), anchors))
+        counts = set(executor.map(lambda _: len(list(lazy)), range(16)))
+    assert results == [scate.bind(shared, anchor).isoformat() for anchor in anchors]
+    assert counts == {len(list(scate.These(next_year, friday)))} == {53}
+
+
+def test_serialization():
+    friday = scate.Repeating(scate.DAY, scate.WEEK, value=4, span=(10, 16))
+    march = scate.Interval.of(2024, 3)
+    doc_time = scate.Interval.of(2024, 3, 16, 8)
+    objects = [
+        scate.Last(doc_time, friday, span=(5, 16)),
+        scate.Next(doc_time, friday, interval_included=True),
+        scate.Before(march, scate.Period(scate.DAY, 3), n=2),
+        scate.After(march, scate.PeriodSum([scate.Period(scate.WEEK, 1), scate.Period(scate.HOUR, -2.5)])),
+        scate.This(scate.Year(2024), scate.Spring()),
+        scate.Nth(scate.Year(2024), scate.RepeatingIntersection([friday, scate.Morning()]), index=3, from_end=True),
+        scate.Between(scate.Year(1990), scate.Year(199, 1), start_included=True),
+        scate.Intersection([scate.Year(2024), march]),
+        scate.YearSuffix(scate.Year(1990), 5, 0),
+        scate.LastN(march, scate.ShiftUnion([friday, scate.Weekend()]), n=3),
+        scate.NthN(march, friday, index=2, n=2),
+        scate.These(march, friday),
+        scate.Last(march, scate.EveryNth(scate.Repeating(scate.DAY), 2)),
+        scate.Interval(datetime.datetime(2024, 3, 16, 8, 30, 15, 123), None),
+        scate.Interval(None, None),
+        scate.Repeating(None),
+        friday,
+    ]
+    for serialize, deserialize in [(scate.to_json, scate.from_json), (scate.to_bytes, scate.from_bytes)]:
+        restored = deserialize(serialize(objects))
+        assert restored == objects
+        for obj, restored_obj in zip(objects, restored):
+            assert type(restored_obj) is type(obj)
+            assert getattr(restored_obj, "span", None) == getattr(obj, "span", None)
+            match obj:
+                case scate.Interval():
+                    assert restored_obj.isoformat() == obj.isoformat()
+                case scate.Intervals():
+                    assert restored_obj.isoformats() == obj.isoformats()
+        # shared objects are stored once, and shared again when restored
+        assert restored[0].shift is restored[1].shift is restored[-1]
+        assert restored[0].shift is not friday
+
+    assert len(scate.to_bytes(objects)) < len(scate.to_json(objects)) / 3
+    assert json.loads(scate.to_json(objects[:1])) == {
+        "schema": scate.SCHEMA_VERSION,
+        "nodes": [{"type": "Interval",
+                   "start": {"datetime": "2024-03-16T08:00:00"},
+                   "end": {"datetime": "2024-03-16T09:00:00"}},
+                  {"type": "Repeating",
+                   "unit": {"unit": "DAY"},
+                   "range": {"unit": "WEEK"},
+                   "value": 4,
+                   "rrule_kwargs": {"dict": [["freq", 2], ["byweekday", 4]]},
+                   "span": {"tuple": [10, 16]}},
+                  {"type": "Last",
+                   "start": {"datetime": "2024-03-15T00:00:00"},
+                   "end": {"datetime": "2024-03-16T00:00:00"},
+                   "interval": {"ref": 0},
+                   "shift": {"ref": 1},
+                   "span": {"tuple": [5, 16]}}],
+        "roots": [2],
+    }
+
+    # unresolved lazy operators and DocTime placeholders stay unresolved until bound or accessed
+    with scate.lazy_evaluation():
+        lazy = [scate.Last(scate.DocTime(), friday), scate.Next(march, scate.Period(scate.MONTH, 1))]
+    for serialize, deserialize in [(scate.to_json, scate.from_json), (scate.to_bytes, scate.from_bytes)]:
+        [last, next_month] = deserialize(serialize(lazy))
+        assert scate.bind(last, doc_time).isoformat() == "2024-03-15T00:00:00 2024-03-16T00:00:00"
+        assert next_month.isoformat() == "2024-04-01T00:00:00 2024-05-01T00:00:00"
+
+    # frozen objects are restored as ordinary ones, and deep nesting does not hit the recursion limit
+    frozen = scate.freeze(objects[7])
+    [thawed] = scate.from_bytes(scate.to_bytes([frozen]))
+    assert type(thawed) is scate.Intersection and scate.freeze(thawed) == frozen
+    deep = scate.Year(2000)
+    for _ in range(5000):
+        deep = scate.Next(deep, scate.Period(scate.DAY, 1))
+    assert scate.from_bytes(scate.to_bytes([deep]))[0].isoformat() == deep.isoformat()
+
+    with pytest.raises(ValueError):
+        scate.from_json(scate.to_json(objects).replace('"schema": 1', '"schema": 999'))
+    with pytest.raises(ValueError):
+        scate.from_bytes(scate.to_bytes(objects)[:-3])
+    with pytest.raises(TypeError):
+        scate.to_json([datetime.datetime(2024, 3, 16)])
+
+
+def test_profile():
+    saturdays_in_march = scate.RepeatingIntersection([scate.Repeating(scate.DAY, scate.WEEK, value=5),
+                                                      scate.Repeating(scate.MONTH, scate.YEAR, value=3)])
+    last_rsub = scate.Repeating.__rsub__
+    with scate.profile() as profile:
+        assert scate.Repeating.__rsub__ is not last_rsub
+        scate.Last(scate.Last(scate.Interval.of(1789, 7, 14), saturdays_in_march), scate.Spring())
+        with scate.profile() as inner_profile:
+            fridays = scate.NextN(scate.Interval.of(1789, 7, 14), scate.Repeating(scate.DAY, scate.WEEK, value=4), n=3)
+            assert len(list(fridays)) == 3
+    assert scate.Repeating.__rsub__ is last_rsub
+
+    report = profile.report()
+    assert report["operators"]["Last"]["calls"] == 2
+    # NextN evaluates only its first Next, and streams the remaining repetitions from a single cursor
+    assert report["operators"]["Next"]["calls"] == 1
+    assert report["operators"]["NextN"]["calls"] == 1
+    assert report["shifts"]["RepeatingIntersection"]["calls"] == 1
+    assert report["shifts"]["RepeatingIntersection"]["rrule_occurrences"] > 0
+    assert report["shifts"]["Spring"]["calls"] == 1
+    assert report["shifts"]["Repeating"]["calls"] == 1
+    assert report["rrule_occurrences"] == report["operators"]["Last"]["rrule_occurrences"]
+    assert report["operators"]["Last"]["seconds"] >= report["shifts"]["RepeatingIntersection"]["seconds"] > 0
+    assert json.loads(profile.to_json()) == report
+    assert list(inner_profile.report()["operators"]) == ["NextN", "Next"]
+
+    # memoized evaluations are bypassed while profiling, so the same expression reports the same work every time
+    last_saturday_in_march = scate.Last(scate.Interval.of(1848, 2, 24), saturdays_in_march)
+    reports = []
+    for _ in range(2):
+        with scate.profile() as profile:
+            scate.Last(scate.Interval.of(1848, 2, 24), saturdays_in_march)
+        reports.append(profile.report())
+    assert reports[0]["shifts"]["RepeatingIntersection"]["rrule_occurrences"] > 0
+    assert [r["rrule_occurrences"] for r in reports] == [reports[0]["rrule_occurrences"]] * 2
+    assert [r["shifts"]["RepeatingIntersection"]["calls"] for r in reports] == [1, 1]
+    assert last_saturday_in_march.isoformat() == "1847-03-27T00:00:00 1847-03-28T00:00:00"
+
+    # profiles entered and exited concurrently install the timed methods once, and leave nothing installed
+    barrier = threading.Barrier(8)
+
+    def profile_in_thread(_):
+        with scate.profile():
+            barrier.wait()
+            scate.Last(scate.Interval.of(1848, 2, 24), saturdays_in_march)
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        list(executor.map(profile_in_thread, range(8)))
+    assert scate.Repeating.__rsub__ is last_rsub
+    assert hasattr(scate._evaluate_shift, "cache_info")
+
+    # calls in progress are tracked per thread, so a call in one thread does not hide the time of calls in another
+    class WaitingShift(scate.Shift):
+        unit = scate.DAY
+
+        def __rsub__(self, other: datetime.datetime) -> scate.Interval:
+            started.set()
+            done.wait()
+            return other - scate.Period(scate.DAY, 1)
+    started = threading.Event()
+    done = threading.Event()
+    day = scate.Repeating(scate.DAY)
+    with scate.profile() as profile:
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            waiting = executor.submit(scate.Last, scate.Interval.of(2024, 3, 16), WaitingShift())
+            started.wait()
+            start = time.perf_counter()
+            with scate.profile() as inner_profile:
+                while time.perf_counter() - start < 0.05:
+                    scate.Last(scate.Interval.of(2024, 3, 16), day)
+            waiting_seconds = time.perf_counter() - start
+            done.set()
+            assert waiting.result().isoformat() == "2024-03-15T00:00:00 2024-03-16T00:00:00"
+    outer_last = profile.report()["operators"]["Last"]
+    inner_last = inner_profile.report()["operators"]["Last"]
+    assert outer_last["calls"] == inner_last["calls"] + 1
+    # the waiting Last was in progress for the whole time the Lasts of the main thread ran
+    assert outer_last["seconds"] >= waiting_seconds + inner_last["seconds"] > waiting_seconds
+
+
 def test_flatten():
     for obj, obj_flat in [
         (scate.Interval.of(2022, 8, 13),
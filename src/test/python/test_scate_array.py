@@ -0,0 +1,330 @@
+import dataclasses
+import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import scate
+import scate_array
+
+
+def _isoformats(starts, ends) -> list[str]:
+    return [scate.Interval(scate_array._to_datetime(start), scate_array._to_datetime(end)).isoformat()
+            for start, end in zip(starts, ends)]
+
+
+def _expected(template: scate.Interval, anchors: list[scate.Interval]) -> list[str]:
+    return [dataclasses.replace(template, interval=anchor).isoformat() for anchor in anchors]
+
+
+def test_evaluate():
+    anchors = [scate.Interval.of(2024, 3, 16, 8),
+               scate.Interval.of(2000, 2, 29),
+               scate.Interval.fromisoformat("1999-12-31T23:59:59.5 2000-01-02T00:00:00"),
+               scate.Interval.of(1905, 1, 1)]
+    starts = scate_array.as_datetime64([anchor.start for anchor in anchors])
+    ends = scate_array.as_datetime64([anchor.end for anchor in anchors])
+    last_friday = scate.Last(scate.Interval(None, None), scate.Repeating(scate.DAY, scate.WEEK, value=4))
+    starts, ends = scate_array.evaluate(last_friday, starts, ends)
+    assert _isoformats(starts, ends) == ["2024-03-15T00:00:00 2024-03-16T00:00:00",
+                                         "2000-02-25T00:00:00 2000-02-26T00:00:00",
+                                         "1999-12-24T00:00:00 1999-12-25T00:00:00",
+                                         "1904-12-30T00:00:00 1904-12-31T00:00:00"]
+
+    # every operator and shift agrees with evaluating one anchor at a time
+    shifts = [scate.Period(scate.MONTH, 1),
+              scate.Period(scate.DAY, 3),
+              scate.Period(None, None),
+              scate.PeriodSum([scate.Period(scate.YEAR, 1), scate.Period(scate.DAY, 2)]),
+              scate.Repeating(scate.WEEK),
+              scate.Repeating(scate.QUARTER_CENTURY),
+              scate.Repeating(scate.HOUR, scate.DAY, value=18),
+              scate.Repeating(scate.DAY, scate.MONTH, value=31),
+              scate.Weekend(),
+              scate.Noon(),
+              scate.ShiftUnion([scate.Morning(), scate.Repeating(scate.HOUR, scate.DAY, value=9)]),
+              scate.RepeatingIntersection([scate.Repeating(scate.DAY, scate.WEEK, value=5), scate.Morning()]),
+              scate.RepeatingIntersection([scate.Repeating(scate.DAY, scate.WEEK, value=5),
+                                           scate.Repeating(scate.MONTH, scate.YEAR, value=3)]),
+              scate.EveryNth(scate.Repeating(scate.DAY, scate.WEEK, value=4), n=2)]
+    # month-of-year and day-of-month rrules are vectorized with month arithmetic
+    monthly_shifts = [scate.Repeating(scate.MONTH, scate.YEAR, value=3),
+                      scate.Repeating(scate.DAY, scate.MONTH, value=13),
+                      scate.Spring(),
+                      scate.Winter(),
+                      scate.RepeatingIntersection([scate.Repeating(scate.MONTH, scate.YEAR, value=3),
+                                                   scate.Repeating(scate.DAY, scate.MONTH, value=13)]),
+                      scate.RepeatingIntersection([scate.Repeating(scate.MONTH, scate.YEAR, value=2),
+                                                   scate.Repeating(scate.DAY, scate.MONTH, value=29),
+                                                   scate.Repeating(scate.HOUR, scate.DAY, value=18)])]
+    assert all(scate_array._vectorize_shift(shift) is not None for shift in monthly_shifts)
+    shifts += monthly_shifts
+    anchors += [scate.Interval.of(2026, 5, 3, 1, 7, 35, 1111),
+                scate.Interval.of(2024, 3, 13),
+                scate.Interval.of(1904, 2, 29, 18),
+                scate.Interval.fromisoformat("1900-02-28T18:00:00.5 1900-03-01"),
+                scate.Interval.of(150, 12, 31),
+                scate.Interval(None, None)]
+    starts = scate_array.as_datetime64([anchor.start for anchor in anchors])
+    ends = scate_array.as_datetime64([anchor.end for anchor in anchors])
+    for shift in shifts:
+        for template in [scate.Last(scate.Interval(None, None), shift),
+                         scate.Next(scate.Interval(None, None), shift, interval_included=True),
+                         scate.Before(scate.Interval(None, None), shift, n=2),
+                         scate.After(scate.Interval(None, None), shift, n=3)]:
+            try:
+                expected = _expected(template, anchors)
+            except (ValueError, NotImplementedError) as e:
+                with pytest.raises(type(e)):
+                    scate_array.evaluate(template, starts, ends)
+            else:
+                assert _isoformats(*scate_array.evaluate(template, starts, ends)) == expected
+
+    with pytest.raises(ValueError):
+        scate_array.evaluate(scate.Last(scate.Interval(None, None), scate.Period(scate.DAY, 1)), starts, ends[:2])
+    with pytest.raises(ValueError):
+        scate_array.evaluate(scate.After(scate.Interval(None, None), scate.Period(scate.YEAR, 1)),
+                             [datetime.datetime(9999, 6, 1)], [datetime.datetime(9999, 6, 2)])
+
+
+def test_interval_array():
+    fridays = scate_array.IntervalArray.from_intervals(
+        scate.NextN(scate.Interval.of(1714, 12, 22), scate.Repeating(scate.DAY, scate.WEEK, value=4), n=3))
+    assert len(fridays) == 3
+    assert fridays.isoformats() == ["1714-12-28T00:00:00 1714-12-29T00:00:00",
+                                    "1715-01-04T00:00:00 1715-01-05T00:00:00",
+                                    "1715-01-11T00:00:00 1715-01-12T00:00:00"]
+    assert fridays[1] == scate.Interval.of(1715, 1, 4)
+    assert list(fridays[::2]) == [scate.Interval.of(1714, 12, 28), scate.Interval.of(1715, 1, 11)]
+    assert fridays.durations().tolist() == [datetime.timedelta(days=1)] * 3
+    assert fridays.overlaps(scate.Interval.of(1714, 12)).tolist() == [True, False, False]
+    assert fridays.contains(scate.Interval.of(1715, 1, 4, 12)).tolist() == [False, True, False]
+    assert scate_array.IntervalArray.from_intervals(fridays) is fridays
+
+    # None endpoints become NaT, and undefined intervals overlap and contain nothing
+    days = scate.LastN(scate.Interval.fromisoformat("2000-01-01T00:00:00.5 2000-01-02"), scate.Period(scate.DAY, 1),
+                       n=None)
+    days = scate_array.IntervalArray.from_intervals(days)
+    assert days.isoformats() == ["1999-12-31T00:00:00.500000 2000-01-01T00:00:00.500000",
+                                 "... 1999-12-31T00:00:00.500000"]
+    assert days[1].start is None
+    assert days.is_defined().tolist() == [True, False]
+    assert days.overlaps(days).tolist() == [True, False]
+    assert days.contains(days).tolist() == [True, False]
+    assert np.isnat(days.durations()).tolist() == [False, True]
+    assert days[days.is_defined()] == scate_array.IntervalArray(days.starts[:1], days.ends[:1])
+    assert days[days.is_defined()] != days
+
+    these = scate.These(scate.Interval.of(2025, 1), scate.Repeating(scate.DAY, scate.WEEK, value=1))
+    assert scate_array.IntervalArray.from_intervals(these).isoformats() == these.isoformats()
+    with pytest.raises(ValueError):
+        scate_array.IntervalArray(days.starts, days.ends[:1])
+
+
+def test_interval_array_these():
+    century = scate.Interval.fromisoformat("2000-01-01 2100-01-01")
+    days = scate_array.IntervalArray.from_intervals(scate.These(century, scate.Repeating(scate.DAY)))
+    assert len(days) == 36525
+    assert days[0] == scate.Interval.of(2000, 1, 1)
+    assert days[-1] == scate.Interval.of(2099, 12, 31)
+
+    # regular Shifts are enumerated with array arithmetic, and others one at a time, but both must agree with These
+    ranges = [scate.Interval.fromisoformat("2000-01-31 2003-02-15"),
+              scate.Interval.fromisoformat("1990-03-30T10:00 1995-01-01"),
+              scate.Interval.of(2016, 2),
+              scate.Interval(None, None)]
+    shifts = [scate.Period(scate.WEEK, 2),
+              scate.Period(scate.MONTH, 1),
+              scate.Repeating(scate.HOUR),
+              scate.Repeating(scate.QUARTER_YEAR),
+              scate.Repeating(scate.DAY, scate.WEEK, value=0),
+              scate.Repeating(scate.DAY, scate.MONTH, value=15),
+              scate.Repeating(scate.DAY, scate.MONTH, value=31),
+              scate.Repeating(scate.MONTH, scate.YEAR, value=2),
+              scate.ShiftUnion([scate.Repeating(scate.DAY, scate.WEEK, value=0),
+                                scate.Repeating(scate.DAY, scate.WEEK, value=3)])]
+    for interval in ranges:
+        for shift in shifts:
+            these = scate.These(interval, shift)
+            assert scate_array.IntervalArray.from_intervals(these).isoformats() == these.isoformats()
+
+
+def test_interval_index():
+    rng = np.random.default_rng(42)
+    days = rng.integers(0, 60, size=(500, 2))
+    base = datetime.datetime(2024, 1, 1)
+    intervals = []
+    for first, second in days:
+        start, end = sorted([base + datetime.timedelta(days=int(first)), base + datetime.timedelta(days=int(second))])
+        # include unbounded, undefined and empty intervals
+        match rng.integers(0, 20):
+            case 0:
+                start = None
+            case 1:
+                end = None
+            case 2:
+                start = end = None
+        intervals.append(scate.Interval(start, end))
+    index = scate_array.IntervalIndex(intervals)
+    assert len(index) == 500
+
+    bounded = [(datetime.datetime.min if interval.start is None else interval.start,
+                datetime.datetime.max if interval.end is None else interval.end) for interval in intervals]
+
+    def expected(predicate) -> list[int]:
+        return [i for i, (interval, (s, e)) in enumerate(zip(intervals, bounded))
+                if not (interval.start is None and interval.end is None) and predicate(s, e)]
+
+    queries = [scate.Interval(base + datetime.timedelta(days=int(first)), base + datetime.timedelta(days=int(second)))
+               for first, second in np.sort(rng.integers(-5, 65, size=(200, 2)), axis=1)]
+    queries += [scate.Interval(None, base + datetime.timedelta(days=10)),
+                scate.Interval(base + datetime.timedelta(days=50), None),
+                scate.Interval(base, base)]
+    for query in queries:
+        start = datetime.datetime.min if query.start is None else query.start
+        end = datetime.datetime.max if query.end is None else query.end
+        assert index.overlapping(query).tolist() == expected(lambda s, e: s < end and start < e)
+        assert index.containing(query).tolist() == expected(lambda s, e: s <= start and end <= e)
+        assert index.contained_in(query).tolist() == expected(lambda s, e: start <= s and e <= end)
+        assert index.before(query).tolist() == expected(lambda s, e: e <= start)
+        assert index.after(query).tolist() == expected(lambda s, e: end <= s)
+
+        def nearest_key(i: int) -> tuple:
+            s, e = bounded[i]
+            # overlapping intervals first, then the smallest gap, preferring intervals before the query
+            return s >= end or start >= e, max(datetime.timedelta(0), s - end, start - e), e > start, i
+        assert index.nearest(query) == min(expected(lambda s, e: True), key=nearest_key)
+    assert index.overlapping(scate.Interval(None, None)).tolist() == []
+    assert index.nearest(scate.Interval(None, None)) is None
+
+    # intervals from from_xml output, where LastN and friends contribute several intervals, and Shifts none
+    friday = scate.Repeating(scate.DAY, scate.WEEK, value=4)
+    march = scate.Interval.of(2024, 3)
+    last_fridays = scate.LastN(march, friday, n=3)
+    index = scate_array.IntervalIndex.from_objects([march, friday, last_fridays, scate.Next(march, friday)])
+    assert index.objects == [march, last_fridays, last_fridays, last_fridays, scate.Next(march, friday)]
+    assert index.nearest(scate.Interval.of(2024, 2, 26)) == 1
+    assert index.before(scate.Interval.of(2024, 2, 20)).tolist() == [2, 3]
+    assert index.after(march).tolist() == [4]
+    assert index.containing(scate.Interval.of(2024, 3, 5)).tolist() == [0]
+
+
+def test_allen_relations():
+    relation = scate_array.AllenRelation
+    march = scate.Interval.of(2024, 3)
+    others = [scate.Interval.of(2024, 5),
+              scate.Interval.of(2024, 4, 1),
+              scate.Interval.fromisoformat("2024-03-15 2024-05-01"),
+              scate.Interval.fromisoformat("2024-03-01 2024-06-01"),
+              scate.Interval.of(2024),
+              scate.Interval.fromisoformat("2023-01-01 2024-04-01"),
+              march,
+              scate.Interval.of(2024, 3, 31),
+              scate.Interval.of(2024, 3, 10),
+              scate.Interval.of(2024, 3, 1),
+              scate.Interval.fromisoformat("2024-02-01 2024-03-10"),
+              scate.Interval.of(2024, 2),
+              scate.Interval.of(2023),
+              scate.Interval(None, None),
+              scate.Interval(None, datetime.datetime(2025, 1, 1))]
+    assert scate_array.allen_relations([march], others).tolist() == [[
+        relation.BEFORE, relation.MEETS, relation.OVERLAPS, relation.STARTS, relation.DURING, relation.FINISHES,
+        relation.EQUALS, relation.FINISHED_BY, relation.CONTAINS, relation.STARTED_BY, relation.OVERLAPPED_BY,
+        relation.MET_BY, relation.AFTER, scate_array.UNDEFINED_RELATION, relation.DURING,
+    ]]
+
+    # compare against pairwise comparisons, with None as unbounded
+    def bounded(interval: scate.Interval) -> tuple[datetime.datetime, datetime.datetime]:
+        return (datetime.datetime.min if interval.start is None else interval.start,
+                datetime.datetime.max if interval.end is None else interval.end)
+
+    def expected(first: scate.Interval, second: scate.Interval) -> int:
+        if first.start is None and first.end is None or second.start is None and second.end is None:
+            return scate_array.UNDEFINED_RELATION
+        (s1, e1), (s2, e2) = bounded(first), bounded(second)
+        if s1 > e2:
+            return relation.AFTER
+        if s1 == e2:
+            return relation.MET_BY
+        if e1 < s2:
+            return relation.BEFORE
+        if e1 == s2:
+            return relation.MEETS
+        starts = (s1 > s2) - (s1 < s2)
+        ends = (e1 > e2) - (e1 < e2)
+        return scate_array._OVERLAP_RELATIONS[starts + 1, ends + 1]
+
+    rng = np.random.default_rng(7)
+    base = datetime.datetime(2024, 1, 1)
+    intervals = []
+    for first, second, kind in zip(*rng.integers(0, 10, size=(2, 300)), rng.integers(0, 10, size=300)):
+        start, end = sorted([base + datetime.timedelta(days=int(first)), base + datetime.timedelta(days=int(second))])
+        intervals.append(scate.Interval(None if kind == 0 else start, None if kind == 1 else end))
+    intervals[-1] = scate.Interval(None, None)
+    matrix = scate_array.allen_relations(intervals[:120], intervals, block_size=7)
+    assert matrix.shape == (120, 300)
+    assert matrix.tolist() == [[expected(first, second) for second in intervals] for first in intervals[:120]]
+    assert np.array_equal(matrix, scate_array.allen_relations(iter(intervals[:120]), intervals))
+    rows, columns = scate_array.allen_pairs(intervals[:120], intervals, [relation.DURING, relation.MEETS], block_size=9)
+    assert list(zip(rows.tolist(), columns.tolist())) == list(zip(*np.nonzero(
+        (matrix == relation.DURING) | (matrix == relation.MEETS))))
+    rows, columns = scate_array.allen_pairs(intervals, intervals[:0], relation.BEFORE)
+    assert len(rows) == len(columns) == 0
+
+
+def test_interval_set():
+    year = scate.Interval.of(2025)
+    mondays = scate_array.IntervalSet(scate.These(year, scate.Repeating(scate.DAY, scate.WEEK, value=0)))
+    fridays = scate_array.IntervalSet(scate.These(year, scate.Repeating(scate.DAY, scate.WEEK, value=4)))
+    holidays = scate_array.IntervalSet([scate.Interval.of(2025, 1, 20), scate.Interval.of(2025, 12, 25),
+                                        scate.Interval.of(2025, 7, 4), scate.Interval.of(2025, 5, 26)])
+    # These includes the whole weeks at either end of the year
+    days = ((mondays | fridays) & scate_array.IntervalSet([year])) - holidays
+    assert len(mondays) == len(fridays) == 53
+    assert len(days) == 52 + 52 - 3
+    assert scate.Interval.of(2025, 1, 20) not in list(days)
+    assert datetime.datetime(2025, 1, 27, 12) in days
+    assert datetime.datetime(2025, 1, 20, 12) not in days
+    assert (mondays & fridays) == scate_array.IntervalSet()
+    assert (days & holidays) == scate_array.IntervalSet()
+    assert ~~days == days
+
+    # overlapping and adjacent intervals are merged, and undefined and empty ones dropped
+    merged = scate_array.IntervalSet([scate.Interval.of(2025, 3),
+                                      scate.Interval.of(2025, 1),
+                                      scate.Interval.fromisoformat("2025-01-15 2025-02-10"),
+                                      scate.Interval.of(2025, 2),
+                                      scate.Interval(None, None),
+                                      scate.Interval.fromisoformat("2025-06-01 2025-06-01")])
+    assert merged.intervals.isoformats() == ["2025-01-01T00:00:00 2025-04-01T00:00:00"]
+    assert (~merged).intervals.isoformats() == ["... 2025-01-01T00:00:00", "2025-04-01T00:00:00 ..."]
+    assert (~scate_array.IntervalSet()).intervals.isoformats() == ["... ..."]
+    assert merged.complement(year).intervals.isoformats() == ["2025-04-01T00:00:00 2026-01-01T00:00:00"]
+
+    # compare against sets of days
+    rng = np.random.default_rng(3)
+    base = datetime.datetime(2025, 1, 1)
+
+    def random_set() -> tuple[scate_array.IntervalSet, set[int]]:
+        intervals = []
+        days = set()
+        for first, length in zip(rng.integers(0, 100, size=30), rng.integers(0, 8, size=30)):
+            intervals.append(scate.Interval(base + datetime.timedelta(days=int(first)),
+                                            base + datetime.timedelta(days=int(first + length))))
+            days.update(range(first, first + length))
+        return scate_array.IntervalSet(intervals), days
+
+    def as_days(interval_set: scate_array.IntervalSet) -> set[int]:
+        return {day for interval in interval_set
+                for day in range((interval.start - base).days, (interval.end - base).days)}
+
+    for _ in range(20):
+        (first, first_days), (second, second_days) = random_set(), random_set()
+        assert as_days(first) == first_days
+        assert as_days(first | second) == first_days | second_days
+        assert as_days(first & second) == first_days & second_days
+        assert as_days(first - second) == first_days - second_days
+        within = scate.Interval.fromisoformat("2025-01-01 2025-05-01")
+        assert as_days(first.complement(within)) == set(range(120)) - first_days
+        assert all(a.end < b.start for a, b in zip(list(first | second), list(first | second)[1:]))
@@ -1,4 +1,13 @@
+import concurrent.futures
 import datetime
+import errno
+import io
+import json
+import os
+import sys
+import time
+
+import pytest
 
 import scate
 import inspect
@@ -315,6 +324,9 @@ def test_interval_offset_operators():
         objects = scate.from_xml(ET.fromstring(xml_str), known_intervals={(None, None): doc_time})
         assert objects == [op]
         assert _isoformats(objects) == [iso], f"{xml_type}(interval_included={interval_included})"
+        objects = scate.from_xml(ET.fromstring(xml_str), known_intervals={(None, None): doc_time}, lazy=True)
+        assert _isoformats(objects) == [iso], f"lazy {xml_type}(interval_included={interval_included})"
+        assert objects == [op]
 
 
 def test_nth_operators():
@@ -626,6 +638,16 @@ def test_doc_time():
         assert objects == [op]
         assert _isoformats(objects) == [iso]
 
+        # parse once with a placeholder, then bind to different document creation times
+        unbound = scate.from_xml(ET.fromstring(xml_str), known_intervals={(None, None): scate.DocTime()})
+        assert [scate.bind(o, doc_time) for o in unbound] == [op]
+        assert _isoformats([scate.bind(o, doc_time) for o in unbound]) == [iso]
+        assert _isoformats([scate.compile(o)(doc_time) for o in unbound]) == [iso]
+        assert scate.bind(unbound[0], doc_time).shift is unbound[0].shift
+        other_doc_time = scate.Interval.of(1999, 12, 31)
+        assert _isoformats([scate.bind(o, other_doc_time) for o in unbound]) == _isoformats(
+            scate.from_xml(ET.fromstring(xml_str), known_intervals={(None, None): other_doc_time}))
+
 
 def test_discontinuous_span():
     xml_str = inspect.cleandoc(f"""
@@ -1312,6 +1334,53 @@ def test_friday():
     assert _isoformats(objects) == [doc_time.isoformat()]
 
 
+def test_shared_values(monkeypatch):
+    def entity(entity_id: int, span: str, entity_type: str, properties: str) -> str:
+        return f"""
+            <entity>
+                <id>{entity_id}@e@shared@gold</id>
+                <span>{span}</span>
+                <type>{entity_type}</type>
+                <properties>{properties}</properties>
+            </entity>"""
+
+    def friday(entity_id: int, span: str) -> str:
+        return entity(entity_id, span, "Day-Of-Week", "<Type>Friday</Type>")
+
+    def operator(entity_id: int, span: str, entity_type: str, shift_id: int) -> str:
+        return entity(entity_id, span, entity_type, f"""
+            <Semantics>Interval-Not-Included</Semantics>
+            <Interval-Type>DocTime</Interval-Type>
+            <Repeating-Interval>{shift_id}@e@shared@gold</Repeating-Interval>""")
+    xml_str = f"""
+        <data>
+            <annotations>
+                {friday(1, "0,6")}{operator(2, "0,6", "Last", 1)}
+                {friday(3, "20,26")}{operator(4, "15,26", "Next", 3)}
+                {friday(5, "40,46")}
+            </annotations>
+        </data>"""
+    doc_time = scate.Interval.of(1998, 3, 11)
+    lone_friday, last, next_ = scate.from_xml(ET.fromstring(xml_str), known_intervals={(None, None): doc_time})
+    assert _isoformats([last, next_]) == ["1998-03-06T00:00:00 1998-03-07T00:00:00",
+                                          "1998-03-13T00:00:00 1998-03-14T00:00:00"]
+
+    # equal values are shared, and have no spans, which are kept by the operators that use them
+    assert last.shift is next_.shift is scate.intern(scate.Repeating(scate.DAY, scate.WEEK, value=4))
+    assert last.shift.span is None
+    assert (last.span, last.trigger_span, next_.span, next_.trigger_span) == ((0, 6), (0, 6), (15, 26), (15, 26))
+
+    # values returned directly get their own copies, with spans
+    assert lone_friday == last.shift and lone_friday is not last.shift
+    assert (lone_friday.span, lone_friday.trigger_span) == ((40, 46), (40, 46))
+
+    # the table of canonical values is bounded
+    monkeypatch.setattr(scate, "_INTERNED_MAX_SIZE", 3)
+    years = [scate.intern(scate.Year(year)) for year in range(1990, 2000)]
+    assert len(scate._INTERNED) <= 3
+    assert scate.intern(scate.Year(1999)) is years[-1]
+
+
 def test_earlier_sunday():
     # APW19980322.0749 (3918,3925) Earlier Sunday
     xml_str = inspect.cleandoc("""
@@ -1472,3 +1541,198 @@ def test_every_other_day():
     objects = scate.from_xml(ET.fromstring(xml_str), known_intervals={(None, None): doc_time})
     assert objects == [every_other_day]
     assert _isoformats(objects) == [None]
+
+
+def _chain_xml(n: int, name: str = "chain") -> str:
+    # each Next links to the previous one, listed after it, so the entities must be sorted to be parsed
+    entities = []
+    for i in reversed(range(1, n)):
+        entities.append(f"""
+            <entity>
+                <id>{2 * i + 1}@e@{name}@gold</id>
+                <span>{10 * i + 3},{10 * i + 5}</span>
+                <type>Next</type>
+                <properties>
+                    <Interval-Type>Link</Interval-Type>
+                    <Interval>{2 * i - 1 if i > 1 else 0}@e@{name}@gold</Interval>
+                    <Repeating-Interval>{2 * i}@e@{name}@gold</Repeating-Interval>
+                    <Number></Number>
+                    <Semantics>Interval-Not-Included</Semantics>
+                </properties>
+            </entity>
+            <entity>
+                <id>{2 * i}@e@{name}@gold</id>
+                <span>{10 * i},{10 * i + 2}</span>
+                <type>Calendar-Interval</type>
+                <properties>
+                    <Type>Day</Type>
+                </properties>
+            </entity>""")
+    entities.append(f"""
+            <entity>
+                <id>0@e@{name}@gold</id>
+                <span>0,4</span>
+                <type>Year</type>
+                <properties>
+                    <Value>2000</Value>
+                </properties>
+            </entity>""")
+    return f"<data><annotations>{''.join(entities)}</annotations></data>"
+
+
+def test_long_chain():
+    n = 2000
+    xml_str = _chain_xml(n)
+    [obj] = scate.from_xml(ET.fromstring(xml_str))
+    assert obj.isoformat() == "2006-06-22T00:00:00 2006-06-23T00:00:00"
+    assert obj.span == (0, 10 * (n - 1) + 5)
+
+    # references that form a cycle cannot be sorted
+    xml_str = inspect.cleandoc("""
+        <data>
+            <annotations>
+                <entity>
+                    <id>1@e@cycle@gold</id>
+                    <span>0,4</span>
+                    <type>Next</type>
+                    <properties>
+                        <Interval-Type>Link</Interval-Type>
+                        <Interval>2@e@cycle@gold</Interval>
+                    </properties>
+                </entity>
+                <entity>
+                    <id>2@e@cycle@gold</id>
+                    <span>5,9</span>
+                    <type>Last</type>
+                    <properties>
+                        <Interval-Type>Link</Interval-Type>
+                        <Interval>1@e@cycle@gold</Interval>
+                    </properties>
+                </entity>
+            </annotations>
+        </data>""")
+    with pytest.raises(ValueError):
+        scate.from_xml(ET.fromstring(xml_str))
+
+
+def test_iter_from_xml():
+    # a multi-document dump, where each document's objects are yielded before the next document is read
+    sizes = [3, 50, 1, 20]
+    documents = [_chain_xml(n, f"doc{i}") for i, n in enumerate(sizes)]
+    dump = io.BytesIO(f"<corpus>{''.join(documents)}</corpus>".encode())
+    objects = scate.iter_from_xml(dump)
+    assert not isinstance(objects, list)
+    first = next(objects)
+    assert dump.tell() < len(dump.getvalue())
+    expected = [obj for xml_str in documents for obj in scate.from_xml(ET.fromstring(xml_str))]
+    assert [first, *objects] == expected
+    assert _isoformats(expected) == ["2001-01-02T00:00:00 2001-01-03T00:00:00",
+                                     "2001-02-18T00:00:00 2001-02-19T00:00:00",
+                                     "2000-01-01T00:00:00 2001-01-01T00:00:00",
+                                     "2001-01-19T00:00:00 2001-01-20T00:00:00"]
+
+    # a single document, and a DocTime placeholder that implies lazy evaluation
+    xml_str = inspect.cleandoc("""
+        <data>
+            <annotations>
+                <entity>
+                    <id>1@e@doc@gold</id>
+                    <span>0,4</span>
+                    <type>Last</type>
+                    <properties>
+                        <Interval-Type>DocTime</Interval-Type>
+                        <Repeating-Interval>2@e@doc@gold</Repeating-Interval>
+                        <Number></Number>
+                        <Semantics>Interval-Not-Included</Semantics>
+                    </properties>
+                </entity>
+                <entity>
+                    <id>2@e@doc@gold</id>
+                    <span>5,11</span>
+                    <type>Day-Of-Week</type>
+                    <properties>
+                        <Type>Friday</Type>
+                    </properties>
+                </entity>
+            </annotations>
+        </data>""")
+    [obj] = scate.iter_from_xml(io.BytesIO(xml_str.encode()), known_intervals={(None, None): scate.DocTime()})
+    assert scate.bind(obj, scate.Interval.of(2024, 3, 16)).isoformat() == "2024-03-15T00:00:00 2024-03-16T00:00:00"
+
+
+def test_main_jobs(tmp_path, monkeypatch, capsys):
+    for i, n in enumerate([5, 40, 2, 12, 30]):
+        (tmp_path / f"doc{i}.TimeNorm.gold.completed.xml").write_text(_chain_xml(n, f"doc{i}"))
+    # a document with an entity that cannot be parsed, and its text for the error context
+    (tmp_path / "bad.TimeNorm.gold.completed.xml").write_text(
+        "<data><annotations><entity><id>1@e@bad@gold</id><span>8,11</span><type>Unknown-Type</type>"
+        "<properties></properties></entity></annotations></data>")
+    (tmp_path / "bad").write_text("Seen on Foo day.")
+
+    outputs = []
+    for jobs in ["1", "3"]:
+        monkeypatch.setattr(sys, "argv", ["scate.py", str(tmp_path), "--jobs", jobs, "--profile"])
+        scate._main()
+        outputs.append(capsys.readouterr())
+    assert outputs[0].out == outputs[1].out
+    assert len(outputs[0].out.splitlines()) == 5
+    for output in outputs:
+        assert "[[Foo]]" in output.err
+        assert "Errors: 1 (NotImplementedError: 1)" in output.err
+        assert "Processed 6 files and 5 objects" in output.err
+        report = json.loads(output.err[output.err.index("{\n"):output.err.index("\n}\n") + 2])
+        assert report["operators"]["Next"]["calls"] == 4 + 39 + 1 + 11 + 29
+
+
+def test_xml_cache(tmp_path, monkeypatch):
+    xml_path = tmp_path / "chain.xml"
+    xml_path.write_text(_chain_xml(30))
+    doc_time = scate.Interval.of(2010, 8, 5)
+    cache = scate.XMLCache(tmp_path / "cache")
+    objects = cache.from_xml(xml_path, known_intervals={(None, None): doc_time})
+    assert objects == scate.from_xml(ET.fromstring(xml_path.read_text()))
+    [entry] = (tmp_path / "cache").iterdir()
+
+    # hits do not parse the XML, while changes to the XML or the known intervals do
+    n_parses = []
+    original_iter_from_xml = scate.iter_from_xml
+    monkeypatch.setattr(scate, "iter_from_xml", lambda *args: n_parses.append(1) or original_iter_from_xml(*args))
+    assert scate.XMLCache(tmp_path / "cache").from_xml(xml_path, {(None, None): doc_time}) == objects
+    assert not n_parses
+    cache.from_xml(xml_path, {(None, None): scate.Interval.of(2010, 8, 6)})
+    cache.from_xml(_chain_xml(31).encode(), {(None, None): doc_time})
+    assert len(n_parses) == 2
+    assert len(list((tmp_path / "cache").iterdir())) == 3
+
+    # corrupt entries are replaced
+    entry.write_bytes(b"not scate objects")
+    assert cache.from_xml(xml_path, {(None, None): doc_time}) == objects
+    assert len(n_parses) == 3
+
+    # entries unused for too long are evicted, and then, least recently used first, entries over the size limit
+    long_ago = time.time() - 3 * 24 * 60 * 60
+    os.utime(entry, (long_ago, long_ago))
+    cache = scate.XMLCache(tmp_path / "cache", max_age=datetime.timedelta(days=2))
+    assert not entry.exists()
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+    sizes = sorted(path.stat().st_size for path in (tmp_path / "cache").iterdir())
+    cache = scate.XMLCache(tmp_path / "cache", max_bytes=sizes[-1] + sizes[0] // 2)
+    cache.from_xml(xml_path, {(None, None): doc_time})
+    assert entry.exists()
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    # threads storing the same entry at once each write their own temporary file
+    cache = scate.XMLCache(tmp_path / "threads")
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: cache.from_xml(xml_path, {(None, None): doc_time}), range(16)))
+    assert all(result == objects for result in results)
+    [entry] = (tmp_path / "threads").iterdir()
+    assert scate.from_bytes(entry.read_bytes()) == objects
+
+    # failures to write an entry (e.g., a full disk) leave the objects uncached, rather than failing the parse
+    def disk_full(*args):
+        raise OSError(errno.ENOSPC, "No space left on device")
+    monkeypatch.setattr(os, "replace", disk_full)
+    cache = scate.XMLCache(tmp_path / "full")
+    assert cache.from_xml(xml_path, {(None, None): doc_time}) == objects
+    assert not list((tmp_path / "full").iterdir())